@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from contrarian.universes.tickers import Universe
-from contrarian.analysis.pipeline import batch_screen, fetch_and_score
+from contrarian.analysis.pipeline import iter_screen, fetch_and_score
+from contrarian.analysis.similarity import get_similarity_index
+from contrarian.universes.search import get_search_index
+from contrarian.data.snapshots import SnapshotStore
 from contrarian.config import config
 import json
+import threading
+import time
 
 # Page Config
 st.set_page_config(
@@ -18,6 +23,75 @@ st.set_page_config(
 st.sidebar.title("🦅 Contrarian")
 page = st.sidebar.radio("Navigation", ["Scanner", "Deep Dive", "Watchlist"])
 
+# --- Caching ---
+# Results are cached per ticker (shared across reruns and sessions) so widget
+# interactions re-render from memory instead of refetching every upstream.
+CACHE_TTL_SECONDS = config.DASHBOARD_CACHE_TTL_MINUTES * 60
+
+class FetchFailed(Exception):
+    """No data for a ticker; raised inside the cached function so failures are not cached."""
+
+@st.cache_resource
+def refresh_epochs() -> dict:
+    """Process-wide refresh counter per ticker. Bumping it re-keys the cached result."""
+    return {}
+
+@st.cache_resource
+def refresh_lock() -> threading.Lock:
+    """Guards `refresh_epochs`, which screens read from their worker threads."""
+    return threading.Lock()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def cached_fetch_and_score(ticker: str, epoch: int = 0):
+    data = fetch_and_score(ticker)
+    if not data:
+        raise FetchFailed(ticker)
+    data["fetched_at"] = time.time()
+    return data
+
+def get_scored(ticker: str):
+    with refresh_lock():
+        epoch = refresh_epochs().get(ticker, 0)
+    try:
+        return cached_fetch_and_score(ticker, epoch)
+    except FetchFailed:
+        return None
+
+def bump_refresh(tickers):
+    with refresh_lock():
+        epochs = refresh_epochs()
+        for t in tickers:
+            epochs[t] = epochs.get(t, 0) + 1
+
+def format_age(fetched_at: float) -> str:
+    minutes = int((time.time() - fetched_at) // 60)
+    if minutes < 1:
+        return "just now"
+    return f"{minutes} min ago"
+
+def build_scanner_df(results, min_score):
+    rows = []
+    for r in results:
+        s = r["stock"]
+        sc = r["scores"]
+        if sc["contrarian_score"] >= min_score:
+            rows.append({
+                "Ticker": s.ticker,
+                "Price": f"${s.price:.2f}",
+                "Score": f"{sc['contrarian_score']:.1f}",
+                "Signal": sc["signal"],
+                "Fund. Score": f"{sc['fundamental_score']:.1f}",
+                "Sent. Score": f"{sc['sentiment_score']:.1f}",
+                "Sector": s.sector
+            })
+    
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        # Sort by Score descending
+        df["SortKey"] = df["Score"].astype(float)
+        df = df.sort_values("SortKey", ascending=False).drop(columns=["SortKey"])
+    return df
+
 # Helper: Gauge Chart
 def create_gauge(score, title):
     fig = go.Figure(go.Indicator(
@@ -53,102 +127,150 @@ if page == "Scanner":
     with col2:
         min_score = st.slider("Minimum Score", 0, 100, 50)
         
-    if st.button("Run Screen", type="primary"):
+    scans = st.session_state.setdefault("scans", {})
+    b1, b2, _ = st.columns([1, 1, 4])
+    with b1:
+        run_clicked = st.button("Run Screen", type="primary")
+    with b2:
+        refresh_clicked = st.button("🔄 Refresh Data", disabled=universe not in scans)
+    
+    if run_clicked or refresh_clicked:
         tickers = Universe.get_tickers(universe)
+        if refresh_clicked:
+            bump_refresh(tickers)
         
-        with st.spinner(f"Scanning {len(tickers)} stocks..."):
-            results = batch_screen(tickers)
-            
-        if not results:
-            st.warning("No stocks found or error fetching data.")
-        else:
-            # Process for Display
-            rows = []
-            for r in results:
-                s = r["stock"]
-                sc = r["scores"]
-                if sc["contrarian_score"] >= min_score:
-                    rows.append({
-                        "Ticker": s.ticker,
-                        "Price": f"${s.price:.2f}",
-                        "Score": f"{sc['contrarian_score']:.1f}",
-                        "Signal": sc["signal"],
-                        "Fund. Score": f"{sc['fundamental_score']:.1f}",
-                        "Sent. Score": f"{sc['sentiment_score']:.1f}",
-                        "Sector": s.sector
-                    })
-            
-            df = pd.DataFrame(rows)
+        # Fill the table in progressively as tickers finish
+        status = st.empty()
+        table = st.empty()
+        results = []
+        for r in iter_screen(tickers, score_fn=get_scored):
+            results.append(r)
+            status.caption(f"Scanning... {len(results)}/{len(tickers)} loaded")
+            df = build_scanner_df(results, min_score)
             if not df.empty:
-                # Sort by Score descending
-                df["SortKey"] = df["Score"].astype(float)
-                df = df.sort_values("SortKey", ascending=False).drop(columns=["SortKey"])
-                
-                st.success(f"Found {len(df)} opportunities!")
-                st.dataframe(df, use_container_width=True, hide_index=True)
-            else:
-                st.info("No stocks met the minimum score criteria.")
+                table.dataframe(df, use_container_width=True, hide_index=True)
+        status.empty()
+        table.empty()
+        scans[universe] = results
+    
+    results = scans.get(universe)
+    if results is None:
+        st.caption("Press **Run Screen** to scan this universe.")
+    elif not results:
+        st.warning("No stocks found or error fetching data.")
+    else:
+        oldest = min(r["fetched_at"] for r in results)
+        st.caption(f"Data age: {format_age(oldest)} (cached for {config.DASHBOARD_CACHE_TTL_MINUTES} min)")
+        
+        df = build_scanner_df(results, min_score)
+        if not df.empty:
+            st.success(f"Found {len(df)} opportunities!")
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No stocks met the minimum score criteria.")
 
 # --- Page: Deep Dive ---
 elif page == "Deep Dive":
     st.title("🔬 Deep Dive Analysis")
     
-    ticker_input = st.text_input("Enter Ticker", value="AAPL").upper()
+    query = st.text_input("Enter Ticker or Company", value="AAPL")
+    # Resolve names locally and offer close matches for anything unknown
+    ticker_input = get_search_index().resolve(query) if query.strip() else None
+    if query.strip() and not ticker_input:
+        matches = get_search_index().search(query)
+        typed = query.strip().upper()
+        if matches:
+            # The symbol as typed comes first: an unlisted ticker may still be valid
+            labels = {typed: f"{typed} (as typed)"}
+            for m in matches:
+                labels.setdefault(m.ticker, f"{m.ticker} — {m.name}" if m.name else m.ticker)
+            ticker_input = st.selectbox("Did you mean", list(labels), format_func=labels.get)
+        else:
+            # Not a known ticker or company; it may still be a valid symbol
+            ticker_input = typed
+    
+    c_analyze, c_refresh, _ = st.columns([1, 1, 4])
+    with c_analyze:
+        st.button("Analyze", type="primary")
+    with c_refresh:
+        if st.button("🔄 Refresh Data") and ticker_input:
+            bump_refresh([ticker_input])
     
-    if st.button("Analyze", type="primary") or ticker_input:
-        if ticker_input:
-            with st.spinner(f"Analyzing {ticker_input}..."):
-                data = fetch_and_score(ticker_input)
-                
-            if not data:
-                st.error(f"Could not fetch data for {ticker_input}")
+    if ticker_input:
+        # Reruns (any widget interaction) are served from the cache until the TTL expires
+        with st.spinner(f"Analyzing {ticker_input}..."):
+            data = get_scored(ticker_input)
+            
+        if not data:
+            st.error(f"Could not fetch data for {ticker_input}")
+        else:
+            stock = data["stock"]
+            scores = data["scores"]
+            
+            # Header
+            st.header(f"{stock.company_name} ({stock.ticker})")
+            st.subheader(f"${stock.price:,.2f} | {scores['signal']}")
+            st.caption(f"Data age: {format_age(data['fetched_at'])}")
+            
+            # Scores Row
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                st.plotly_chart(create_gauge(scores['contrarian_score'], "Contrarian Score"), use_container_width=True)
+            with c2:
+                st.metric("Fundamental Score", f"{scores['fundamental_score']:.1f}")
+                st.metric("Sentiment Score", f"{scores['sentiment_score']:.1f}")
+            with c3:
+                st.info(f"Sector: {stock.sector}\n\nIndustry: {stock.industry}")
+
+            # Fundamentals & Sentiment Columns
+            col_fund, col_sent = st.columns(2)
+            
+            with col_fund:
+                st.subheader("Fundamentals")
+                if stock.financials:
+                    f = stock.financials
+                    metrics = {
+                        "Market Cap": f"${f.market_cap:,.0f}" if f.market_cap else "-",
+                        "P/E Ratio": f"{f.pe_ratio:.2f}" if f.pe_ratio else "-",
+                        "P/B Ratio": f"{f.pb_ratio:.2f}" if f.pb_ratio else "-",
+                        "Rev Growth": f"{f.revenue_growth:.1%}" if f.revenue_growth else "-",
+                        "Profit Margin": f"{f.profit_margin:.1%}" if f.profit_margin else "-",
+                        "Debt/Equity": f"{f.debt_to_equity:.2f}" if f.debt_to_equity else "-"
+                    }
+                    st.table(pd.DataFrame(metrics.items(), columns=["Metric", "Value"]))
+            
+            with col_sent:
+                st.subheader("Sentiment")
+                if stock.sentiment:
+                    s = stock.sentiment
+                    metrics = {
+                        "Short Interest": f"{s.short_interest_pct:.2f}%" if s.short_interest_pct else "-",
+                        "Analyst Consensus": f"{s.analyst_consensus_score:.0f}/100",
+                        "Reddit Mentions": str(s.reddit_mentions),
+                        "Reddit Sentiment": f"{s.reddit_sentiment_score:.0%} Bull",
+                        "StockTwits": f"{s.stocktwits_bull_ratio:.0%} Bull"
+                    }
+                    st.table(pd.DataFrame(metrics.items(), columns=["Metric", "Value"]))
+
+            # Neighbours in the latest stored snapshot (see `contrarian snapshot`)
+            st.subheader("Similar Stocks")
+            similar_universe = st.selectbox("Compare within", ["sp500", "nasdaq100", "test"])
+            index = get_similarity_index(similar_universe)
+            if index.snapshot_id is None:
+                st.caption(f"No snapshot for {similar_universe} yet; run `contrarian snapshot --universe {similar_universe}`.")
+            elif not index.contains(stock.ticker):
+                st.caption(f"{stock.ticker} is not in the latest {similar_universe} snapshot.")
             else:
-                stock = data["stock"]
-                scores = data["scores"]
-                
-                # Header
-                st.header(f"{stock.company_name} ({stock.ticker})")
-                st.subheader(f"${stock.price:,.2f} | {scores['signal']}")
-                
-                # Scores Row
-                c1, c2, c3 = st.columns(3)
-                with c1:
-                    st.plotly_chart(create_gauge(scores['contrarian_score'], "Contrarian Score"), use_container_width=True)
-                with c2:
-                    st.metric("Fundamental Score", f"{scores['fundamental_score']:.1f}")
-                    st.metric("Sentiment Score", f"{scores['sentiment_score']:.1f}")
-                with c3:
-                    st.info(f"Sector: {stock.sector}\n\nIndustry: {stock.industry}")
-
-                # Fundamentals & Sentiment Columns
-                col_fund, col_sent = st.columns(2)
-                
-                with col_fund:
-                    st.subheader("Fundamentals")
-                    if stock.financials:
-                        f = stock.financials
-                        metrics = {
-                            "Market Cap": f"${f.market_cap:,.0f}" if f.market_cap else "-",
-                            "P/E Ratio": f"{f.pe_ratio:.2f}" if f.pe_ratio else "-",
-                            "P/B Ratio": f"{f.pb_ratio:.2f}" if f.pb_ratio else "-",
-                            "Rev Growth": f"{f.revenue_growth:.1%}" if f.revenue_growth else "-",
-                            "Profit Margin": f"{f.profit_margin:.1%}" if f.profit_margin else "-",
-                            "Debt/Equity": f"{f.debt_to_equity:.2f}" if f.debt_to_equity else "-"
-                        }
-                        st.table(pd.DataFrame(metrics.items(), columns=["Metric", "Value"]))
-                
-                with col_sent:
-                    st.subheader("Sentiment")
-                    if stock.sentiment:
-                        s = stock.sentiment
-                        metrics = {
-                            "Short Interest": f"{s.short_interest_pct:.2f}%" if s.short_interest_pct else "-",
-                            "Analyst Consensus": f"{s.analyst_consensus_score:.0f}/100",
-                            "Reddit Mentions": str(s.reddit_mentions),
-                            "Reddit Sentiment": f"{s.reddit_sentiment_score:.0%} Bull",
-                            "StockTwits": f"{s.stocktwits_bull_ratio:.0%} Bull"
-                        }
-                        st.table(pd.DataFrame(metrics.items(), columns=["Metric", "Value"]))
+                neighbors = index.similar(stock.ticker, 10)
+                rows = SnapshotStore().load_tickers(index.snapshot_id, [t for t, _ in neighbors])
+                distances = dict(neighbors)
+                st.dataframe(pd.DataFrame([{
+                    "Ticker": r["ticker"],
+                    "Distance": f"{distances[r['ticker']]:.2f}",
+                    "Score": f"{r['scores']['contrarian_score']:.1f}",
+                    "Signal": r["scores"]["signal"],
+                    "Sector": r["stock"].sector
+                } for r in rows]), hide_index=True)
 
 # --- Page: Watchlist ---
 elif page == "Watchlist":
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from contrarian.analysis.pipeline import batch_screen
+
+RESYNC = "__resync__"
+
+def diff_payload(old: Dict, new: Dict) -> Dict:
+    """Keys of `new` whose values differ from `old`, recursing into nested dicts."""
+    changes = {}
+    for key, value in new.items():
+        before = old.get(key)
+        if isinstance(value, dict) and isinstance(before, dict):
+            nested = diff_payload(before, value)
+            if nested:
+                changes[key] = nested
+        elif value != before:
+            changes[key] = value
+    return changes
+
+class LiveClient:
+    """
+    One WebSocket connection. Messages go through a bounded queue; when the client falls
+    behind, its backlog is dropped and it is resynced with full snapshots of the affected
+    tickers instead, so a slow dashboard never holds up the others or grows memory.
+    """
+
+    def __init__(self, websocket, hub: "LiveHub", max_queue: int):
+        self.websocket = websocket
+        self.hub = hub
+        self.tickers: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.resync: Set[str] = set()
+
+    def offer(self, ticker: str, message: str):
+        if ticker in self.resync:
+            return  # A full snapshot is already owed
+        try:
+            self.queue.put_nowait((ticker, message))
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                stale, _ = self.queue.get_nowait()
+                if stale != RESYNC:
+                    self.resync.add(stale)
+            self.resync.add(ticker)
+            self.queue.put_nowait((RESYNC, None))
+
+    async def sender(self):
+        while True:
+            ticker, message = await self.queue.get()
+            if ticker == RESYNC:
+                pending, self.resync = self.resync, set()
+                for t in pending:
+                    if t in self.tickers and t in self.hub.latest:
+                        await self.websocket.send_text(self.hub.snapshot_message(t))
+            else:
+                await self.websocket.send_text(message)
+
+class LiveHub:
+    """
+    Fan-out of score updates to WebSocket subscribers.
+
+    Every scored result (screens, single lookups, the background refresher) is reduced to a
+    diff against the last payload seen for that ticker, encoded once and handed to the
+    clients subscribed to the ticker via a ticker -> clients index.
+    """
+
+    def __init__(self, serialize: Callable[[Dict], Dict], max_queue: int = 256):
+        self.serialize = serialize
+        self.max_queue = max_queue
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.latest: Dict[str, Dict] = {}
+        self.subscribers: Dict[str, Set[LiveClient]] = defaultdict(set)
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+
+    # --- Producers (any thread) ---
+
+    def on_scored(self, data: Dict):
+        if self.loop is None:
+            return
+        ticker = data["stock"].ticker
+        payload = self.serialize(data)
+        self.loop.call_soon_threadsafe(self._apply, ticker, payload)
+
+    def _apply(self, ticker: str, payload: Dict):
+        previous = self.latest.get(ticker)
+        self.latest[ticker] = payload
+        clients = self.subscribers.get(ticker)
+        if not clients:
+            return
+        if previous is None:
+            message = self.snapshot_message(ticker)
+        else:
+            changes = diff_payload(previous, payload)
+            if not changes:
+                return
+            message = json.dumps({"type": "diff", "ticker": ticker, "data": changes})
+        for client in clients:
+            client.offer(ticker, message)
+
+    def snapshot_message(self, ticker: str) -> str:
+        return json.dumps({"type": "snapshot", "ticker": ticker, "data": self.latest[ticker]})
+
+    # --- Subscriptions (event loop thread) ---
+
+    def subscribe(self, client: LiveClient, tickers: Iterable[str]):
+        for t in tickers:
+            t = t.upper()
+            client.tickers.add(t)
+            self.subscribers[t].add(client)
+            if t in self.latest:
+                client.offer(t, self.snapshot_message(t))
+
+    def unsubscribe(self, client: LiveClient, tickers: Iterable[str]):
+        for t in tickers:
+            t = t.upper()
+            client.tickers.discard(t)
+            clients = self.subscribers.get(t)
+            if clients:
+                clients.discard(client)
+                if not clients:
+                    del self.subscribers[t]
+
+    def disconnect(self, client: LiveClient):
+        self.unsubscribe(client, list(client.tickers))
+
+    def subscribed_tickers(self) -> List[str]:
+        return list(self.subscribers.keys())
+
+class Refresher(threading.Thread):
+    """Re-scores every subscribed ticker periodically: one computation for all dashboards."""
+
+    def __init__(self, hub: LiveHub, interval_seconds: float):
+        super().__init__(daemon=True)
+        self.hub = hub
+        self.interval = interval_seconds
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            tickers = self.hub.subscribed_tickers()
+            if tickers:
+                # Results reach the hub through the pipeline's score listeners
+                batch_screen(tickers)
+
+    def stop(self):
+        self.stopped.set()
@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
+import asyncio
 import json
 from dataclasses import asdict
 from datetime import datetime
@@ -8,12 +11,26 @@ from pathlib import Path
 
 # Import core logic
 # Assumes app is run from the root directory (contrarian-screener)
-from contrarian.analysis.pipeline import fetch_and_score, batch_screen
+from contrarian.analysis.pipeline import fetch_and_score, batch_screen, screen_pruned, screen_profiles
+from contrarian.analysis.profiles import get_profiles, available_profiles
+from contrarian.data.planner import plan_sources
+from contrarian.data.snapshots import SnapshotStore, ResultQuery
+from contrarian.analysis.alerts import AlertRule, install_alerts, load_rules, parse_value, save_rules
+from contrarian.analysis.events import add_listener
+from backend.live import LiveHub, LiveClient, Refresher
+from backend.serialization import serialize_stock_data, payload_cache
+from contrarian.output import arrow
+from contrarian.analysis.relative import get_cached_context
+from contrarian.analysis.similarity import get_similarity_index
 from contrarian.universes.tickers import Universe
+from contrarian.universes.search import get_search_index
 from contrarian.config import config
 
 app = FastAPI(title="Contrarian Screener API", version="0.1.0")
 
+# Evaluate saved alert rules against every ticker the API scores
+install_alerts()
+
 # CORS - Allow frontend (localhost:3345)
 origins = [
     "http://localhost:3345",
@@ -27,26 +44,17 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Large screens compress well; small payloads are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # --- Helpers ---
-def serialize_stock_data(data: dict):
-    """Convert dataclasses to dicts for JSON serialization"""
-    if not data:
-        return None
-    
-    stock = data["stock"]
-    return {
-        "ticker": data["ticker"],
-        "scores": data["scores"],
-        "price": stock.price,
-        "company_name": stock.company_name,
-        "sector": stock.sector,
-        "industry": stock.industry,
-        "financials": asdict(stock.financials) if stock.financials else None,
-        "sentiment": asdict(stock.sentiment) if stock.sentiment else None,
-        "fifty_two_week_high": stock.fifty_two_week_high,
-        "fifty_two_week_low": stock.fifty_two_week_low
-    }
+def json_bytes(body: bytes) -> Response:
+    """Pre-encoded JSON (see backend.serialization) returned without re-encoding."""
+    return Response(content=body, media_type="application/json")
+
+def arrow_response(results) -> StreamingResponse:
+    """Results as an Arrow IPC stream, sent batch by batch."""
+    return StreamingResponse(arrow.stream_arrow(results), media_type="application/vnd.apache.arrow.stream")
 
 WATCHLIST_FILE = config.DATA_DIR / "watchlist.json"
 
@@ -63,43 +71,199 @@ def save_watchlist_data(data):
     with open(WATCHLIST_FILE, "w") as f:
         json.dump(data, f, indent=4)
 
+# Live updates: every scored ticker is pushed to /ws subscribers
+hub = LiveHub(serialize_stock_data, max_queue=config.LIVE_CLIENT_QUEUE_SIZE)
+add_listener(hub.on_scored)
+
+@app.on_event("startup")
+async def start_live_updates():
+    hub.attach(asyncio.get_running_loop())
+    if config.LIVE_REFRESH_SECONDS > 0:
+        Refresher(hub, config.LIVE_REFRESH_SECONDS).start()
+
 # --- Endpoints ---
 
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "Contrarian Screener API is running"}
 
+def parse_plan(fields: Optional[str], filters=()):
+    """Turns a `fields=` projection into the minimal source plan (400 on unknown fields)."""
+    try:
+        field_list = fields.split(",") if fields else None
+        return field_list, plan_sources(field_list, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/api/stock/{ticker}")
-def get_stock(ticker: str):
-    """Analyze a single stock"""
-    data = fetch_and_score(ticker.upper())
+def get_stock(ticker: str, relative_to: Optional[str] = None, fields: Optional[str] = None,
+              deadline_ms: int = Query(config.DEEP_DIVE_DEADLINE_MS, ge=0)):
+    """
+    Analyze a single stock. `relative_to` scores it against peers from a previous relative screen.
+    `fields` (e.g. `financials,price`) limits the response, and the upstream fetches, to those fields.
+    Sources are fetched concurrently for at most `deadline_ms`; `provenance` tells which
+    fields are live, from the cache, or neutral defaults because their source was late.
+    A symbol that cannot be fetched gets a 404 suggesting similar known tickers ("APPL").
+    """
+    field_list, plan = parse_plan(fields)
+    sector_context = get_cached_context(relative_to) if relative_to else None
+    # A company name typed in full ("apple") resolves locally; unknown symbols are tried as given
+    ticker = get_search_index().resolve(ticker) or ticker.upper()
+    # The per-source fetches run as interactive tasks, ahead of queued screen work
+    data = fetch_and_score(ticker, sector_context, plan, deadline_ms=deadline_ms)
     if not data:
-        raise HTTPException(status_code=404, detail="Stock not found or could not fetch data")
-    return serialize_stock_data(data)
+        suggestions = [m.ticker for m in get_search_index().search(ticker, limit=5) if m.ticker != ticker]
+        hint = f"; did you mean {', '.join(suggestions)}?" if suggestions else ""
+        raise HTTPException(status_code=404, detail=f"Stock not found or could not fetch data{hint}")
+    return json_bytes(payload_cache.encode(data, field_list))
+
+@app.get("/api/search")
+def search_tickers(q: str, limit: int = Query(10, ge=1, le=50)):
+    """
+    Autocomplete for a partial ticker or company name (`q=app`, `q=micro dev`), from the
+    registered universes and every ticker seen so far. Falls back to fuzzy matches for
+    typos; `matched` says how each result matched (ticker, name, word or fuzzy).
+    """
+    return [m._asdict() for m in get_search_index().search(q, limit)]
+
+@app.get("/api/stock/{ticker}/similar")
+def similar_stocks(ticker: str, k: int = Query(10, ge=1, le=100), universe: str = "sp500",
+                   fields: Optional[str] = None):
+    """
+    The `k` stocks most like `ticker` in the latest stored snapshot of `universe`: nearest
+    by fundamentals, crowding (sentiment) and score components. `neighbors` holds the
+    distances, nearest first; `items` the stored rows in the same order.
+    """
+    field_list, _ = parse_plan(fields)
+    index = get_similarity_index(universe)
+    if index.snapshot_id is None:
+        raise HTTPException(status_code=404, detail=f"No snapshot for {universe}; run `contrarian snapshot {universe}` first")
+    try:
+        neighbors = index.similar(ticker, k)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"{ticker.upper()} is not in the latest {universe} snapshot")
+
+    results = SnapshotStore().load_tickers(index.snapshot_id, [t for t, _ in neighbors])
+    head = json.dumps({
+        "ticker": ticker.upper(), "universe": universe, "snapshot_id": index.snapshot_id,
+        "neighbors": [{"ticker": t, "distance": round(d, 4)} for t, d in neighbors]
+    })[:-1]
+    return json_bytes(head.encode() + b', "items": ' + payload_cache.encode_list(results, field_list) + b"}")
 
 @app.get("/api/screen")
-def run_screen(universe: str = "sp500", min_score: int = 50, limit: int = 50):
-    """Run a screen on a universe"""
+def run_screen(
+    universe: str = "sp500",
+    min_score: int = 50,
+    limit: int = 50,
+    relative: bool = False,
+    min_short_interest: Optional[float] = None,
+    fields: Optional[str] = None,
+    profile: Optional[str] = None,
+    format: str = "json",
+):
+    """
+    Run a screen on a universe. `relative` scores fundamentals against sector/industry peers.
+    With `fields` and `min_score=0`, score-free queries skip the social sources entirely.
+    `profile=a,b,c` returns {profile: rows} with one ranking per scoring profile, all from
+    the same data fetch (see /api/profiles).
+    `format=arrow` streams every column as a typed Arrow IPC stream instead of JSON
+    (`fields` does not apply; multi-profile rows carry a `profile` column).
+    """
     tickers = Universe.get_tickers(universe)
     if not tickers:
         raise HTTPException(status_code=400, detail="Invalid universe")
+    if format not in ("json", "arrow"):
+        raise HTTPException(status_code=400, detail="format must be json or arrow")
+    if format == "arrow" and arrow.pa is None:
+        raise HTTPException(status_code=501, detail="Arrow export needs pyarrow installed on the server")
+    
+    filters = []
+    if min_score > 0:
+        filters.append("min_score")
+    if min_short_interest is not None:
+        filters.append("min_short_interest")
+    field_list, plan = parse_plan(fields, filters)
+    
+    def short_interest_ok(stock):
+        return (stock.sentiment.short_interest_pct or 0) >= min_short_interest
+    base_filter = short_interest_ok if min_short_interest is not None else None
+    
+    if not plan.needs_scores:
+        # Projection without scores: just the planned fetches, in universe order
+        results = [r for r in batch_screen(tickers, plan=plan)
+                   if not base_filter or base_filter(r["stock"])]
+        if format == "arrow":
+            return arrow_response(results[:limit])
+        return json_bytes(payload_cache.encode_list(results[:limit], field_list))
+    
+    if profile:
+        try:
+            profiles = get_profiles(profile.split(","))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rankings = screen_profiles(tickers, min_score, profiles, limit=limit,
+                                   relative_key=universe if relative else None,
+                                   plan=plan, base_filter=base_filter)
+        if format == "arrow":
+            return arrow_response({**r, "profile": name} for name, rows in rankings.items() for r in rows)
+        body = b",".join(json.dumps(name).encode() + b":" + payload_cache.encode_list(rows, field_list)
+                         for name, rows in rankings.items())
+        return json_bytes(b"{" + body + b"}")
     
     # In a real app, this should be a background task or cached
-    # For MVP, we'll limit the number of tickers to prevent timeouts if needed
-    # But batch_screen uses threading, so it's relatively fast
+    # Social data is only fetched for tickers that can still reach min_score / the top `limit`
+    results = screen_pruned(tickers, min_score, limit=limit,
+                            relative_key=universe if relative else None,
+                            plan=plan, base_filter=base_filter)
     
-    results = batch_screen(tickers, max_workers=10)
+    if format == "arrow":
+        return arrow_response(results)
+    return json_bytes(payload_cache.encode_list(results, field_list))
+
+@app.get("/api/results")
+def query_results(
+    universe: str = "sp500",
+    snapshot_id: Optional[int] = None,
+    sector: Optional[str] = None,
+    signal: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_short_interest: Optional[float] = None,
+    max_short_interest: Optional[float] = None,
+    min_pe: Optional[float] = None,
+    max_pe: Optional[float] = None,
+    sort: str = "-contrarian_score",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Page through the latest stored snapshot of a universe (see `contrarian snapshot`)
+    without re-running the pipeline, e.g. `sector=Technology&signal=Potential Long&sort=-short_interest`.
+    `sector` takes a comma list; pass the returned `next_cursor` as `cursor` for the next page.
+    """
+    field_list, _ = parse_plan(fields)
+    store = SnapshotStore()
+    if snapshot_id is None:
+        snapshot = store.latest(universe)
+        if not snapshot:
+            raise HTTPException(status_code=404, detail=f"No snapshot for {universe}; run `contrarian snapshot {universe}` first")
+        snapshot_id = snapshot["id"]
     
-    # Filter and Sort
-    filtered = []
-    for res in results:
-        if res["scores"]["contrarian_score"] >= min_score:
-            filtered.append(serialize_stock_data(res))
-            
-    # Sort desc by score
-    filtered.sort(key=lambda x: x["scores"]["contrarian_score"], reverse=True)
+    try:
+        query = ResultQuery(
+            sectors=sector.split(",") if sector else None, signal=signal,
+            min_score=min_score, max_score=max_score,
+            min_short_interest=min_short_interest, max_short_interest=max_short_interest,
+            min_pe=min_pe, max_pe=max_pe, sort=sort
+        )
+        results, next_cursor = store.query(snapshot_id, query, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return filtered[:limit]
+    # Rows come straight from cached payload bytes; only the envelope is encoded here
+    head = json.dumps({"snapshot_id": snapshot_id, "next_cursor": next_cursor})[:-1]
+    return json_bytes(head.encode() + b', "items": ' + payload_cache.encode_list(results, field_list) + b"}")
 
 @app.get("/api/watchlist")
 def get_watchlist():
@@ -134,6 +298,76 @@ def remove_from_watchlist(ticker: str):
     save_watchlist_data(new_data)
     return {"message": "Removed", "ticker": ticker_upper}
 
+@app.get("/api/alerts")
+def get_alerts():
+    return [asdict(r) for r in load_rules()]
+
+@app.post("/api/alerts")
+def add_alert(field: str, op: str, value: str, ticker: Optional[str] = None, cooldown_minutes: float = 60, sink: str = "file"):
+    # Thresholds arrive as strings in the query
+    try:
+        rule = AlertRule(field=field, op=op, value=parse_value(value), ticker=ticker, cooldown_minutes=cooldown_minutes, sink=sink)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rules = load_rules()
+    rules.append(rule)
+    save_rules(rules)
+    install_alerts(reload=True)
+    return {"message": "Added", "id": rule.id}
+
+@app.delete("/api/alerts/{rule_id}")
+def remove_alert(rule_id: str):
+    rules = load_rules()
+    remaining = [r for r in rules if r.id != rule_id]
+    if len(rules) == len(remaining):
+        raise HTTPException(status_code=404, detail="Alert not found")
+    save_rules(remaining)
+    install_alerts(reload=True)
+    return {"message": "Removed", "id": rule_id}
+
+def as_list(value) -> list:
+    return value if isinstance(value, list) else []
+
+@app.websocket("/ws")
+async def live_updates(websocket: WebSocket):
+    """
+    Push channel for score updates. Clients send
+    {"action": "subscribe" | "unsubscribe", "universes": [...], "tickers": [...], "watchlist": true}
+    and receive {"type": "snapshot" | "diff", "ticker", "data"} messages.
+    """
+    await websocket.accept()
+    client = LiveClient(websocket, hub, config.LIVE_CLIENT_QUEUE_SIZE)
+    sender = asyncio.create_task(client.sender())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                continue  # Not JSON: ignored
+            if not isinstance(message, dict):
+                continue  # Valid JSON but not a subscription object ([], "x"): ignored
+            tickers = set(t.upper() for t in as_list(message.get("tickers")) if isinstance(t, str))
+            for universe in as_list(message.get("universes")):
+                if isinstance(universe, str):
+                    tickers.update(Universe.get_tickers(universe))
+            if message.get("watchlist"):
+                tickers.update(item["ticker"] for item in load_watchlist_data())
+            
+            if message.get("action") == "unsubscribe":
+                hub.unsubscribe(client, tickers)
+            else:
+                hub.subscribe(client, tickers)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        hub.disconnect(client)
+        sender.cancel()
+
+@app.get("/api/profiles")
+def get_scoring_profiles():
+    return available_profiles()
+
 @app.get("/api/universes")
 def get_universes():
-    return ["sp500", "nasdaq100", "test"]
+    return Universe.names()
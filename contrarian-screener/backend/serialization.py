@@ -0,0 +1,87 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from contrarian.data.planner import expand_fields, project
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up (pip install contrarian-screener[fast])
+    orjson = None
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def serialize_stock_data(data: dict):
+    """Convert dataclasses to dicts for JSON serialization"""
+    if not data:
+        return None
+
+    stock = data["stock"]
+    # The nested dataclasses only hold scalars, so a shallow copy of their __dict__
+    # is enough (no recursive asdict() per row)
+    payload = {
+        "ticker": data["ticker"],
+        "scores": data["scores"],
+        "price": stock.price,
+        "company_name": stock.company_name,
+        "sector": stock.sector,
+        "industry": stock.industry,
+        "financials": dict(vars(stock.financials)) if stock.financials else None,
+        "sentiment": dict(vars(stock.sentiment)) if stock.sentiment else None,
+        "fifty_two_week_high": stock.fifty_two_week_high,
+        "fifty_two_week_low": stock.fifty_two_week_low
+    }
+    # Deadline-bounded lookups say where each field came from (live, cached, default)
+    if data.get("provenance") is not None:
+        payload["provenance"] = data["provenance"]
+    return payload
+
+class EncodedPayloadCache:
+    """
+    LRU of encoded JSON bytes per (ticker, result version, field projection).
+
+    Every scored result carries a `version` stamped by the pipeline, so re-reading an
+    unchanged result (repeat screens, lookups served from snapshots) reuses its bytes
+    instead of rebuilding and re-encoding the payload. Results without a version are
+    always encoded fresh.
+    """
+
+    def __init__(self, maxsize: int = 20000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, data: Dict, fields: Optional[List[str]] = None) -> bytes:
+        version = data.get("version")
+        key = (data["stock"].ticker, version, tuple(fields) if fields else None)
+        if version is not None:
+            with self._lock:
+                body = self._entries.get(key)
+                if body is not None:
+                    self._entries.move_to_end(key)
+                    return body
+
+        payload = serialize_stock_data(data)
+        if fields:
+            projected = project(payload, fields)
+            if "provenance" in payload:
+                wanted = expand_fields(fields)
+                projected["provenance"] = {k: v for k, v in payload["provenance"].items() if k in wanted}
+            payload = projected
+        body = dumps(payload)
+
+        if version is not None:
+            with self._lock:
+                self._entries[key] = body
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return body
+
+    def encode_list(self, results: Iterable[Dict], fields: Optional[List[str]] = None) -> bytes:
+        """A JSON array assembled from the per-row cached bytes."""
+        return b"[" + b",".join(self.encode(r, fields) for r in results) + b"]"
+
+payload_cache = EncodedPayloadCache()
@@ -0,0 +1,101 @@
+"""
+Per-response serialization cost for a large screen.
+
+    uv run python -m benchmarks.bench_serialization --tickers 5000
+
+Compares the old path (dataclasses.asdict per row + stdlib json) with the encoded
+payload cache, cold (first read of a result) and warm (repeat read of unchanged results).
+"""
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict
+from backend.serialization import EncodedPayloadCache, orjson
+from contrarian.models.stock import Stock, Financials, Sentiment
+
+def make_results(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        stock = Stock(
+            ticker=f"T{i:05d}",
+            price=rng.uniform(5, 500),
+            company_name=f"Company {i}",
+            sector=rng.choice(["Technology", "Financial Services", "Energy", "Healthcare"]),
+            industry="Industry",
+            financials=Financials(
+                market_cap=rng.randint(10**8, 10**12),
+                pe_ratio=rng.uniform(5, 60),
+                pb_ratio=rng.uniform(0.5, 20),
+                revenue_growth=rng.uniform(-0.2, 0.5),
+                profit_margin=rng.uniform(-0.1, 0.4),
+                debt_to_equity=rng.uniform(0, 300),
+                free_cash_flow=rng.randint(-10**9, 10**10)
+            ),
+            sentiment=Sentiment(
+                analyst_buy_count=rng.choice([0, 10]),
+                short_interest_pct=rng.uniform(0, 30),
+                reddit_mentions=rng.randint(0, 300),
+                reddit_sentiment_score=rng.random(),
+                stocktwits_bull_ratio=rng.random()
+            ),
+            fifty_two_week_high=rng.uniform(5, 600),
+            fifty_two_week_low=rng.uniform(1, 5)
+        )
+        scores = {
+            "contrarian_score": rng.uniform(0, 100),
+            "fundamental_score": rng.uniform(0, 100),
+            "sentiment_score": rng.uniform(0, 100),
+            "signal": "Watch",
+            "is_hated": False,
+            "is_loved": False
+        }
+        results.append({"ticker": stock.ticker, "stock": stock, "scores": scores, "version": i + 1})
+    return results
+
+def legacy_encode(results) -> bytes:
+    rows = []
+    for data in results:
+        stock = data["stock"]
+        rows.append({
+            "ticker": data["ticker"],
+            "scores": data["scores"],
+            "price": stock.price,
+            "company_name": stock.company_name,
+            "sector": stock.sector,
+            "industry": stock.industry,
+            "financials": asdict(stock.financials) if stock.financials else None,
+            "sentiment": asdict(stock.sentiment) if stock.sentiment else None,
+            "fifty_two_week_high": stock.fifty_two_week_high,
+            "fifty_two_week_low": stock.fifty_two_week_low
+        })
+    return json.dumps(rows).encode()
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = make_results(args.tickers)
+    legacy = timed(lambda: legacy_encode(results), args.repeat)
+    cold = timed(lambda: EncodedPayloadCache().encode_list(results), args.repeat)
+    cache = EncodedPayloadCache()
+    cache.encode_list(results)
+    warm = timed(lambda: cache.encode_list(results), args.repeat)
+
+    print(f"Encoder: {'orjson' if orjson else 'stdlib json'} | rows per response: {args.tickers}")
+    for name, seconds in (("legacy asdict + json", legacy), ("cache cold", cold), ("cache warm", warm)):
+        print(f"{name:<22} {seconds * 1000:8.2f} ms/response  {seconds / args.tickers * 1e6:6.2f} us/row")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+HTTP load test of the FastAPI backend against stubbed upstreams.
+
+    uv run python -m benchmarks.loadtest --traffic mixed --concurrency 32 --duration 30
+    uv run python -m benchmarks.loadtest --traffic interactive --rate 50 --latency-ms yahoo=80,reddit=300 --error-rate 0.05
+
+Starts the stub upstreams (benchmarks.stub_upstream) and the backend
+(benchmarks.loadtest_backend) as subprocesses, drives a traffic mix for `--duration`
+seconds after `--warmup`, and prints a JSON report: throughput, p50/p95/p99 latency
+and error rate overall and per request kind. Without `--rate` it is closed-loop
+(`--concurrency` clients, each sending its next request when the last one returns);
+with `--rate` requests arrive at that many per second regardless of responses, at most
+`--concurrency` in flight, which is what exposes a latency collapse. Latency is measured
+from each request's scheduled arrival, so time spent queued client-side counts too, and
+every request sent during the window is reported, however late it completes.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Request kind -> share of the traffic
+TRAFFIC = {
+    "interactive": {"stock": 1.0},
+    "mixed": {"stock": 0.85, "screen": 0.1, "screen_profiles": 0.05},
+    "bulk": {"screen": 0.8, "screen_profiles": 0.2},
+}
+
+def request_path(kind: str, universe: str, tickers: List[str], rng: random.Random) -> str:
+    if kind == "stock":
+        return f"/api/stock/{rng.choice(tickers)}"
+    if kind == "screen":
+        return f"/api/screen?universe={universe}&min_score=50&limit=50"
+    if kind == "screen_profiles":
+        return f"/api/screen?universe={universe}&min_score=50&limit=50&profile=default,strict,squeeze"
+    raise ValueError(f"Unknown request kind: {kind}")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_ready(url: str, timeout: float, proc: subprocess.Popen):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {proc.returncode} before becoming ready")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout:.0f}s")
+
+def start_servers(args, workdir: Path) -> Tuple[str, List[subprocess.Popen]]:
+    """Stub upstreams + backend; returns the backend URL and the processes to stop."""
+    stub_port, backend_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    log = open(workdir / "servers.log", "w")
+    procs = [subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_upstream", "--port", str(stub_port),
+         "--latency-ms", args.latency_ms, "--jitter", str(args.jitter), "--error-rate", str(args.error_rate)],
+        cwd=ROOT, stdout=log, stderr=subprocess.STDOUT
+    )]
+    wait_ready(f"{stub_url}/health", 15, procs[0])
+    procs.append(subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.loadtest_backend", "--stub-url", stub_url,
+         "--port", str(backend_port), "--data-dir", str(workdir / "data")],
+        cwd=ROOT, stdout=log, stderr=subprocess.STDOUT
+    ))
+    backend_url = f"http://127.0.0.1:{backend_port}"
+    wait_ready(f"{backend_url}/api/profiles", 60, procs[1])
+    return backend_url, procs
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize(samples: List[Tuple[str, float, bool]], seconds: float) -> Dict:
+    latencies = sorted(latency * 1000 for _, latency, _ in samples)
+    errors = sum(1 for _, _, ok in samples if not ok)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "throughput_rps": len(samples) / seconds if seconds else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None,
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+        },
+    }
+
+async def drive(args, base_url: str, tickers: List[str]) -> Tuple[List[Tuple[str, float, bool]], float]:
+    """
+    Sends the traffic mix; returns (kind, latency, ok) per request sent in the window, and
+    its length. Requests are kept however long they take to complete; those still
+    unanswered `--timeout` seconds after the window closes are cancelled and count as errors.
+    """
+    rng = random.Random(args.seed)
+    kinds, weights = zip(*TRAFFIC[args.traffic].items())
+    samples: List[Tuple[str, float, bool]] = []
+    start = time.monotonic()
+    measure_from = start + args.warmup
+    stop_at = measure_from + args.duration
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        async def one(sent: float, in_flight: Optional[asyncio.Semaphore] = None):
+            """One request, timed from `sent` (its scheduled arrival in the open loop)."""
+            kind = rng.choices(kinds, weights)[0]
+            path = request_path(kind, args.universe, tickers, rng)
+            ok = False
+            try:
+                if in_flight:
+                    # Time queued behind the in-flight limit is part of the latency
+                    async with in_flight:
+                        response = await client.get(path)
+                else:
+                    response = await client.get(path)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                pass
+            finally:
+                # Also runs on cancellation at the end of the run, recording it as an error
+                if measure_from <= sent < stop_at:
+                    samples.append((kind, time.monotonic() - sent, ok))
+
+        if args.rate:
+            # Open loop: arrivals do not wait for responses (Poisson, at most `concurrency` in flight)
+            in_flight = asyncio.Semaphore(args.concurrency)
+            tasks = set()
+            arrival = time.monotonic()
+            while arrival < stop_at:
+                task = asyncio.create_task(one(arrival, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                arrival += rng.expovariate(args.rate)
+                await asyncio.sleep(max(arrival - time.monotonic(), 0))
+            if tasks:
+                _, unfinished = await asyncio.wait(tasks, timeout=args.timeout)
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*unfinished, return_exceptions=True)
+        else:
+            async def client_loop():
+                while time.monotonic() < stop_at:
+                    await one(time.monotonic())
+
+            await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+    return samples, args.duration
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traffic", choices=sorted(TRAFFIC), default="mixed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients (closed loop) / max in flight (open loop)")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of traffic before measuring")
+    parser.add_argument("--timeout", type=float, default=60, help="Per request, seconds")
+    parser.add_argument("--universe", default="stub200", help='Screened universe; "stubN" is N synthetic tickers')
+    parser.add_argument("--latency-ms", default="50", help='Stub latency, e.g. "50" or "yahoo=80,reddit=300"')
+    parser.add_argument("--jitter", type=float, default=0.3)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub 503 probability per upstream request")
+    parser.add_argument("--backend-url", default=None, help="Test a running backend instead of starting one")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, default=None, help="Also write the report here")
+    args = parser.parse_args()
+
+    name = args.universe.lower()
+    tickers = [f"S{i:05d}" for i in range(int(name[4:]))] if name.startswith("stub") else ["AAPL", "MSFT", "NVDA"]
+
+    workdir = Path(tempfile.mkdtemp(prefix="contrarian-loadtest-"))
+    procs: List[subprocess.Popen] = []
+    try:
+        base_url = args.backend_url
+        if not base_url:
+            base_url, procs = start_servers(args, workdir)
+        samples, seconds = asyncio.run(drive(args, base_url, tickers))
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    report = {
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "overall": summarize(samples, seconds),
+        "endpoints": {
+            kind: summarize([s for s in samples if s[0] == kind], seconds)
+            for kind in TRAFFIC[args.traffic]
+        },
+        "server_log": None if args.backend_url else str(workdir / "servers.log"),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Runs the FastAPI backend against the stub upstreams (see benchmarks.stub_upstream).
+
+    uv run python -m benchmarks.loadtest_backend --stub-url http://127.0.0.1:8900 --port 8800
+
+The data clients keep their own parsing; only the transport is redirected: Yahoo's
+`yf.Ticker(...).info`, Finviz's and StockTwits' base URLs and the Reddit search. All
+local state (store, caches, alerts) goes to `--data-dir`, and universes named
+"stubN" (e.g. stub500) resolve to N synthetic tickers.
+"""
+import argparse
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+import httpx
+
+def redirect_upstreams(stub_url: str):
+    import contrarian.data.yahoo as yahoo
+    from contrarian.config import config
+    from contrarian.data.finviz import FinvizClient
+    from contrarian.data.reddit import RedditPool
+    from contrarian.data.stocktwits import StockTwitsClient
+
+    http = httpx.Client(base_url=stub_url, timeout=30, limits=httpx.Limits(max_connections=200))
+
+    class StubTicker:
+        def __init__(self, symbol: str):
+            self.symbol = symbol
+
+        @property
+        def info(self) -> dict:
+            response = http.get(f"/yahoo/{self.symbol}")
+            if response.status_code == 404:
+                raise Exception(f"404 Client Error: Not Found for {self.symbol}")
+            response.raise_for_status()
+            return response.json()
+
+    class StubSubreddit:
+        def __init__(self, name: str):
+            self.name = name
+
+        def search(self, query: str, sort: str = "new", time_filter: str = "week", limit: int = 100):
+            response = http.get(f"/reddit/{self.name}", params={"q": query, "limit": limit})
+            response.raise_for_status()
+            return [SimpleNamespace(**post) for post in response.json()]
+
+    class StubReddit:
+        def subreddit(self, name: str) -> StubSubreddit:
+            return StubSubreddit(name)
+
+    yahoo.yf = SimpleNamespace(Ticker=StubTicker)
+    FinvizClient.BASE_URL = f"{stub_url}/finviz/quote.ashx"
+    StockTwitsClient.BASE_URL = f"{stub_url}/stocktwits/{{}}.json"
+    RedditPool._create = lambda self: StubReddit()
+    config.REDDIT_CLIENT_ID = config.REDDIT_CLIENT_ID or "stub"
+    config.REDDIT_CLIENT_SECRET = config.REDDIT_CLIENT_SECRET or "stub"
+
+def add_stub_universes():
+    from contrarian.universes.tickers import Universe
+    get_tickers = Universe.get_tickers
+
+    def stub_tickers(universe_name: str):
+        name = universe_name.lower()
+        if name.startswith("stub") and name[4:].isdigit():
+            return [f"S{i:05d}" for i in range(int(name[4:]))]
+        return get_tickers(universe_name)
+
+    Universe.get_tickers = staticmethod(stub_tickers)
+
+def use_data_dir(data_dir: Path):
+    from contrarian.config import config
+    data_dir.mkdir(parents=True, exist_ok=True)
+    config.DATA_DIR = data_dir
+    config.CACHE_FILE = data_dir / "cache.db"
+    config.STORE_FILE = data_dir / "store.db"
+    config.PRICES_DIR = data_dir / "prices"
+    config.ALERTS_FILE = data_dir / "alerts.json"
+    config.ALERTS_LOG_FILE = data_dir / "alerts.log.jsonl"
+    config.QUEUE_FILE = data_dir / "queue.db"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stub-url", default="http://127.0.0.1:8900")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--data-dir", type=Path, default=None, help="Default: a new temporary directory")
+    args = parser.parse_args()
+
+    # Paths first: backend.main reads some of them at import time
+    use_data_dir(args.data_dir or Path(tempfile.mkdtemp(prefix="contrarian-loadtest-")))
+    redirect_upstreams(args.stub_url)
+    add_stub_universes()
+
+    import uvicorn
+    from backend.main import app
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Local stand-in for the upstream data sources, for load tests.
+
+    uv run python -m benchmarks.stub_upstream --port 8900 --latency-ms yahoo=80,reddit=300 --error-rate 0.02
+
+Serves Yahoo quote info, the Finviz quote page, Reddit search results and StockTwits
+streams in the shapes the clients parse, with deterministic data per ticker. Every
+request sleeps for the source's latency (+/- `--jitter`) and fails with a 503 with
+probability `--error-rate`. Tickers starting with "ZZ" are unknown (404), to exercise
+the negative cache.
+"""
+import argparse
+import hashlib
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SOURCES = ("yahoo", "finviz", "reddit", "stocktwits")
+SECTORS = ["Technology", "Financial Services", "Energy", "Healthcare", "Consumer Cyclical", "Industrials"]
+RECOMMENDATIONS = ["strong_buy", "buy", "hold", "underperform", "sell", "none"]
+WORDS = ["call", "moon", "buy", "long", "put", "sell", "short", "bear", "earnings", "guidance"]
+
+def parse_per_source(value: str, default: float) -> dict:
+    """"80" or "yahoo=80,reddit=300" -> {source: value} (unlisted sources get `default`)."""
+    values = dict.fromkeys(SOURCES, default)
+    for part in filter(None, (value or "").split(",")):
+        if "=" in part:
+            source, number = part.split("=", 1)
+            values[source.strip()] = float(number)
+        else:
+            values = dict.fromkeys(SOURCES, float(part))
+    return values
+
+def ticker_rng(ticker: str, salt: str = "") -> random.Random:
+    """Same ticker, same data, in every run and every process."""
+    return random.Random(int(hashlib.md5(f"{ticker}:{salt}".encode()).hexdigest()[:12], 16))
+
+def yahoo_info(ticker: str) -> dict:
+    rng = ticker_rng(ticker)
+    low = rng.uniform(5, 200)
+    high = low * rng.uniform(1.1, 3)
+    return {
+        "longName": f"{ticker} Holdings",
+        "currentPrice": rng.uniform(low, high),
+        "sector": rng.choice(SECTORS),
+        "industry": f"Industry {rng.randint(1, 20)}",
+        "marketCap": rng.randint(10**8, 10**12),
+        "trailingPE": rng.uniform(3, 80) if rng.random() > 0.1 else None,
+        "priceToBook": rng.uniform(0.3, 20),
+        "revenueGrowth": rng.uniform(-0.3, 0.6),
+        "profitMargins": rng.uniform(-0.2, 0.4),
+        "debtToEquity": rng.uniform(0, 300),
+        "freeCashflow": rng.randint(-10**9, 10**10),
+        "recommendationKey": rng.choice(RECOMMENDATIONS),
+        # Half the tickers leave short interest to Finviz
+        "shortPercentOfFloat": rng.uniform(0, 0.4) if rng.random() > 0.5 else None,
+        "fiftyTwoWeekHigh": high,
+        "fiftyTwoWeekLow": low,
+    }
+
+def finviz_page(ticker: str) -> str:
+    short = ticker_rng(ticker, "finviz").uniform(0, 40)
+    return (
+        '<html><body><table class="snapshot-table2"><tr>'
+        f"<td>Short Float</td><td>{short:.2f}%</td><td>Ticker</td><td>{ticker}</td>"
+        "</tr></table></body></html>"
+    )
+
+def reddit_search(subreddit: str, query: str, limit: int) -> list:
+    ticker = query.split(" ")[0]
+    rng = ticker_rng(ticker, subreddit)
+    return [
+        {"title": f"{ticker} {rng.choice(WORDS)}", "selftext": " ".join(rng.choices(WORDS, k=rng.randint(0, 12)))}
+        for _ in range(min(limit, rng.randint(0, 40)))
+    ]
+
+def stocktwits_stream(ticker: str, since: int) -> dict:
+    # A steady stream: ids grow with time, so `since` returns only the newest messages
+    now = datetime.now(timezone.utc)
+    rng = ticker_rng(ticker, str(int(now.timestamp()) // 60))
+    messages = []
+    newest = int(now.timestamp())
+    for i in range(30):
+        msg_id = newest - i * 60
+        if since and msg_id <= since:
+            break
+        basic = rng.choice(["Bullish", "Bearish", None])
+        messages.append({
+            "id": msg_id,
+            "created_at": (now - timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "entities": {"sentiment": {"basic": basic} if basic else None},
+        })
+    return {"messages": messages, "cursor": {"more": False}}
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = dict.fromkeys(SOURCES, 0.0)  # Seconds
+    jitter = 0.0
+    error_rate = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        source = parts[0] if parts else ""
+        if source == "health":
+            return self.reply(200, b"ok", "text/plain")
+        if source not in SOURCES:
+            return self.reply(404, b"unknown source", "text/plain")
+
+        delay = self.latency[source] * (1 + random.uniform(-self.jitter, self.jitter))
+        time.sleep(max(delay, 0))
+        if random.random() < self.error_rate:
+            return self.reply(503, b"injected failure", "text/plain")
+
+        if source == "yahoo":
+            ticker = parts[1]
+        elif source == "finviz":
+            ticker = query.get("t", "")
+        elif source == "reddit":
+            ticker = query.get("q", "").split(" ")[0]
+        else:
+            ticker = parts[1].removesuffix(".json")
+        if ticker.upper().startswith("ZZ"):
+            return self.reply(404, b"not found", "text/plain")
+
+        if source == "yahoo":
+            body = json.dumps(yahoo_info(ticker))
+        elif source == "finviz":
+            return self.reply(200, finviz_page(ticker).encode(), "text/html")
+        elif source == "reddit":
+            body = json.dumps(reddit_search(parts[1], query.get("q", ""), int(query.get("limit", 100))))
+        else:
+            body = json.dumps(stocktwits_stream(ticker, int(query.get("since", 0))))
+        self.reply(200, body.encode(), "application/json")
+
+    def reply(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per request would dominate a load test
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", default="50", help='Per request, e.g. "50" or "yahoo=80,reddit=300"')
+    parser.add_argument("--jitter", type=float, default=0.3, help="Latency varies by +/- this fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503 per request")
+    args = parser.parse_args()
+
+    StubHandler.latency = {s: ms / 1000 for s, ms in parse_per_source(args.latency_ms, 50).items()}
+    StubHandler.jitter = args.jitter
+    StubHandler.error_rate = args.error_rate
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+    print(f"Stub upstreams on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import json
+import operator
+import threading
+import time
+import uuid
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.analysis.events import add_listener, remove_listener
+from contrarian.data.store import open_store
+from contrarian.models.stock import Financials, Sentiment
+from contrarian.output.sinks import default_sinks
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+SCORE_FIELDS = ("contrarian_score", "fundamental_score", "sentiment_score", "signal", "is_hated", "is_loved", "crowding_z")
+STOCK_FIELDS = ("price", "sector", "industry", "fifty_two_week_high", "fifty_two_week_low", "percent_from_high")
+ALERT_FIELDS = set(SCORE_FIELDS) | set(STOCK_FIELDS) \
+    | {f"financials.{f.name}" for f in dataclass_fields(Financials)} \
+    | {f"sentiment.{f.name}" for f in dataclass_fields(Sentiment)}
+
+def parse_value(value: str) -> Any:
+    """A rule threshold typed as text (CLI argument, query parameter): number, bool or string."""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+@dataclass
+class AlertRule:
+    field: str
+    op: str
+    value: Any
+    ticker: Optional[str] = None   # None = every ticker
+    cooldown_minutes: float = 60
+    sink: str = "file"
+    id: str = ""
+
+    def __post_init__(self):
+        if self.field not in ALERT_FIELDS:
+            raise ValueError(f"Unknown field: {self.field}")
+        if self.op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {self.op}")
+        self.ticker = self.ticker.upper() if self.ticker else None
+        self.id = self.id or uuid.uuid4().hex[:8]
+
+    def matches(self, value: Any) -> bool:
+        if value is None:
+            return False
+        try:
+            return OPERATORS[self.op](value, self.value)
+        except TypeError:
+            return False
+
+    def describe(self) -> str:
+        return f"{self.ticker or '*'} {self.field} {self.op} {self.value}"
+
+def flatten_result(data: Dict) -> Dict[str, Any]:
+    """The alertable fields of a scored result as one flat dict."""
+    stock = data["stock"]
+    flat = {k: data["scores"].get(k) for k in SCORE_FIELDS}
+    for k in STOCK_FIELDS:
+        flat[k] = getattr(stock, k)
+    if stock.financials:
+        flat.update({f"financials.{k}": v for k, v in asdict(stock.financials).items()})
+    if stock.sentiment:
+        flat.update({f"sentiment.{k}": v for k, v in asdict(stock.sentiment).items()})
+    return flat
+
+# --- Rule storage (same JSON-file approach as the watchlist) ---
+
+def load_rules() -> List[AlertRule]:
+    if not config.ALERTS_FILE.exists():
+        return []
+    with open(config.ALERTS_FILE, "r") as f:
+        return [AlertRule(**r) for r in json.load(f)]
+
+def save_rules(rules: List[AlertRule]):
+    with open(config.ALERTS_FILE, "w") as f:
+        json.dump([asdict(r) for r in rules], f, indent=4)
+
+class AlertEngine:
+    """
+    Evaluates alert rules incrementally as tickers are re-scored.
+
+    Rules are indexed by (ticker, field), with None as the wildcard ticker, and an update
+    only evaluates rules on fields whose value changed since that ticker's last update.
+    Alerts are edge-triggered (fire when a rule goes from not matching to matching, so a
+    condition that stays true is reported once) and then held back for the rule's cooldown.
+    Trigger state lives in the local store so it survives restarts.
+    """
+
+    def __init__(self, rules: List[AlertRule], sinks: Optional[Dict[str, object]] = None, db: Optional[Database] = None):
+        self.sinks = sinks or default_sinks()
+        self.db = db or open_store()
+        self._lock = threading.Lock()
+        self._index: Dict[Tuple[Optional[str], str], List[AlertRule]] = {}
+        self._last_values: Dict[str, Dict[str, Any]] = {}
+        for rule in rules:
+            self._index.setdefault((rule.ticker, rule.field), []).append(rule)
+
+        if not self.db["alert_state"].exists():
+            self.db["alert_state"].create({
+                "rule_id": str,
+                "ticker": str,
+                "active": int,
+                "last_fired": float
+            }, pk=("rule_id", "ticker"))
+        self._state: Dict[Tuple[str, str], Dict] = {
+            (row["rule_id"], row["ticker"]): row for row in self.db["alert_state"].rows
+        }
+
+    def rules_for(self, ticker: str, field: str) -> List[AlertRule]:
+        return self._index.get((ticker, field), []) + self._index.get((None, field), [])
+
+    def on_scored(self, data: Dict):
+        ticker = data["stock"].ticker
+        values = flatten_result(data)
+        fired = []
+        with self._lock:
+            previous = self._last_values.get(ticker, {})
+            self._last_values[ticker] = values
+            for field, value in values.items():
+                if field in previous and previous[field] == value:
+                    continue
+                for rule in self.rules_for(ticker, field):
+                    alert = self._evaluate(rule, ticker, value, values)
+                    if alert:
+                        fired.append((rule, alert))
+
+        for rule, alert in fired:
+            sink = self.sinks.get(rule.sink) or self.sinks["file"]
+            sink.send(alert)
+
+    def _evaluate(self, rule: AlertRule, ticker: str, value: Any, values: Dict) -> Optional[Dict]:
+        key = (rule.id, ticker)
+        state = self._state.get(key, {"rule_id": rule.id, "ticker": ticker, "active": 0, "last_fired": 0.0})
+        matched = rule.matches(value)
+        was_active = bool(state["active"])
+        if matched == was_active:
+            return None
+
+        now = time.time()
+        state["active"] = int(matched)
+        alert = None
+        if matched and now - state["last_fired"] >= rule.cooldown_minutes * 60:
+            state["last_fired"] = now
+            alert = {
+                "rule_id": rule.id,
+                "rule": rule.describe(),
+                "ticker": ticker,
+                "field": rule.field,
+                "value": value,
+                "signal": values.get("signal"),
+                "contrarian_score": values.get("contrarian_score"),
+                "triggered_at": datetime.now().isoformat()
+            }
+        self._state[key] = state
+        self.db["alert_state"].upsert(state, pk=("rule_id", "ticker"))
+        return alert
+
+_engine: Optional[AlertEngine] = None
+
+def install_alerts(reload: bool = False) -> Optional[AlertEngine]:
+    """
+    Loads the saved rules and starts evaluating every scored result. No-op without rules.
+    `reload` swaps in a fresh engine after the rules file changed.
+    """
+    global _engine
+    if _engine is not None and reload:
+        remove_listener(_engine.on_scored)
+        _engine = None
+    if _engine is None:
+        rules = load_rules()
+        if not rules:
+            return None
+        _engine = AlertEngine(rules)
+        add_listener(_engine.on_scored)
+    return _engine
@@ -0,0 +1,106 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.data.store import open_store
+
+# Sentiment field -> the z-score field it feeds
+BASELINE_METRICS = {
+    "reddit_mentions": "reddit_mentions_z",
+    "reddit_sentiment_score": "reddit_sentiment_z",
+    "stocktwits_bull_ratio": "stocktwits_bull_z",
+}
+
+@dataclass
+class RunningStats:
+    """
+    Exponentially weighted mean/variance, updated in O(1) per observation
+    (incremental EWMA form of Welford's algorithm). Recent refreshes weigh more, so the
+    baseline follows slow drifts while sudden jumps stand out.
+    """
+    count: int = 0
+    mean: float = 0.0
+    var: float = 0.0
+
+    def zscore(self, value: float, min_samples: int, min_std: float) -> Optional[float]:
+        """Distance of `value` from the baseline in standard deviations (None while warming up)."""
+        if self.count < min_samples:
+            return None
+        return (value - self.mean) / max(math.sqrt(self.var), min_std)
+
+    def update(self, value: float, alpha: float):
+        if self.count == 0:
+            self.mean, self.var = value, 0.0
+        else:
+            # The first observations get plain averaging weight until 1/count < alpha
+            weight = max(alpha, 1.0 / (self.count + 1))
+            diff = value - self.mean
+            increment = weight * diff
+            self.mean += increment
+            self.var = (1 - weight) * (self.var + diff * increment)
+        self.count += 1
+
+class SentimentBaselines:
+    """
+    Per-ticker baselines of social metrics, persisted in the local store.
+
+    `observe` scores the new readings against the ticker's own history (before folding
+    them in) and updates the baseline at most once per BASELINE_MIN_INTERVAL_MINUTES, so
+    repeat screens of the same data do not shrink the variance towards zero.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store()
+        self._lock = threading.Lock()
+        if not self.db["sentiment_baselines"].exists():
+            self.db["sentiment_baselines"].create({
+                "ticker": str,
+                "metric": str,
+                "count": int,
+                "mean": float,
+                "var": float,
+                "updated_at": float
+            }, pk=("ticker", "metric"))
+        self._stats: Dict[Tuple[str, str], RunningStats] = {}
+        self._updated: Dict[Tuple[str, str], float] = {}
+        for row in self.db["sentiment_baselines"].rows:
+            key = (row["ticker"], row["metric"])
+            self._stats[key] = RunningStats(row["count"], row["mean"], row["var"])
+            self._updated[key] = row["updated_at"]
+
+    def observe(self, ticker: str, values: Dict[str, float]) -> Dict[str, Optional[float]]:
+        """{metric: z-score} for the given readings; see the class docstring."""
+        return self.observe_many({ticker: values})[ticker]
+
+    def observe_many(self, readings: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, Optional[float]]]:
+        """`observe` for a batch of tickers ({ticker: {metric: value}}), in one write."""
+        now = time.time()
+        zscores, rows = {}, []
+        with self._lock:
+            for ticker, values in readings.items():
+                zscores[ticker] = {}
+                for metric, value in values.items():
+                    key = (ticker.upper(), metric)
+                    stats = self._stats.setdefault(key, RunningStats())
+                    zscores[ticker][metric] = stats.zscore(value, config.BASELINE_MIN_SAMPLES, config.BASELINE_MIN_STD[metric])
+                    if now - self._updated.get(key, 0.0) >= config.BASELINE_MIN_INTERVAL_MINUTES * 60:
+                        stats.update(value, config.BASELINE_ALPHA)
+                        self._updated[key] = now
+                        rows.append({"ticker": key[0], "metric": metric, "count": stats.count,
+                                     "mean": stats.mean, "var": stats.var, "updated_at": now})
+            if rows:
+                self.db["sentiment_baselines"].upsert_all(rows, pk=("ticker", "metric"))
+        return zscores
+
+_baselines: Optional[SentimentBaselines] = None
+_baselines_lock = threading.Lock()
+
+def get_baselines() -> SentimentBaselines:
+    global _baselines
+    with _baselines_lock:
+        if _baselines is None:
+            _baselines = SentimentBaselines()
+        return _baselines
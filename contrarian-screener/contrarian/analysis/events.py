@@ -0,0 +1,25 @@
+import threading
+from typing import Callable, Dict, List
+
+# Listeners receive every freshly scored result ({'ticker', 'stock', 'scores'}),
+# from whichever thread produced it.
+_listeners: List[Callable[[Dict], None]] = []
+_lock = threading.Lock()
+
+def add_listener(fn: Callable[[Dict], None]):
+    with _lock:
+        if fn not in _listeners:
+            _listeners.append(fn)
+
+def remove_listener(fn: Callable[[Dict], None]):
+    with _lock:
+        if fn in _listeners:
+            _listeners.remove(fn)
+
+def publish_scored(data: Dict):
+    for fn in list(_listeners):
+        try:
+            fn(data)
+        except Exception as e:
+            # A broken listener must never fail the screen that produced the score
+            print(f"Error in score listener {getattr(fn, '__name__', fn)}: {e}")
@@ -1,6 +1,26 @@
+from typing import Optional
 from contrarian.models.stock import Stock
+from contrarian.analysis.relative import SectorContext, RELATIVE_METRICS
 
 class FundamentalAnalyzer:
+    def __init__(self, sector_context: Optional[SectorContext] = None):
+        # When set, metrics are scored against the stock's industry/sector peers
+        # instead of the fixed market-wide cut-offs.
+        self.sector_context = sector_context
+
+    def _relative_adjustment(self, stock: Stock, metric: str) -> Optional[float]:
+        """+10 for the best quartile of peers, -10 for the worst, None if no peer context."""
+        if not self.sector_context:
+            return None
+        pct = self.sector_context.percentile(stock, metric)
+        if pct is None:
+            return None
+        if not RELATIVE_METRICS[metric]:
+            pct = 1.0 - pct
+        if pct >= 0.75: return 10
+        if pct <= 0.25: return -10
+        return 0
+
     def calculate_divergence_score(self, stock: Stock) -> float:
         """
         Calculates Fundamental Divergence Score (0-100).
@@ -16,24 +36,37 @@ class FundamentalAnalyzer:
         
         # 1. Valuation (P/E) - Lower is better (usually)
         # Simple relative valuation vs generic market average of 20
-        pe = f.pe_ratio or 25.0
-        if pe < 15: score += 10
-        elif pe > 35: score -= 10
+        adj = self._relative_adjustment(stock, "pe_ratio")
+        if adj is not None: score += adj
+        else:
+            pe = f.pe_ratio or 25.0
+            if pe < 15: score += 10
+            elif pe > 35: score -= 10
         
         # 2. Growth (Revenue) - Higher is better
-        rev_growth = f.revenue_growth or 0.0
-        if rev_growth > 0.10: score += 10
-        elif rev_growth < 0: score -= 10
+        adj = self._relative_adjustment(stock, "revenue_growth")
+        if adj is not None: score += adj
+        else:
+            rev_growth = f.revenue_growth or 0.0
+            if rev_growth > 0.10: score += 10
+            elif rev_growth < 0: score -= 10
         
         # 3. Profitability (Margins)
-        margin = f.profit_margin or 0.0
-        if margin > 0.15: score += 10
-        elif margin < 0: score -= 10
+        adj = self._relative_adjustment(stock, "profit_margin")
+        if adj is not None: score += adj
+        else:
+            margin = f.profit_margin or 0.0
+            if margin > 0.15: score += 10
+            elif margin < 0: score -= 10
         
         # 4. Financial Health (Debt/Equity)
-        de = f.debt_to_equity or 100.0 # High default
-        if de < 50: score += 10 # Low debt
-        elif de > 150: score -= 10 # High debt
+        # Banks and utilities run structurally higher leverage, hence the peer comparison
+        adj = self._relative_adjustment(stock, "debt_to_equity")
+        if adj is not None: score += adj
+        else:
+            de = f.debt_to_equity or 100.0 # High default
+            if de < 50: score += 10 # Low debt
+            elif de > 150: score -= 10 # High debt
         
         # 5. Price Momentum (vs 52w High) - "Beaten down" factor
         # If stock is far from high, it might be fundamentally undervalued if other metrics are good
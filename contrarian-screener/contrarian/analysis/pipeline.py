@@ -1,69 +1,441 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, Dict, List
-from contrarian.data.yahoo import YahooFinanceClient
-from contrarian.data.finviz import FinvizClient
-from contrarian.data.reddit import RedditClient
-from contrarian.data.stocktwits import StockTwitsClient
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future, as_completed, wait
+from typing import Optional, Dict, List, Iterator, Callable
 from contrarian.analysis.sentiment import SentimentAnalyzer
 from contrarian.analysis.scoring import ContrarianScorer
+from contrarian.analysis.profiles import ScoringProfile, DEFAULT_PROFILE, ProfileSet
+from contrarian.analysis.relative import SectorContext, get_sector_context
+from contrarian.analysis.events import publish_scored
+from contrarian.analysis.baselines import BASELINE_METRICS, get_baselines
+from contrarian.data.cache import cache
+from contrarian.data.planner import SourcePlan, FULL_PLAN, FIELD_SOURCES
+from contrarian.data.providers import get_provider, batch_size
+from contrarian.data.scheduler import get_scheduler
+from contrarian.data.snapshots import SnapshotStore
+from contrarian.universes.tickers import Universe
 from contrarian.models.stock import Stock
 
-def fetch_and_score(ticker: str) -> Optional[Dict]:
+# Slack for float rounding when comparing score bounds against thresholds
+BOUND_EPSILON = 1e-9
+
+# Every scored result gets a new version so encoded payloads can be cached per result
+_versions = itertools.count(1)
+
+def stamp_version(data: Dict) -> Dict:
+    data["version"] = next(_versions)
+    return data
+
+def chunks(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), max(size, 1))]
+
+def fetch_base_many(tickers: List[str], plan: SourcePlan = FULL_PLAN) -> Dict[str, Stock]:
     """
-    Fetches all data and scores a single ticker.
-    Returns a dict with 'ticker', 'stock', and 'scores' keys.
+    Cheap phase: price, fundamentals and analyst data (Yahoo) plus short interest (Finviz),
+    for a batch of tickers: {ticker: Stock} for the tickers found.
+    Everything the score depends on except the retail social inputs.
+    Data comes from the providers configured for each source (see contrarian.data.providers);
+    the default ones call every source through `guarded`, so symbols a source cannot
+    resolve are negatively cached and a failing source is skipped while its circuit
+    breaker is open.
     """
-    try:
-        # 1. Fetch Data
-        yahoo = YahooFinanceClient()
-        stock = yahoo.get_stock_data(ticker)
-        if not stock: return None
-        
-        # 2. Add Sentiment
-        finviz = FinvizClient()
-        short_int = finviz.get_short_interest(ticker)
-        if stock.sentiment and short_int:
-            stock.sentiment.short_interest_pct = short_int
-            
-        # Social logic (Optional/Graceful degradation)
-        # In a real heavy-load scenario, we might toggle this off for bulk screening
-        try:
-            # Reddit
-            reddit_client = RedditClient()
-            r_data = reddit_client.get_sentiment(ticker)
-            if stock.sentiment:
-                stock.sentiment.reddit_mentions = r_data["mentions"]
-                stock.sentiment.reddit_sentiment_score = r_data["sentiment_score"]
-                
-            # StockTwits
-            st_client = StockTwitsClient()
-            st_data = st_client.get_sentiment(ticker)
-            if stock.sentiment:
-                stock.sentiment.stocktwits_bull_ratio = st_data["bull_ratio"]
-        except Exception:
-            pass # Continue if social fails
-        
-        # 3. Score
-        scorer = ContrarianScorer()
-        scores = scorer.score_stock(stock)
-        
-        return {
+    # 1. Fetch Data
+    stocks = get_provider("yahoo").get_many(tickers)
+    for ticker, stock in stocks.items():
+        stock.ticker = ticker.upper()  # Keep the universe spelling (BRK.B, not BRK-B)
+    
+    # 2. Add Sentiment
+    # Finviz is only needed when Yahoo did not already report short interest
+    missing = [t for t, stock in stocks.items() if stock.sentiment and stock.sentiment.short_interest_pct is None]
+    if plan.uses("finviz") and missing:
+        for ticker, short_int in get_provider("finviz").get_many(missing).items():
+            if short_int:
+                stocks[ticker].sentiment.short_interest_pct = short_int
+    return stocks
+
+def fetch_base(ticker: str, plan: SourcePlan = FULL_PLAN) -> Optional[Stock]:
+    """`fetch_base_many` for a single ticker."""
+    return fetch_base_many([ticker], plan).get(ticker)
+
+# Sentiment fields each social source fills (with their baseline z-scores)
+SOCIAL_FIELDS = {
+    "reddit": ("reddit_mentions", "reddit_sentiment_score", "reddit_mentions_z", "reddit_sentiment_z"),
+    "stocktwits": ("stocktwits_bull_ratio", "stocktwits_bull_z"),
+}
+
+def apply_social(stock: Stock, source: str, data: Dict) -> Dict[str, float]:
+    """Writes one social source's reading into `stock`; returns the readings worth a baseline update."""
+    observed = {}
+    if source == "reddit":
+        stock.sentiment.reddit_mentions = data["mentions"]
+        stock.sentiment.reddit_sentiment_score = data["sentiment_score"]
+        observed["reddit_mentions"] = data["mentions"]
+        if data["sample_size"]:
+            observed["reddit_sentiment_score"] = data["sentiment_score"]
+    elif source == "stocktwits":
+        stock.sentiment.stocktwits_bull_ratio = data["bull_ratio"]
+        if data["labeled_count"]:
+            observed["stocktwits_bull_ratio"] = data["bull_ratio"]
+    return observed
+
+def add_social_many(stocks: Dict[str, Stock], plan: SourcePlan = FULL_PLAN):
+    """Expensive phase: Reddit and StockTwits retail sentiment (rate-limited, slow), for a batch."""
+    # Social logic (Optional/Graceful degradation): a skipped or failed source leaves
+    # the neutral defaults in place
+    stocks = {t: stock for t, stock in stocks.items() if stock.sentiment}
+    if not stocks:
+        return
+    observed = {t: {} for t in stocks}
+    for source in SOCIAL_FIELDS:
+        if plan.uses(source):
+            for ticker, data in get_provider(source).get_many(list(stocks)).items():
+                observed[ticker].update(apply_social(stocks[ticker], source, data))
+    
+    # Compare against the ticker's own history (only readings that were actually fetched;
+    # neutral defaults from skipped or empty sources would drag the baseline)
+    observed = {t: values for t, values in observed.items() if values}
+    if observed:
+        for ticker, zscores in get_baselines().observe_many(observed).items():
+            for metric, z in zscores.items():
+                setattr(stocks[ticker].sentiment, BASELINE_METRICS[metric], z)
+
+def add_social(stock: Stock, ticker: str, plan: SourcePlan = FULL_PLAN):
+    """`add_social_many` for a single ticker."""
+    add_social_many({ticker: stock}, plan)
+
+def score_many(tickers: List[str], sector_context: Optional[SectorContext] = None, plan: SourcePlan = FULL_PLAN) -> List[Dict]:
+    """`fetch_and_score` for a batch of tickers, in order (tickers without data are left out)."""
+    stocks = fetch_base_many(tickers, plan)
+    add_social_many(stocks, plan)
+    
+    # 3. Score
+    scorer = ContrarianScorer(sector_context) if plan.needs_scores else None
+    results = []
+    for ticker in tickers:
+        if ticker not in stocks:
+            continue
+        stock = stocks[ticker]
+        scores = scorer.score_stock(stock) if scorer else None
+        data = stamp_version({
             "ticker": ticker,
             "stock": stock,
             "scores": scores
-        }
+        })
+        if scores is not None:
+            publish_scored(data)
+        results.append(data)
+    return results
+
+def fetch_and_score(
+    ticker: str,
+    sector_context: Optional[SectorContext] = None,
+    plan: SourcePlan = FULL_PLAN,
+    deadline_ms: Optional[float] = None,
+) -> Optional[Dict]:
+    """
+    Fetches all data and scores a single ticker.
+    Returns a dict with 'ticker', 'stock', and 'scores' keys.
+    Pass a `sector_context` to score fundamentals relative to peers, and a `plan`
+    (see contrarian.data.planner) to fetch only the sources a request needs;
+    'scores' is None when the plan does not ask for them.
+    With `deadline_ms` the sources are fetched concurrently and waited for at most that
+    long (see `score_within_deadline`); the result then also has a 'provenance' key.
+    """
+    try:
+        if deadline_ms is not None:
+            return score_within_deadline(ticker, sector_context, plan, deadline_ms)
+        results = score_many([ticker], sector_context, plan)
+        return results[0] if results else None
     except Exception as e:
         return None
 
-def batch_screen(tickers: List[str], max_workers: int = 10) -> List[Dict]:
+def fetch_social(source: str, ticker: str) -> Optional[Dict]:
+    return get_provider(source).get_many([ticker]).get(ticker)
+
+def score_within_deadline(ticker: str, sector_context: Optional[SectorContext], plan: SourcePlan, deadline_ms: float) -> Optional[Dict]:
+    """
+    Single-ticker fetch with the sources side by side: Yahoo (with its Finviz fallback)
+    and each social source run as interactive scheduler tasks, so the latency is that of
+    the slowest source, capped at `deadline_ms`.
+
+    A source still running at the deadline is replaced by the cached Stock's values
+    (Yahoo is only waited for past the deadline when nothing is cached, as there is no
+    result without a quote), else by neutral defaults. 'provenance' maps every field to
+    "live", "cached" or "default" (late, failed or not planned). Once all sources have
+    answered, the complete Stock goes to the cache for the next call.
+    """
+    scheduler = get_scheduler()
+    futures = {"yahoo": scheduler.submit(fetch_base, ticker, plan)}
+    for source in SOCIAL_FIELDS:
+        if plan.uses(source):
+            futures[source] = scheduler.submit(fetch_social, source, ticker)
+    wait(list(futures.values()), timeout=deadline_ms / 1000)
+    
+    cached = cache.get(ticker)
+    status = {}
+    yahoo = futures["yahoo"]
+    # A failed Yahoo fetch falls back to the cache like a late one
+    stock = yahoo.result() if yahoo.done() and not yahoo.exception() else None
+    if stock:
+        status["yahoo"] = "live"
+    elif cached:
+        stock, status["yahoo"] = cached, "cached"
+        cached = Stock.from_dict(cached.to_dict())  # `stock` gets live social data below
+    elif not yahoo.done():
+        stock, status["yahoo"] = yahoo.result(), "live"
+    if not stock or not stock.sentiment:
+        return None
+    
+    observed = {}
+    for source, fields in SOCIAL_FIELDS.items():
+        future = futures.get(source)
+        data = future.result() if future and future.done() and not future.exception() else None
+        if data:
+            observed.update(apply_social(stock, source, data))
+            status[source] = "live"
+        elif future and not future.done() and cached and cached.sentiment:
+            for field in fields:
+                setattr(stock.sentiment, field, getattr(cached.sentiment, field))
+            status[source] = "cached"
+        else:
+            status[source] = "default"
+    if observed:
+        for metric, z in get_baselines().observe(ticker, observed).items():
+            setattr(stock.sentiment, BASELINE_METRICS[metric], z)
+    
+    cache_when_complete(futures, stock)
+    scores = ContrarianScorer(sector_context).score_stock(stock) if plan.needs_scores else None
+    data = stamp_version({
+        "ticker": ticker,
+        "stock": stock,
+        "scores": scores,
+        "provenance": field_provenance(status)
+    })
+    if scores is not None:
+        publish_scored(data)
+    return data
+
+def field_provenance(status: Dict[str, str]) -> Dict[str, str]:
+    """Per-field status from the per-source one (short interest follows Yahoo, which falls back to Finviz)."""
+    provenance = {}
+    for field, sources in FIELD_SOURCES.items():
+        if sources:
+            source = "yahoo" if "yahoo" in sources else next(iter(sources))
+            provenance[field] = status.get(source, "default")
+    return provenance
+
+def cache_when_complete(futures: Dict[str, Future], fallback: Stock):
     """
-    Screens a list of tickers in parallel.
+    Writes the complete Stock to the cache once every source future has finished, late
+    ones included (immediately if they all made the deadline).
     """
-    results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(fetch_and_score, t): t for t in tickers}
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        try:
+            base = futures["yahoo"].result() if not futures["yahoo"].exception() else None
+            # A copy: the response's Stock may still be serialized while this runs
+            full = Stock.from_dict((base or fallback).to_dict())
+            for source in SOCIAL_FIELDS:
+                future = futures.get(source)
+                data = future.result() if future and not future.exception() else None
+                if data and full.sentiment:
+                    apply_social(full, source, data)
+            cache.set(full)
+        except Exception as e:
+            print(f"Error caching {fallback.ticker}: {e}")
+    
+    for future in futures.values():
+        future.add_done_callback(on_done)
+
+def iter_screen(tickers: List[str], max_workers: Optional[int] = None, score_fn=fetch_and_score) -> Iterator[Dict]:
+    """
+    Screens a list of tickers in parallel, yielding each result as soon as it finishes.
+    `score_fn` lets callers swap in a cached wrapper around `fetch_and_score`.
+    Runs as one bulk job on the shared scheduler (see contrarian.data.scheduler);
+    `max_workers` optionally caps this screen's own share.
+    """
+    with get_scheduler().job(max_workers) as job:
+        futures = {job.submit(score_fn, t): t for t in tickers}
         for future in as_completed(futures):
             data = future.result()
             if data:
-                results.append(data)
+                yield data
+
+def batch_screen(tickers: List[str], max_workers: Optional[int] = None, plan: SourcePlan = FULL_PLAN) -> List[Dict]:
+    """
+    Screens a list of tickers in parallel, in batches sized for the configured providers.
+    Results come back in the order of `tickers`.
+    """
+    order = {t: i for i, t in enumerate(tickers)}
+    
+    def safe_score(chunk):
+        try:
+            return score_many(chunk, plan=plan)
+        except Exception:
+            return []
+    
+    results = []
+    with get_scheduler().job(max_workers) as job:
+        for future in as_completed([job.submit(safe_score, c) for c in chunks(tickers, batch_size(plan.sources))]):
+            results.extend(future.result())
+    results.sort(key=lambda r: order[r["ticker"]])
+    return results
+
+def snapshot_universe(universe: str, store: Optional[SnapshotStore] = None, max_workers: Optional[int] = None) -> int:
+    """Scores every ticker of a universe and stores the result as a new snapshot."""
+    store = store or SnapshotStore()
+    results = batch_screen(Universe.get_tickers(universe), max_workers=max_workers)
+    return store.save(universe, results)
+
+def rescore_relative(results: List[Dict], snapshot_key: str) -> List[Dict]:
+    """
+    Re-scores screen results against their own universe: sector/industry percentiles are
+    aggregated once for the snapshot (and updated in place on later screens of it).
+    """
+    ctx = get_sector_context(snapshot_key, [r["stock"] for r in results])
+    scorer = ContrarianScorer(ctx)
+    for r in results:
+        r["scores"] = scorer.score_stock(r["stock"])
+        stamp_version(r)
     return results
+
+def screen_pruned(
+    tickers: List[str],
+    min_score: float,
+    limit: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    relative_key: Optional[str] = None,
+    on_progress: Optional[Callable[[], None]] = None,
+    plan: SourcePlan = FULL_PLAN,
+    base_filter: Optional[Callable[[Stock], bool]] = None,
+) -> List[Dict]:
+    """
+    Two-phase screen returning the same rows as a full screen filtered by `min_score`
+    (and cut to the top `limit`), sorted by score. See `screen_profiles`.
+    """
+    return screen_profiles(tickers, min_score, [DEFAULT_PROFILE], limit=limit, max_workers=max_workers,
+                           relative_key=relative_key, on_progress=on_progress, plan=plan,
+                           base_filter=base_filter)[DEFAULT_PROFILE.name]
+
+def screen_profiles(
+    tickers: List[str],
+    min_score: float,
+    profiles: List[ScoringProfile],
+    limit: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    relative_key: Optional[str] = None,
+    on_progress: Optional[Callable[[], None]] = None,
+    plan: SourcePlan = FULL_PLAN,
+    base_filter: Optional[Callable[[Stock], bool]] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    One ranking per scoring profile from a single data fetch: {profile name: rows with
+    score >= `min_score`, best first, cut to the top `limit`}.
+
+    Phase 1 fetches only the cheap sources and bounds each ticker's contrarian score over
+    every possible retail sentiment, per profile. Phase 2 fetches Reddit/StockTwits only
+    for tickers that can still reach `min_score` and the k-th best lower bound (heap
+    top-k) under at least one profile. All profiles are then scored in one compiled pass.
+    `base_filter` drops tickers on phase-1 data alone (e.g. a short interest floor); the
+    sector context of `relative_key` is still built from every fetched ticker.
+    `on_progress` is called once per ticker as soon as its outcome is settled.
+    Each phase runs as a bulk job on the shared scheduler, in batches sized for the
+    configured providers; `max_workers` optionally caps its concurrency.
+    Listeners (alerts, live updates) always receive the default-profile scores.
+    """
+    notify = on_progress or (lambda: None)
+    
+    size = batch_size(plan.sources)
+    
+    def safe_base(chunk):
+        try:
+            return fetch_base_many(chunk, plan)
+        except Exception:
+            return {}
+    
+    # Phase 1: cheap fetch
+    fetched, base = [], {}
+    with get_scheduler().job(max_workers) as job:
+        futures = {job.submit(safe_base, c): c for c in chunks(tickers, size)}
+        for future in as_completed(futures):
+            stocks = future.result()
+            fetched.extend(stocks.values())
+            if base_filter:
+                stocks = {t: stock for t, stock in stocks.items() if base_filter(stock)}
+            base.update(stocks)
+            for _ in range(len(futures[future]) - len(stocks)):
+                notify()
+    
+    # Peers are every fetched stock of the snapshot, not just those passing `base_filter`
+    sector_context = get_sector_context(relative_key, fetched) if relative_key else None
+    scorer = ContrarianScorer(sector_context)
+    
+    # Prune on the score threshold, then on the top-k cut-off, for each profile
+    survivors = set()
+    for profile in profiles:
+        profile_scorer = ContrarianScorer(sector_context, profile)
+        bounds = {t: profile_scorer.score_bounds(stock) for t, stock in base.items()}
+        candidates = [t for t, (lo, hi) in bounds.items() if hi >= min_score - BOUND_EPSILON]
+        cutoff = float("-inf")
+        if limit and len(candidates) > limit:
+            cutoff = heapq.nlargest(limit, (bounds[t][0] for t in candidates))[-1]
+        survivors.update(t for t in candidates if bounds[t][1] >= cutoff - BOUND_EPSILON)
+    for _ in range(len(base) - len(survivors)):
+        notify()
+    
+    # Phase 2: social fetch for the survivors only
+    def finish(chunk):
+        try:
+            stocks = {t: base[t] for t in chunk}
+            add_social_many(stocks, plan)
+            results = []
+            for t, stock in stocks.items():
+                data = stamp_version({"ticker": t, "stock": stock, "scores": scorer.score_stock(stock)})
+                publish_scored(data)
+                results.append(data)
+            return results
+        except Exception:
+            return []
+    
+    scored = []
+    with get_scheduler().job(max_workers) as job:
+        futures = {job.submit(finish, c): c for c in chunks(list(survivors), size)}
+        for future in as_completed(futures):
+            scored.extend(future.result())
+            for _ in futures[future]:
+                notify()
+    
+    if [p.name for p in profiles] == [DEFAULT_PROFILE.name]:
+        rankings = {DEFAULT_PROFILE.name: scored}
+    else:
+        rankings = score_profiles(scored, profiles)
+    
+    for name, results in rankings.items():
+        results = [r for r in results if r["scores"]["contrarian_score"] >= min_score]
+        results.sort(key=lambda x: x["scores"]["contrarian_score"], reverse=True)
+        rankings[name] = results[:limit] if limit else results
+    return rankings
+
+def score_profiles(results: List[Dict], profiles: List[ScoringProfile]) -> Dict[str, List[Dict]]:
+    """
+    Re-scores default-profile results under every profile in one compiled pass
+    (fundamental scores are profile-independent and reused). Each profile gets its own
+    result dicts, sharing the fetched Stock, with a 'profile' key.
+    """
+    stocks = [r["stock"] for r in results]
+    per_profile = ProfileSet(profiles).score_dicts(stocks, [r["scores"]["fundamental_score"] for r in results])
+    rankings = {}
+    for name, scores in per_profile.items():
+        rankings[name] = [
+            stamp_version({"ticker": r["ticker"], "stock": r["stock"], "profile": name,
+                           "scores": {**s, "crowding_z": r["scores"].get("crowding_z")}})
+            for r, s in zip(results, scores)
+        ]
+    return rankings
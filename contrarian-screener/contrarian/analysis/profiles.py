@@ -0,0 +1,116 @@
+from dataclasses import dataclass, fields, replace
+from typing import Dict, List, Optional
+import numpy as np
+from contrarian.config import config
+from contrarian.models.stock import Stock
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """
+    Thresholds and weights of the contrarian score. The defaults are the original
+    scoring rules; SCORING_PROFILES in config declares named variants as overrides.
+    """
+    name: str = "default"
+    # Crowd direction (analyst consensus / retail sentiment on 0-100, short interest in %)
+    loved_analyst_min: float = 60
+    loved_retail_min: float = 60
+    hated_analyst_max: float = 40
+    hated_retail_max: float = 40
+    high_short_pct: float = 15
+    # Signals: fundamentals strong enough to fade a hated stock / weak enough to fade a loved one
+    long_signal_min_fundamental: float = 60
+    short_signal_max_fundamental: float = 40
+    # Sentiment concentration: crowded-long and crowded-short weights (analyst, retail, short interest)
+    long_analyst_weight: float = 0.5
+    long_retail_weight: float = 0.4
+    long_short_weight: float = 0.1
+    short_analyst_weight: float = 0.4
+    short_retail_weight: float = 0.3
+    short_short_weight: float = 0.3
+    short_interest_cap: float = 20  # Short interest (%) that counts as maximal
+
+DEFAULT_PROFILE = ScoringProfile()
+
+PARAMETERS = [f.name for f in fields(ScoringProfile) if f.name != "name"]
+
+def get_profile(name: str) -> ScoringProfile:
+    if name == "default":
+        return DEFAULT_PROFILE
+    if name not in config.SCORING_PROFILES:
+        raise ValueError(f"Unknown scoring profile: {name}")
+    return replace(DEFAULT_PROFILE, name=name, **config.SCORING_PROFILES[name])
+
+def get_profiles(names: Optional[List[str]]) -> List[ScoringProfile]:
+    """Profiles by name ("a,b" already split); None or empty means the default only."""
+    names = [n.strip() for n in names or [] if n.strip()]
+    return [get_profile(n) for n in dict.fromkeys(names)] or [DEFAULT_PROFILE]
+
+def available_profiles() -> List[str]:
+    return ["default"] + [n for n in config.SCORING_PROFILES if n != "default"]
+
+# Signal codes of the compiled evaluation
+SIGNALS = ["Neutral", "Potential Long (Crowded Short)", "Potential Short (Crowded Long)", "Watch"]
+NEUTRAL, LONG, SHORT, WATCH = range(4)
+
+class ProfileSet:
+    """
+    Several profiles compiled into parameter columns, so one vectorized pass scores
+    every (profile, stock) pair of already-fetched data: inputs are (N,) arrays, the
+    parameters (P, 1) columns, and every rule of `ContrarianScorer.score_stock`
+    broadcasts to a (P, N) result. Fundamental scores do not depend on the profile and
+    are passed in, computed once per stock.
+    """
+
+    def __init__(self, profiles: List[ScoringProfile]):
+        self.profiles = profiles
+        self.params = {
+            p: np.array([getattr(profile, p) for profile in profiles], dtype=float)[:, None]
+            for p in PARAMETERS
+        }
+
+    def evaluate(self, stocks: List[Stock], fundamental_scores: List[float]) -> Dict[str, np.ndarray]:
+        """(P, N) arrays: contrarian_score, sentiment_score, signal (codes), is_hated, is_loved."""
+        k = self.params
+        analyst = np.array([s.sentiment.analyst_consensus_score for s in stocks], dtype=float)
+        retail = np.array([s.sentiment.retail_sentiment_score for s in stocks], dtype=float)
+        short = np.array([s.sentiment.short_interest_pct or 0 for s in stocks], dtype=float)
+        fundamental = np.broadcast_to(np.asarray(fundamental_scores, dtype=float), (len(self.profiles), len(stocks)))
+
+        a, r = analyst / 100.0, retail / 100.0
+        sn = np.minimum(short / k["short_interest_cap"], 1.0)
+        crowded_long = a * k["long_analyst_weight"] + r * k["long_retail_weight"] + (1 - sn) * k["long_short_weight"]
+        crowded_short = (1 - a) * k["short_analyst_weight"] + (1 - r) * k["short_retail_weight"] + sn * k["short_short_weight"]
+        concentration = np.maximum(crowded_long, crowded_short) * 100
+
+        is_loved = (analyst > k["loved_analyst_min"]) & (retail > k["loved_retail_min"])
+        is_hated = (analyst < k["hated_analyst_max"]) | (retail < k["hated_retail_max"]) | (short > k["high_short_pct"])
+
+        score = np.where(is_hated, fundamental,
+                         np.where(is_loved, 100 - fundamental, np.abs(concentration - fundamental)))
+        signal = np.where(
+            is_hated, np.where(fundamental > k["long_signal_min_fundamental"], LONG, NEUTRAL),
+            np.where(is_loved, np.where(fundamental < k["short_signal_max_fundamental"], SHORT, NEUTRAL), WATCH)
+        )
+        return {
+            "contrarian_score": score,
+            "fundamental_score": fundamental,
+            "sentiment_score": concentration,
+            "signal": signal,
+            "is_hated": is_hated,
+            "is_loved": is_loved,
+        }
+
+    def score_dicts(self, stocks: List[Stock], fundamental_scores: List[float]) -> Dict[str, List[Dict]]:
+        """`evaluate` as {profile name: [score dict per stock]} in `score_stock` shape."""
+        out = self.evaluate(stocks, fundamental_scores)
+        return {
+            profile.name: [{
+                "contrarian_score": float(out["contrarian_score"][i, j]),
+                "fundamental_score": float(out["fundamental_score"][i, j]),
+                "sentiment_score": float(out["sentiment_score"][i, j]),
+                "signal": SIGNALS[out["signal"][i, j]],
+                "is_hated": bool(out["is_hated"][i, j]),
+                "is_loved": bool(out["is_loved"][i, j]),
+            } for j in range(len(stocks))]
+            for i, profile in enumerate(self.profiles)
+        }
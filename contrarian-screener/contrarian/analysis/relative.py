@@ -0,0 +1,135 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from contrarian.config import config
+from contrarian.models.stock import Stock
+
+# Metric -> True if a higher value is better
+RELATIVE_METRICS = {
+    "pe_ratio": False,
+    "revenue_growth": True,
+    "profit_margin": True,
+    "debt_to_equity": False,
+}
+
+GROUP_LEVELS = ("industry", "sector")
+
+class SectorContext:
+    """
+    Sorted per-group value distributions for the fundamental metrics of one universe snapshot.
+
+    Built in one vectorized pass (sort each metric once, group into lists) and then kept
+    current with `update` as individual tickers refresh, so a lookup never rescans the universe:
+    finding the group is a dict hit and the percentile is a bisect into its sorted values.
+    Updates and lookups may come from different threads; they are serialized so a lookup
+    never sees a list mid-update.
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str, str], List[float]] = {}
+        self._members: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def build(cls, stocks: List[Stock]) -> "SectorContext":
+        ctx = cls()
+        rows = [ctx._row(s) for s in stocks]
+        if not rows:
+            return ctx
+        ctx._members = {r["ticker"]: r for r in rows}
+
+        df = pd.DataFrame(rows)
+        for metric in RELATIVE_METRICS:
+            # Sorting once up front keeps every group's list sorted after the groupby
+            ranked = df.dropna(subset=[metric]).sort_values(metric)
+            for level in GROUP_LEVELS:
+                grouped = ranked.dropna(subset=[level]).groupby(level, sort=False)[metric].agg(list)
+                for group, values in grouped.items():
+                    ctx._values[(level, group, metric)] = values
+        return ctx
+
+    @staticmethod
+    def _row(stock: Stock) -> Dict:
+        f = stock.financials
+        row = {"ticker": stock.ticker, "sector": stock.sector, "industry": stock.industry}
+        for metric in RELATIVE_METRICS:
+            row[metric] = getattr(f, metric) if f else None
+        return row
+
+    def update(self, stock: Stock):
+        """Replaces one ticker's contribution to the aggregates."""
+        row = self._row(stock)
+        with self._lock:
+            self.remove(stock.ticker)
+            self._members[stock.ticker] = row
+            for metric in RELATIVE_METRICS:
+                value = row[metric]
+                if value is None:
+                    continue
+                for level in GROUP_LEVELS:
+                    if row[level]:
+                        insort(self._values.setdefault((level, row[level], metric), []), value)
+
+    def remove(self, ticker: str):
+        with self._lock:
+            row = self._members.pop(ticker, None)
+            if not row:
+                return
+            for metric in RELATIVE_METRICS:
+                value = row[metric]
+                if value is None:
+                    continue
+                for level in GROUP_LEVELS:
+                    values = self._values.get((level, row[level], metric))
+                    if values:
+                        i = bisect_left(values, value)
+                        if i < len(values) and values[i] == value:
+                            del values[i]
+
+    def percentile(self, stock: Stock, metric: str) -> Optional[float]:
+        """
+        Percentile (0-1) of the stock's metric within its industry, or its sector when the
+        industry is too small to be meaningful. None if neither group is large enough.
+        """
+        value = getattr(stock.financials, metric) if stock.financials else None
+        if value is None:
+            return None
+
+        with self._lock:
+            for level in GROUP_LEVELS:
+                group = getattr(stock, level)
+                values = self._values.get((level, group, metric)) if group else None
+                if values and len(values) >= config.RELATIVE_MIN_GROUP_SIZE:
+                    # Midpoint rank so ties land in the middle of their run
+                    rank = (bisect_left(values, value) + bisect_right(values, value)) / 2
+                    return rank / len(values)
+        return None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._members)
+
+# --- Snapshot cache ---
+
+_contexts: Dict[str, SectorContext] = {}
+_lock = threading.Lock()
+
+def get_sector_context(snapshot_key: str, stocks: List[Stock]) -> SectorContext:
+    """
+    Returns the aggregates for a snapshot (e.g. a universe), building them on first use and
+    folding the refreshed stocks in incrementally afterwards.
+    """
+    with _lock:
+        ctx = _contexts.get(snapshot_key)
+        if ctx is None:
+            ctx = SectorContext.build(stocks)
+            _contexts[snapshot_key] = ctx
+        else:
+            for stock in stocks:
+                ctx.update(stock)
+        return ctx
+
+def get_cached_context(snapshot_key: str) -> Optional[SectorContext]:
+    """Aggregates from an earlier screen of the snapshot, without fetching anything."""
+    return _contexts.get(snapshot_key)
@@ -1,18 +1,23 @@
+from typing import Optional, Tuple
 from contrarian.models.stock import Stock
 from contrarian.analysis.sentiment import SentimentAnalyzer
 from contrarian.analysis.fundamentals import FundamentalAnalyzer
+from contrarian.analysis.relative import SectorContext
+from contrarian.analysis.profiles import ScoringProfile, DEFAULT_PROFILE
 
 class ContrarianScorer:
-    def __init__(self):
+    def __init__(self, sector_context: Optional[SectorContext] = None, profile: ScoringProfile = DEFAULT_PROFILE):
         self.sent_analyzer = SentimentAnalyzer()
-        self.fund_analyzer = FundamentalAnalyzer()
+        self.fund_analyzer = FundamentalAnalyzer(sector_context)
+        self.profile = profile
         
     def score_stock(self, stock: Stock) -> dict:
         """
         Returns full scoring profile including Contrarian Score.
         """
+        p = self.profile
         # 1. Component Scores
-        sentiment_conc = self.sent_analyzer.calculate_concentration_score(stock.sentiment)
+        sentiment_conc = self.sent_analyzer.calculate_concentration_score(stock.sentiment, p)
         fundamental_score = self.fund_analyzer.calculate_divergence_score(stock)
         
         # 2. Logic for Contrarian Opportunity
@@ -22,13 +27,13 @@ class ContrarianScorer:
         
         # Determine Crowd Direction
         # We need to re-derive direction from sentiment analyzer or check raw metrics
-        analyst_bullish = stock.sentiment.analyst_consensus_score > 60
-        retail_bullish = stock.sentiment.retail_sentiment_score > 60
+        analyst_bullish = stock.sentiment.analyst_consensus_score > p.loved_analyst_min
+        retail_bullish = stock.sentiment.retail_sentiment_score > p.loved_retail_min
         is_loved = analyst_bullish and retail_bullish
         
-        analyst_bearish = stock.sentiment.analyst_consensus_score < 40
-        retail_bearish = stock.sentiment.retail_sentiment_score < 40
-        high_short = (stock.sentiment.short_interest_pct or 0) > 15
+        analyst_bearish = stock.sentiment.analyst_consensus_score < p.hated_analyst_max
+        retail_bearish = stock.sentiment.retail_sentiment_score < p.hated_retail_max
+        high_short = (stock.sentiment.short_interest_pct or 0) > p.high_short_pct
         is_hated = analyst_bearish or retail_bearish or high_short
         
         contrarian_score = 0.0
@@ -38,14 +43,14 @@ class ContrarianScorer:
             # Opportunity if Fundamentals are Strong
             # Score scales with Fundamental Strength
             contrarian_score = fundamental_score
-            if fundamental_score > 60:
+            if fundamental_score > p.long_signal_min_fundamental:
                 signal_type = "Potential Long (Crowded Short)"
         
         elif is_loved:
             # Opportunity if Fundamentals are Weak
             # Score scales with Fundamental Weakness (inverse)
             contrarian_score = 100 - fundamental_score
-            if fundamental_score < 40:
+            if fundamental_score < p.short_signal_max_fundamental:
                 signal_type = "Potential Short (Crowded Long)"
                 
         else:
@@ -61,5 +66,67 @@ class ContrarianScorer:
             "sentiment_score": sentiment_conc,
             "signal": signal_type,
             "is_hated": is_hated,
-            "is_loved": is_loved
+            "is_loved": is_loved,
+            # Deviation from the ticker's own social baseline (None without history)
+            "crowding_z": self.sent_analyzer.crowding_zscore(stock.sentiment)
         }
+
+    def score_bounds(self, stock: Stock) -> Tuple[float, float]:
+        """
+        (worst, best) contrarian score reachable by `score_stock` over every possible
+        Reddit/StockTwits reading, given the stock's fundamentals, analyst consensus and
+        short interest. Lets screens skip the social fetch for tickers that cannot qualify.
+        """
+        p = self.profile
+        fundamental_score = self.fund_analyzer.calculate_divergence_score(stock)
+        analyst = stock.sentiment.analyst_consensus_score
+        short_pct = stock.sentiment.short_interest_pct or 0
+        
+        # Retail sentiment can be anything in [0, 100], so "hated" is reachable whenever
+        # the retail cut-off is above 0 (default: retail < 40) and is certain if analysts
+        # or short sellers already make it so.
+        outcomes = []
+        if p.hated_retail_max > 0:
+            outcomes.append((fundamental_score, fundamental_score))
+        if analyst < p.hated_analyst_max or short_pct > p.high_short_pct:
+            return fundamental_score, fundamental_score
+        
+        if analyst > p.loved_analyst_min:
+            # Loved once retail > the loved cut-off; neutral only for retail between the cut-offs
+            if p.loved_retail_min < 100:
+                outcomes.append((100 - fundamental_score, 100 - fundamental_score))
+            retail_range = (max(p.hated_retail_max, 0.0), min(p.loved_retail_min, 100.0))
+        else:
+            retail_range = (max(p.hated_retail_max, 0.0), 100.0)
+        if retail_range[0] > retail_range[1]:
+            return min(lo for lo, _ in outcomes), max(hi for _, hi in outcomes)
+        
+        # Neutral branch scores |concentration - fundamental|. Concentration is the max of two
+        # functions linear in retail sentiment (convex), so its range over the interval comes
+        # from the endpoints plus the point where the two lines cross.
+        a = analyst / 100.0
+        sn = min(short_pct / p.short_interest_cap, 1.0)
+        
+        def concentration(r):
+            crowded_long = (a * p.long_analyst_weight) + (r * p.long_retail_weight) + ((1 - sn) * p.long_short_weight)
+            crowded_short = ((1 - a) * p.short_analyst_weight) + ((1 - r) * p.short_retail_weight) + (sn * p.short_short_weight)
+            return max(crowded_long, crowded_short) * 100
+        
+        lo_r, hi_r = retail_range[0] / 100.0, retail_range[1] / 100.0
+        points = [concentration(lo_r), concentration(hi_r)]
+        slope = p.long_retail_weight + p.short_retail_weight
+        if slope > 0:
+            cross = ((1 - a) * p.short_analyst_weight + p.short_retail_weight + sn * p.short_short_weight
+                     - a * p.long_analyst_weight - (1 - sn) * p.long_short_weight) / slope
+            if lo_r < cross < hi_r:
+                points.append(concentration(cross))
+        conc_min, conc_max = min(points), max(points)
+        
+        gap_max = max(abs(conc_min - fundamental_score), abs(conc_max - fundamental_score))
+        if conc_min <= fundamental_score <= conc_max:
+            gap_min = 0.0
+        else:
+            gap_min = min(abs(conc_min - fundamental_score), abs(conc_max - fundamental_score))
+        outcomes.append((gap_min, gap_max))
+        
+        return min(lo for lo, _ in outcomes), max(hi for _, hi in outcomes)
@@ -1,7 +1,10 @@
+from typing import Optional
+from contrarian.config import config
 from contrarian.models.stock import Sentiment
+from contrarian.analysis.profiles import ScoringProfile, DEFAULT_PROFILE
 
 class SentimentAnalyzer:
-    def calculate_concentration_score(self, sentiment: Sentiment) -> float:
+    def calculate_concentration_score(self, sentiment: Sentiment, profile: ScoringProfile = DEFAULT_PROFILE) -> float:
         """
         Calculates the Sentiment Concentration Score (0-100).
         High Score = Very Crowded (Everyone thinks the same thing).
@@ -11,7 +14,9 @@ class SentimentAnalyzer:
         - If everyone is Bullish (Analysts + Retail), Score -> 100
         - If everyone is Bearish (Analysts + Retail + High Short Interest), Score -> 100
         - If mixed, Score -> 0
+        Weights and the short interest cap come from the scoring `profile`.
         """
+        p = profile
         
         # Normalize inputs to 0-1 scale
         analyst_bullishness = sentiment.analyst_consensus_score / 100.0
@@ -20,24 +25,44 @@ class SentimentAnalyzer:
         # Short interest factor:
         # High short interest implies strong bearish consensus
         # Cap at 20% for max effect
-        short_interest_norm = min((sentiment.short_interest_pct or 0) / 20.0, 1.0)
+        short_interest_norm = min((sentiment.short_interest_pct or 0) / p.short_interest_cap, 1.0)
         
         # Calculate Crowded Long Score (Everyone buying)
         # Analysts Buy + Retail Bullish + Low Short Interest
-        crowded_long = (analyst_bullishness * 0.5) + (retail_bullishness * 0.4) + ((1 - short_interest_norm) * 0.1)
+        crowded_long = (analyst_bullishness * p.long_analyst_weight) + (retail_bullishness * p.long_retail_weight) + ((1 - short_interest_norm) * p.long_short_weight)
         
         # Calculate Crowded Short Score (Everyone selling)
         # Analysts Sell + Retail Bearish + High Short Interest
         analyst_bearishness = 1.0 - analyst_bullishness
         retail_bearishness = 1.0 - retail_bullishness
-        crowded_short = (analyst_bearishness * 0.4) + (retail_bearishness * 0.3) + (short_interest_norm * 0.3)
+        crowded_short = (analyst_bearishness * p.short_analyst_weight) + (retail_bearishness * p.short_retail_weight) + (short_interest_norm * p.short_short_weight)
         
         # The concentration score is the maximum of either extreme
         concentration = max(crowded_long, crowded_short) * 100
         
         return concentration
 
+    def crowding_zscore(self, sentiment: Sentiment) -> Optional[float]:
+        """
+        How unusual the retail crowd is for this ticker right now: the largest deviation
+        from its own baseline among mention volume (spikes only) and the Reddit/StockTwits
+        bull ratios (either direction). None until the ticker has a baseline.
+        """
+        deviations = [z for z in (
+            sentiment.reddit_mentions_z,
+            abs(sentiment.reddit_sentiment_z) if sentiment.reddit_sentiment_z is not None else None,
+            abs(sentiment.stocktwits_bull_z) if sentiment.stocktwits_bull_z is not None else None,
+        ) if z is not None]
+        return max(deviations) if deviations else None
+
     def get_signal_description(self, sentiment: Sentiment) -> str:
+        description = self._crowd_description(sentiment)
+        crowding = self.crowding_zscore(sentiment)
+        if crowding is not None and crowding >= config.CROWDING_Z_THRESHOLD:
+            description += f" | Unusual crowding: {crowding:.1f} std devs from this stock's norm"
+        return description
+
+    def _crowd_description(self, sentiment: Sentiment) -> str:
         score = self.calculate_concentration_score(sentiment)
         analyst = sentiment.analyst_consensus_score
         retail = sentiment.retail_sentiment_score
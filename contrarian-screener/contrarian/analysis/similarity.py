@@ -0,0 +1,237 @@
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from contrarian.data.snapshots import SnapshotStore
+
+# Feature -> (SQL expression over snapshot_rows, transform). Heavy-tailed magnitudes are
+# compared on a log scale, so 2B vs 4B is as far apart as 200B vs 400B.
+FEATURES = {
+    "market_cap": ("market_cap", "log"),
+    "pe_ratio": ("pe_ratio", "log"),
+    "pb_ratio": ("json_extract(data, '$.stock.financials.pb_ratio')", "log"),
+    "revenue_growth": ("json_extract(data, '$.stock.financials.revenue_growth')", None),
+    "profit_margin": ("json_extract(data, '$.stock.financials.profit_margin')", None),
+    "debt_to_equity": ("json_extract(data, '$.stock.financials.debt_to_equity')", "log1p"),
+    "short_interest": ("short_interest", "log1p"),
+    # Analyst consensus as Sentiment.analyst_consensus_score computes it (0-1, None without coverage)
+    "analyst_consensus": (
+        "(json_extract(data, '$.stock.sentiment.analyst_buy_count') "
+        "+ 0.5 * json_extract(data, '$.stock.sentiment.analyst_hold_count')) "
+        "/ NULLIF(json_extract(data, '$.stock.sentiment.analyst_buy_count') "
+        "+ json_extract(data, '$.stock.sentiment.analyst_hold_count') "
+        "+ json_extract(data, '$.stock.sentiment.analyst_sell_count'), 0)",
+        None,
+    ),
+    "reddit_mentions": ("json_extract(data, '$.stock.sentiment.reddit_mentions')", "log1p"),
+    "reddit_sentiment": ("json_extract(data, '$.stock.sentiment.reddit_sentiment_score')", None),
+    "stocktwits_bull_ratio": ("json_extract(data, '$.stock.sentiment.stocktwits_bull_ratio')", None),
+    "fundamental_score": ("fundamental_score", None),
+    "sentiment_score": ("sentiment_score", None),
+}
+
+LEAF_SIZE = 256  # Large leaves: one vectorized scan beats more Python-level node visits
+CLIP = 4.0  # Standardized values beyond this many scales count as this far
+
+def transform(raw: np.ndarray) -> np.ndarray:
+    """Raw feature columns (NaN = missing) on the scales they are compared on."""
+    out = raw.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, (_, kind) in enumerate(FEATURES.values()):
+            if kind == "log":
+                out[:, j] = np.where(raw[:, j] > 0, np.log(raw[:, j]), np.nan)
+            elif kind == "log1p":
+                out[:, j] = np.where(raw[:, j] >= 0, np.log1p(raw[:, j]), np.nan)
+    return out
+
+def standardize(values: np.ndarray) -> np.ndarray:
+    """
+    Robust z-scores per column (median / IQR), clipped to +-CLIP so one outlier does not
+    dominate the distance. Missing values sit at the median, i.e. they neither attract
+    nor repel.
+    """
+    if not len(values):
+        return values
+    with np.errstate(all="ignore"):
+        median = np.nanmedian(values, axis=0)
+        q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+        scale = (q3 - q1) / 1.349
+        fallback = np.nanstd(values, axis=0)
+    scale = np.where(scale > 0, scale, np.where(fallback > 0, fallback, 1.0))
+    z = (values - np.nan_to_num(median)) / scale
+    return np.clip(np.nan_to_num(z, nan=0.0), -CLIP, CLIP)
+
+class KDTree:
+    """
+    Static KD-tree over the rows of `points`, stored as flat arrays.
+
+    Nodes split the widest dimension of their bounding box at the median (argpartition)
+    until at most `leaf_size` points remain. A query visits nodes best-first by the
+    distance to their bounding box and stops once no box can beat the k-th best
+    distance found; each leaf is scanned with one vectorized distance computation.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = LEAF_SIZE):
+        n = len(points)
+        order = np.arange(n)
+        starts, ends, children, lows, highs = [], [], [], [], []
+        stack = [(0, n, -1, 0)]  # (start, end, parent, which child)
+        while stack:
+            start, end, parent, side = stack.pop()
+            node = len(starts)
+            if parent >= 0:
+                children[parent][side] = node
+            block = points[order[start:end]]
+            lo, hi = (block.min(axis=0), block.max(axis=0)) if end > start else (np.zeros(points.shape[1]),) * 2
+            starts.append(start)
+            ends.append(end)
+            lows.append(lo)
+            highs.append(hi)
+            children.append([-1, -1])
+            if end - start > leaf_size:
+                dim = int(np.argmax(hi - lo))
+                mid = (start + end) // 2
+                idx = order[start:end]
+                order[start:end] = idx[np.argpartition(points[idx, dim], mid - start)]
+                stack.append((mid, end, node, 1))
+                stack.append((start, mid, node, 0))
+
+        self.index = order  # Tree position -> row of `points`
+        self.data = points[order]
+        self.starts = np.array(starts)
+        self.ends = np.array(ends)
+        self.children = np.array(children).reshape(-1, 2)
+        self.lows = np.array(lows).reshape(-1, points.shape[1])
+        self.highs = np.array(highs).reshape(-1, points.shape[1])
+
+    def __len__(self):
+        return len(self.data)
+
+    def _box_distance(self, node: int, x: np.ndarray) -> float:
+        gap = np.maximum(self.lows[node] - x, 0) + np.maximum(x - self.highs[node], 0)
+        return float(gap @ gap)
+
+    def query(self, x: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(distances, rows) of the k nearest points to `x`, nearest first."""
+        k = min(k, len(self.data))
+        best_d = np.full(0, np.inf)
+        best_i = np.zeros(0, dtype=int)
+        if k <= 0:
+            return best_d, best_i
+        heap = [(self._box_distance(0, x), 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if len(best_d) == k and bound >= best_d[-1]:
+                break
+            left, right = self.children[node]
+            if left < 0:
+                start, end = self.starts[node], self.ends[node]
+                diff = self.data[start:end] - x
+                d = np.einsum("ij,ij->i", diff, diff)
+                best_d = np.concatenate([best_d, d])
+                best_i = np.concatenate([best_i, np.arange(start, end)])
+                keep = np.argsort(best_d, kind="stable")[:k]
+                best_d, best_i = best_d[keep], best_i[keep]
+            else:
+                for child in (left, right):
+                    d = self._box_distance(child, x)
+                    if len(best_d) < k or d < best_d[-1]:
+                        heapq.heappush(heap, (d, child))
+        return np.sqrt(best_d), self.index[best_i]
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index over the latest snapshot of one universe: every ticker is a
+    vector of standardized fundamentals, crowding (sentiment) and score components
+    (FEATURES), and "similar" means close in that space.
+
+    `refresh` follows the universe's latest snapshot. Raw feature rows are kept per
+    ticker, so a new snapshot only extracts the rows whose stored payload changed from
+    the indexed one; re-standardizing and rebuilding the tree are a few vectorized
+    passes over the matrix.
+    """
+
+    def __init__(self, universe: str, store: Optional[SnapshotStore] = None):
+        self.universe = universe
+        self.store = store or SnapshotStore()
+        self.snapshot_id: Optional[int] = None
+        self.tickers: List[str] = []
+        self.raw = np.empty((0, len(FEATURES)))
+        self.vectors = self.raw
+        self.tree: Optional[KDTree] = None
+        self._positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> Optional[int]:
+        """Catches up with the latest snapshot; returns its id (None if there is none)."""
+        with self._lock:
+            snapshot = self.store.latest(self.universe)
+            if not snapshot:
+                return None
+            if snapshot["id"] != self.snapshot_id:
+                self._rebuild(snapshot["id"])
+            return self.snapshot_id
+
+    def _extract(self, snapshot_id: int, changed_since: Optional[int]) -> Dict[str, List]:
+        columns = ", ".join(f"{expr} AS f{j}" for j, (expr, _) in enumerate(FEATURES.values()))
+        sql = f"SELECT ticker, {columns} FROM snapshot_rows WHERE snapshot_id = ?"
+        params = [snapshot_id]
+        if changed_since is not None:
+            # Only rows that are new or differ from the indexed snapshot
+            sql += (
+                " AND ticker IN (SELECT n.ticker FROM snapshot_rows n "
+                "LEFT JOIN snapshot_rows o ON o.snapshot_id = ? AND o.ticker = n.ticker "
+                "WHERE n.snapshot_id = ? AND (o.data IS NULL OR o.data != n.data))"
+            )
+            params += [changed_since, snapshot_id]
+        rows = self.store.db.query(sql, params)
+        return {r["ticker"]: [r[f"f{j}"] for j in range(len(FEATURES))] for r in rows}
+
+    def _rebuild(self, snapshot_id: int):
+        changed = self._extract(snapshot_id, self.snapshot_id)
+        tickers = [r["ticker"] for r in self.store.db.query(
+            "SELECT ticker FROM snapshot_rows WHERE snapshot_id = ? ORDER BY ticker", [snapshot_id]
+        )]
+        raw = np.empty((len(tickers), len(FEATURES)))
+        for i, ticker in enumerate(tickers):
+            if ticker in changed:
+                raw[i] = np.array(changed[ticker], dtype=float)  # None -> NaN
+            else:
+                raw[i] = self.raw[self._positions[ticker]]
+
+        self.raw = raw
+        self.tickers = tickers
+        self._positions = {t: i for i, t in enumerate(tickers)}
+        self.vectors = standardize(transform(raw))
+        self.tree = KDTree(self.vectors)
+        self.snapshot_id = snapshot_id
+
+    def similar(self, ticker: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        The k tickers nearest to `ticker` in the indexed snapshot as (ticker, distance),
+        nearest first. Raises KeyError if the ticker is not in the snapshot.
+        """
+        with self._lock:
+            position = self._positions[ticker.upper()]
+            distances, rows = self.tree.query(self.vectors[position], k + 1)
+            return [(self.tickers[r], float(d)) for d, r in zip(distances, rows) if r != position][:k]
+
+    def contains(self, ticker: str) -> bool:
+        return ticker.upper() in self._positions
+
+    def __len__(self):
+        return len(self.tickers)
+
+# --- Per-universe indexes ---
+
+_indexes: Dict[str, SimilarityIndex] = {}
+_indexes_lock = threading.Lock()
+
+def get_similarity_index(universe: str) -> SimilarityIndex:
+    """The universe's index, created on first use and brought up to its latest snapshot."""
+    with _indexes_lock:
+        index = _indexes.get(universe)
+        if index is None:
+            index = _indexes[universe] = SimilarityIndex(universe)
+    index.refresh()
+    return index
@@ -5,52 +5,93 @@ from rich.panel import Panel
 import typer
 import json
 import csv
-import io
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import List
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from contrarian.data.yahoo import YahooFinanceClient
 from contrarian.data.finviz import FinvizClient
 from contrarian.data.reddit import RedditClient
 from contrarian.data.stocktwits import StockTwitsClient
 from contrarian.analysis.sentiment import SentimentAnalyzer
 from contrarian.analysis.scoring import ContrarianScorer
-from contrarian.analysis.pipeline import fetch_and_score
+from contrarian.analysis.pipeline import fetch_and_score, screen_profiles, snapshot_universe
+from contrarian.analysis.profiles import get_profiles, available_profiles
+from contrarian.data.snapshots import SnapshotStore
+from contrarian.analysis.alerts import AlertRule, install_alerts, load_rules, parse_value, save_rules
+from contrarian.data.planner import SourcePlan, plan_from_sources
 from contrarian.universes.tickers import Universe
+from contrarian.universes.search import get_search_index
 from contrarian.models.stock import Stock
 from contrarian.config import config
 
 app = typer.Typer(
     name="contrarian",
     help="Contrarian Stock Screener CLI — Find opportunities where sentiment diverges from fundamentals.",
-    add_completion=False,
 )
 watch_app = typer.Typer(name="watch", help="Manage your watchlist")
 app.add_typer(watch_app, name="watch")
+cluster_app = typer.Typer(name="cluster", help="Distributed screening across worker processes and hosts")
+app.add_typer(cluster_app, name="cluster")
+alerts_app = typer.Typer(name="alerts", help="Manage alert rules evaluated whenever a ticker is scored")
+app.add_typer(alerts_app, name="alerts")
+prices_app = typer.Typer(name="prices", help="Local daily price history")
+app.add_typer(prices_app, name="prices")
+social_app = typer.Typer(name="social", help="Historical Reddit/StockTwits sentiment from bulk dumps")
+app.add_typer(social_app, name="social")
+sec_app = typer.Typer(name="sec", help="Fundamentals from SEC EDGAR bulk filings")
+app.add_typer(sec_app, name="sec")
 
 console = Console()
 
+@app.callback()
+def main():
+    # Saved alert rules are evaluated against everything scored during this run
+    install_alerts()
+
+def complete_ticker(incomplete: str):
+    """Shell completion for ticker arguments: known tickers and company names (see --install-completion)."""
+    return [(m.ticker, m.name or "") for m in get_search_index().search(incomplete, limit=20)]
+
+def resolve_ticker(ticker: str) -> str:
+    """A company name typed in full ("apple") becomes its ticker; anything else is kept as typed."""
+    return get_search_index().resolve(ticker) or ticker.upper()
+
+def parse_sources(sources: str) -> SourcePlan:
+    try:
+        return plan_from_sources(sources.split(",") if sources else None)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--sources")
+
 @app.command()
 def analyze(
-    ticker: str = typer.Argument(..., help="Stock ticker symbol (e.g., AAPL)"),
+    ticker: str = typer.Argument(..., help="Stock ticker symbol or company name (e.g., AAPL, apple)", autocompletion=complete_ticker),
     deep: bool = typer.Option(False, "--deep", help="Perform deep analysis including latest news"),
     format: str = typer.Option("terminal", "--format", help="Output format: terminal, json, md"),
+    sources: str = typer.Option(None, "--sources", help="Comma-separated sources to query (yahoo, finviz, reddit, stocktwits). Yahoo is always used."),
+    deadline_ms: int = typer.Option(config.DEEP_DIVE_DEADLINE_MS, "--deadline-ms", help="Wait at most this long for the sources; late ones fall back to cached data"),
 ):
     """
     Analyze a single stock for contrarian signals.
     """
+    plan = parse_sources(sources)
+    ticker = resolve_ticker(ticker)
     if format == "terminal":
-        console.print(f"[bold blue]Analyzing {ticker.upper()}...[/bold blue]")
+        console.print(f"[bold blue]Analyzing {ticker}...[/bold blue]")
     
     # Use pipeline function
-    data = fetch_and_score(ticker)
+    data = fetch_and_score(ticker, plan=plan, deadline_ms=deadline_ms)
     
     if not data:
         console.print(f"[red]Could not fetch data for {ticker}[/red]")
+        suggestions = [m.ticker for m in get_search_index().search(ticker, limit=5) if m.ticker != ticker]
+        if suggestions:
+            console.print(f"Did you mean: {', '.join(suggestions)}?")
         return
 
     stock = data["stock"]
@@ -59,6 +100,12 @@ def analyze(
     # Display Data
     if format == "terminal":
         display_stock_dashboard(stock, scores)
+        stale = {}
+        for field, status in (data.get("provenance") or {}).items():
+            if status != "live":
+                stale.setdefault(status, []).append(field)
+        for status, fields in stale.items():
+            console.print(f"[dim]{status.capitalize()}: {', '.join(fields)}[/dim]")
     elif format == "json":
         import dataclasses
         output = {
@@ -66,7 +113,8 @@ def analyze(
             "price": stock.price,
             "scores": scores,
             "sentiment": dataclasses.asdict(stock.sentiment) if stock.sentiment else None,
-            "financials": dataclasses.asdict(stock.financials) if stock.financials else None
+            "financials": dataclasses.asdict(stock.financials) if stock.financials else None,
+            "provenance": data.get("provenance")
         }
         print(json.dumps(output, indent=2))
     elif format == "md":
@@ -85,42 +133,76 @@ def analyze(
 def screen(
     universe: str = typer.Option("sp500", "--universe", "-u", help="Stock universe to screen (sp500, nasdaq100, test)"),
     min_score: int = typer.Option(50, "--min-score", help="Minimum contrarian score filter"),
-    format: str = typer.Option("terminal", "--format", help="Output format: terminal, json, csv"),
+    format: str = typer.Option("terminal", "--format", help="Output format: terminal, json, csv, parquet, arrow"),
+    output: Path = typer.Option(None, "--output", "-o", help="File for parquet/arrow output (default: stdout)"),
+    relative: bool = typer.Option(False, "--relative", help="Score fundamentals against sector/industry peers in the universe"),
+    sources: str = typer.Option(None, "--sources", help="Comma-separated sources to query (yahoo, finviz, reddit, stocktwits). Yahoo is always used."),
+    min_short_interest: float = typer.Option(None, "--min-short-interest", help="Only keep stocks with at least this short interest (%)"),
+    profile: str = typer.Option("default", "--profile", help=f"Comma-separated scoring profiles, one ranking each ({', '.join(available_profiles())})"),
 ):
     """
     Screen a universe of stocks for opportunities.
     """
+    plan = parse_sources(sources)
+    try:
+        profiles = get_profiles(profile.split(","))
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--profile")
+    check_export_format(format)
     tickers = Universe.get_tickers(universe)
     if format == "terminal":
         console.print(f"[bold green]Screening {len(tickers)} stocks in '{universe}'...[/bold green]")
     
-    results = []
+    relative_key = universe if relative else None
+    base_filter = None
+    if min_short_interest is not None:
+        base_filter = lambda stock: (stock.sentiment.short_interest_pct or 0) >= min_short_interest
     
     if format == "terminal":
         with Progress() as progress:
             task = progress.add_task("[cyan]Scanning market...", total=len(tickers))
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = {executor.submit(fetch_and_score, t): t for t in tickers}
-                for future in as_completed(futures):
-                    data = future.result()
-                    if data and data["scores"]["contrarian_score"] >= min_score:
-                        results.append(data)
-                    progress.advance(task)
+            rankings = screen_profiles(tickers, min_score, profiles, relative_key=relative_key,
+                                       on_progress=lambda: progress.advance(task),
+                                       plan=plan, base_filter=base_filter)
     else:
         # No progress bar for clean stdout
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(fetch_and_score, t): t for t in tickers}
-            for future in as_completed(futures):
-                data = future.result()
-                if data and data["scores"]["contrarian_score"] >= min_score:
-                    results.append(data)
+        rankings = screen_profiles(tickers, min_score, profiles, relative_key=relative_key,
+                                   plan=plan, base_filter=base_filter)
+
+    if len(rankings) == 1:
+        print_screen_results(next(iter(rankings.values())), min_score, format, output=output)
+    elif format == "terminal":
+        for name, results in rankings.items():
+            print_screen_results(results, min_score, format, title=f"Profile '{name}'")
+    else:
+        # One CSV/JSON/Arrow document for all profiles, with a profile column
+        print_screen_results([dict(r, profile=name) for name, results in rankings.items() for r in results],
+                             min_score, format, sort=False, output=output)
 
+def check_export_format(format: str):
+    """Fails early (before any fetching) on binary formats without pyarrow installed."""
+    if format in ("parquet", "arrow"):
+        from contrarian.output import arrow
+        try:
+            arrow.require_arrow()
+        except RuntimeError as e:
+            raise typer.BadParameter(str(e), param_hint="--format")
+
+def print_screen_results(results: list, min_score: int, format: str, title: str = None, sort: bool = True,
+                         output: Path = None):
+    """
+    Sorts screen results by score and renders them in the requested format.
+    parquet/arrow export every fundamental, sentiment and score column, typed, batch by
+    batch to `output` (or binary stdout).
+    """
     # Sort by Score Descending
-    results.sort(key=lambda x: x["scores"]["contrarian_score"], reverse=True)
+    if sort:
+        results.sort(key=lambda x: x["scores"]["contrarian_score"], reverse=True)
+    with_profile = any("profile" in r for r in results) and format != "terminal"
     
     # Output
     if format == "terminal":
-        table = Table(title=f"Contrarian Opportunities (> {min_score})")
+        table = Table(title=f"{title + ': ' if title else ''}Contrarian Opportunities (> {min_score})")
         table.add_column("Ticker", style="cyan", no_wrap=True)
         table.add_column("Price", style="green")
         table.add_column("Contrarian Score", style="bold yellow")
@@ -139,6 +221,7 @@ def screen(
         
     elif format == "json":
         simple_res = [{
+            **({"profile": r["profile"]} if with_profile else {}),
             "ticker": r["ticker"],
             "score": r["scores"]["contrarian_score"],
             "signal": r["scores"]["signal"]
@@ -146,59 +229,415 @@ def screen(
         print(json.dumps(simple_res, indent=2))
         
     elif format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["Ticker", "Price", "Score", "Signal"])
+        writer = csv.writer(sys.stdout)
+        writer.writerow((["Profile"] if with_profile else []) + ["Ticker", "Price", "Score", "Signal"])
         for r in results:
-            writer.writerow([
+            writer.writerow(([r["profile"]] if with_profile else []) + [
                 r["ticker"],
                 r["stock"].price,
                 r["scores"]["contrarian_score"],
                 r["scores"]["signal"]
             ])
-        print(output.getvalue())
+    
+    elif format in ("parquet", "arrow"):
+        from contrarian.output import arrow
+        write = arrow.write_parquet if format == "parquet" else arrow.write_arrow
+        if output:
+            write(results, str(output))
+        else:
+            sys.stdout.flush()
+            write(results, sys.stdout.buffer)
+
+@app.command()
+def snapshot(
+    universe: str = typer.Option("test", "--universe", "-u", help="Comma-separated universes to scan and store"),
+):
+    """
+    Scan universes in full and store the scored snapshots (run this on a schedule).
+    """
+    store = SnapshotStore()
+    for u in universe.split(","):
+        tickers = Universe.get_tickers(u)
+        with console.status(f"[cyan]Scanning {len(tickers)} stocks in '{u}'..."):
+            snapshot_id = snapshot_universe(u, store=store)
+        console.print(f"[green]Stored snapshot {snapshot_id} for '{u}'.[/green]")
+
+def render_digest(deltas: dict, tickers: set = None) -> str:
+    """Markdown for the changes since the last digest, optionally limited to some tickers."""
+    def keep(rows):
+        return [r for r in rows if not tickers or r["ticker"] in tickers]
+    
+    md = f"# 🗞️ Daily Contrarian Digest - {datetime.now().strftime('%Y-%m-%d')}\n\n"
+    empty = True
+    for universe, delta in deltas.items():
+        new_signals, flipped, movers = keep(delta["new_signals"]), keep(delta["flipped"]), keep(delta["movers"])
+        if not (new_signals or flipped or movers):
+            continue
+        empty = False
+        md += f"## {universe}\n\n"
+        if new_signals:
+            md += "### New Signals\n\n"
+            md += "| Ticker | Score | Signal | Price |\n"
+            md += "|--------|-------|--------|-------|\n"
+            for r in new_signals:
+                md += f"| **{r['ticker']}** | {r['contrarian_score']:.1f} | {r['signal']} | ${r['price']:.2f} |\n"
+            md += "\n"
+        if flipped:
+            md += "### Flipped Signals\n\n"
+            md += "| Ticker | Was | Now | Score |\n"
+            md += "|--------|-----|-----|-------|\n"
+            for r in flipped:
+                md += f"| **{r['ticker']}** | {r['old_signal']} | {r['signal']} | {r['contrarian_score']:.1f} |\n"
+            md += "\n"
+        if movers:
+            md += "### Largest Score Moves\n\n"
+            md += "| Ticker | Score | Change |\n"
+            md += "|--------|-------|--------|\n"
+            for r in movers:
+                change = r["contrarian_score"] - r["old_score"]
+                md += f"| **{r['ticker']}** | {r['contrarian_score']:.1f} | {change:+.1f} |\n"
+            md += "\n"
+    
+    if empty:
+        md += "No changes since the last digest.\n"
+    return md
+
+def send_digest(email: str, md: str):
+    # Simulated delivery
+    console.print(f"[green]Digest emailed to {email}![/green]")
 
 @app.command()
-def digest(email: str = typer.Option(None, "--email", help="Email to send digest to (simulated)")):
+def digest(
+    email: str = typer.Option(None, "--email", help="Email to send digest to (simulated)"),
+    universe: str = typer.Option("test", "--universe", "-u", help="Comma-separated universes to cover"),
+    subscribers: Path = typer.Option(None, "--subscribers", help='JSON list of {"email", "universes", "tickers"} to send per-subscriber digests'),
+    max_age_hours: float = typer.Option(config.SNAPSHOT_MAX_AGE_HOURS, "--max-age-hours", help="Scan live only if the stored snapshot is older than this"),
+    top_moves: int = typer.Option(10, "--top-moves", help="Number of largest score moves to list"),
+):
     """
-    Generate a daily digest of opportunities.
+    Generate a digest of what changed since the previous one.
     """
     console.print("[bold]Generating Daily Contrarian Digest...[/bold]")
+    store = SnapshotStore()
+    universes = universe.split(",")
     
-    # Screen Top Universes
-    top_picks = []
-    
-    # Quick scan of test universe for demo
-    tickers = Universe.get_tickers("test")
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(fetch_and_score, t): t for t in tickers}
-        for future in as_completed(futures):
-            data = future.result()
-            if data and data["scores"]["contrarian_score"] > 60:
-                top_picks.append(data)
-                
-    top_picks.sort(key=lambda x: x["scores"]["contrarian_score"], reverse=True)
-    
-    # Generate Markdown
-    md = f"# 🗞️ Daily Contrarian Digest - {datetime.now().strftime('%Y-%m-%d')}\n\n"
+    if subscribers:
+        with open(subscribers, "r") as f:
+            subscriber_list = json.load(f)
+        universes = sorted(set(universes) | {u for sub in subscriber_list for u in sub.get("universes", [])})
     
-    if not top_picks:
-        md += "No strong signals detected today.\n"
+    # One delta per universe, shared by every subscriber
+    deltas = {}
+    latest = {}
+    for u in universes:
+        snap = store.latest(u)
+        if not snap or time.time() - snap["created_at"] > max_age_hours * 3600:
+            with console.status(f"[cyan]No fresh snapshot for '{u}', scanning live..."):
+                snapshot_id = snapshot_universe(u, store=store)
+        else:
+            snapshot_id = snap["id"]
+        latest[u] = snapshot_id
+        
+        previous = store.last_digested(u)
+        if previous == snapshot_id:
+            deltas[u] = {"new_signals": [], "flipped": [], "movers": []}
+        else:
+            deltas[u] = store.diff(previous, snapshot_id, top_moves=top_moves)
+    
+    if subscribers:
+        for sub in subscriber_list:
+            sub_universes = sub.get("universes") or universes
+            md = render_digest({u: deltas[u] for u in sub_universes if u in deltas}, set(sub.get("tickers") or []))
+            send_digest(sub["email"], md)
+    else:
+        md = render_digest(deltas)
+        console.print(Panel(md, title="Digest Preview"))
+        if not email:
+            console.print("[dim]Use --email to simulate sending this report.[/dim]")
+            return
+        send_digest(email, md)
+    
+    # Only a sent digest moves the baseline for the next one
+    for u, snapshot_id in latest.items():
+        store.mark_digested(u, snapshot_id)
+
+# --- Cluster Commands ---
+
+@cluster_app.command("screen")
+def cluster_screen(
+    universe: str = typer.Option("sp500", "--universe", "-u", help="Stock universe to screen"),
+    min_score: int = typer.Option(50, "--min-score", help="Minimum contrarian score filter"),
+    format: str = typer.Option("terminal", "--format", help="Output format: terminal, json, csv, parquet, arrow"),
+    output: Path = typer.Option(None, "--output", "-o", help="File for parquet/arrow output (default: stdout)"),
+    shard_size: int = typer.Option(config.SHARD_SIZE, "--shard-size", help="Tickers per shard"),
+    workers: int = typer.Option(2, "--workers", "-w", help="Local worker processes to start (0 = rely on remote workers)"),
+    threads: int = typer.Option(10, "--threads", help="Fetch threads per worker"),
+):
+    """
+    Shard a universe onto the work queue and merge the results from all workers.
+    """
+    from contrarian.distributed.coordinator import distributed_screen
+    
+    check_export_format(format)
+    tickers = Universe.get_tickers(universe)
+    if format == "terminal":
+        console.print(f"[bold green]Distributing {len(tickers)} stocks in '{universe}' across {workers} local worker(s)...[/bold green]")
+        with Progress() as progress:
+            task = progress.add_task("[cyan]Waiting for shards...", total=None)
+            
+            def on_submit(job_id):
+                progress.console.print(f"[dim]Job {job_id} queued (check with: cluster status {job_id})[/dim]")
+            
+            def on_progress(counts):
+                total = sum(counts.values())
+                progress.update(task, total=total, completed=counts["done"] + counts["failed"])
+            
+            results = distributed_screen(tickers, universe=universe, shard_size=shard_size,
+                                         local_workers=workers, max_workers=threads,
+                                         on_submit=on_submit, on_progress=on_progress)
     else:
-        md += "## Top Opportunities\n\n"
-        md += "| Ticker | Score | Signal | Price |\n"
-        md += "|--------|-------|--------|-------|\n"
-        for p in top_picks:
-            s = p["stock"]
-            sc = p["scores"]
-            md += f"| **{s.ticker}** | {sc['contrarian_score']:.1f} | {sc['signal']} | ${s.price:.2f} |\n"
-    
-    console.print(Panel(md, title="Digest Preview"))
-    
-    if email:
-        console.print(f"[green]Digest emailed to {email}![/green]")
+        results = distributed_screen(tickers, universe=universe, shard_size=shard_size,
+                                     local_workers=workers, max_workers=threads)
+    
+    # The merged job is a complete scan, so keep it for digests
+    SnapshotStore().save(universe, results)
+    
+    results = [r for r in results if r["scores"]["contrarian_score"] >= min_score]
+    print_screen_results(results, min_score, format, output=output)
+
+@cluster_app.command("work")
+def cluster_work(
+    threads: int = typer.Option(10, "--threads", help="Fetch threads for this worker"),
+    exit_when_idle: bool = typer.Option(False, "--exit-when-idle", help="Stop once no shard is pending or leased"),
+    worker_id: str = typer.Option(None, "--worker-id", help="Identifier recorded on claimed shards"),
+):
+    """
+    Run a worker that claims shards from the queue (CONTRARIAN_QUEUE_FILE).
+    """
+    from contrarian.distributed.worker import run_worker
+    
+    completed = run_worker(worker_id=worker_id, max_workers=threads, exit_when_idle=exit_when_idle)
+    # stderr: stdout of local workers is shared with the coordinator's output
+    Console(stderr=True).print(f"[dim]Worker finished {completed} shard(s).[/dim]")
+
+@cluster_app.command("status")
+def cluster_status(job_id: str = typer.Argument(..., help="Job id printed by the coordinator")):
+    """Show shard progress for a job."""
+    from contrarian.distributed.work_queue import ShardQueue
+    
+    queue = ShardQueue()
+    counts = queue.status(job_id)
+    table = Table(title=f"Job {job_id}")
+    for state in counts:
+        table.add_column(state.title())
+    table.add_row(*(str(v) for v in counts.values()))
+    console.print(table)
+    
+    for shard in queue.failed_shards(job_id):
+        console.print(f"[red]Shard {shard['seq']} failed ({', '.join(shard['tickers'])}): {shard['error']}[/red]")
+
+# --- Price History Commands ---
+
+@prices_app.command("update")
+def prices_update(
+    universe: str = typer.Option("sp500", "--universe", "-u", help="Comma-separated universes to download"),
+    years: int = typer.Option(config.PRICE_HISTORY_YEARS, "--years", help="History for tickers not stored yet"),
+):
+    """Download missing daily bars (full history for new tickers, only new days otherwise)."""
+    from contrarian.data.prices import PriceStore
+    
+    tickers = list(dict.fromkeys(t for u in universe.split(",") for t in Universe.get_tickers(u)))
+    with console.status(f"[cyan]Updating price history for {len(tickers)} stocks..."):
+        appended = PriceStore().update(tickers, years=years)
+    # Tickers downloaded without new rows (e.g. after a market holiday) were up to date too
+    updated = sum(1 for rows in appended.values() if rows)
+    console.print(f"[green]Appended {sum(appended.values())} rows for {updated} tickers "
+                  f"({len(tickers) - updated} already up to date).[/green]")
+
+@prices_app.command("stats")
+def prices_stats(
+    universe: str = typer.Option("sp500", "--universe", "-u", help="Stock universe"),
+    days: int = typer.Option(252, "--days", help="Window in trading days (252 = 52 weeks)"),
+    format: str = typer.Option("terminal", "--format", help="Output format: terminal, csv"),
+):
+    """Windowed high/low, drawdown and return from the stored history."""
+    from contrarian.data.prices import PriceStore
+    
+    stats = PriceStore().universe_stats(Universe.get_tickers(universe), days=days)
+    if stats.empty:
+        console.print("[yellow]No stored prices; run `prices update` first.[/yellow]")
+        return
+    if format == "csv":
+        print(stats.to_csv(index=False), end="")
+        return
+    
+    table = Table(title=f"Last {days} trading days ({universe})")
+    for column in ("Ticker", "As Of", "Close", "High", "Low", "From High", "Max DD", "Return"):
+        table.add_column(column)
+    
+    def percent(value):
+        # None (too few bars, zero price) comes back as NaN in the frame
+        return "n/a" if value is None or value != value else f"{value:.1f}%"
+    
+    for s in stats.sort_values("percent_from_high").to_dict("records"):
+        table.add_row(s["ticker"], s["as_of"], f"${s['close']:.2f}", f"${s['high']:.2f}", f"${s['low']:.2f}",
+                      percent(s["percent_from_high"]), percent(s["max_drawdown"]), percent(s["return"]))
+    console.print(table)
+
+# --- Social History Commands ---
+
+@social_app.command("ingest")
+def social_ingest(
+    paths: List[Path] = typer.Argument(..., help="NDJSON dumps, plain or .zst/.gz/.bz2/.xz compressed"),
+    source: str = typer.Option("auto", "--source", help="reddit, stocktwits, or auto (per record)"),
+    universe: str = typer.Option("sp500,nasdaq100", "--universe", "-u", help="Comma-separated universes whose tickers are counted"),
+    tickers: str = typer.Option(None, "--tickers", help="Comma-separated tickers to count (instead of --universe)"),
+    workers: int = typer.Option(config.DUMP_WORKERS, "--workers", help="Parsing processes"),
+    force: bool = typer.Option(False, "--force", help="Ingest files that were ingested before (their earlier counts are replaced)"),
+):
+    """Aggregate dumps into daily per-ticker mentions and sentiment in the local store."""
+    from contrarian.data.dumps import SocialHistory, ingest_dump
+    
+    tracked = {t.strip().upper() for t in tickers.split(",") if t.strip()} if tickers else \
+        {t for u in universe.split(",") for t in Universe.get_tickers(u)}
+    history = SocialHistory()
+    for path in paths:
+        with Progress(console=console, transient=True) as progress:
+            task = progress.add_task(f"[cyan]{path.name}", total=path.stat().st_size)
+            try:
+                stats = ingest_dump(path, tracked, source=source, workers=workers, history=history, force=force,
+                                    on_progress=lambda done, total: progress.update(task, completed=done))
+            except (ValueError, RuntimeError) as e:
+                console.print(f"[red]{path.name}: {e}[/red]")
+                raise typer.Exit(1)
+        if stats["skipped"]:
+            console.print(f"[yellow]{path.name} was ingested before; skipped (use --force to ingest it again).[/yellow]")
+        else:
+            console.print(f"[green]{path.name}: {stats['lines']:,} records, {stats['mentions']:,} ticker mentions"
+                          f" ({stats['bad_lines']:,} unreadable or not posts).[/green]")
+
+@social_app.command("history")
+def social_history(
+    ticker: str = typer.Argument(..., autocompletion=complete_ticker),
+    source: str = typer.Option(None, "--source", help="reddit or stocktwits (default: both)"),
+    start: str = typer.Option(None, "--start", help="First day (YYYY-MM-DD)"),
+    end: str = typer.Option(None, "--end", help="Last day (YYYY-MM-DD)"),
+    format: str = typer.Option("terminal", "--format", help="Output format: terminal, csv"),
+):
+    """Daily mentions and sentiment of a ticker from the ingested dumps."""
+    from contrarian.data.dumps import SocialHistory
+    
+    rows = SocialHistory().daily(ticker, source=source, start=start, end=end)
+    if not rows:
+        console.print(f"[yellow]No ingested history for {ticker.upper()}; run `social ingest` first.[/yellow]")
+        return
+    columns = ["day", "source", "mentions", "sentiment_score", "bulls", "bears", "bull_ratio"]
+    if format == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        writer.writerows([r[c] for c in columns] for r in rows)
+        return
+    
+    table = Table(title=f"{ticker.upper()} social history")
+    for column in ("Day", "Source", "Mentions", "Lexicon Sentiment", "Bulls", "Bears", "Bull Ratio"):
+        table.add_column(column)
+    for r in rows:
+        table.add_row(r["day"], r["source"], str(r["mentions"]), f"{r['sentiment_score']:.0%}",
+                      str(r["bulls"]), str(r["bears"]), f"{r['bull_ratio']:.0%}" if r["bull_ratio"] is not None else "-")
+    console.print(table)
+
+# --- SEC Fundamentals Commands ---
+
+@sec_app.command("ingest")
+def sec_ingest(
+    archive: Path = typer.Argument(..., help="EDGAR bulk companyfacts.zip"),
+    tickers_file: Path = typer.Option(config.SEC_TICKERS_FILE, "--tickers-file", help="SEC company_tickers.json (ticker -> CIK)"),
+    workers: int = typer.Option(config.SEC_WORKERS, "--workers", help="Parsing processes"),
+    force: bool = typer.Option(False, "--force", help="Re-parse every filer, changed or not"),
+):
+    """Load the filers that changed since the last archive into the local fundamentals table."""
+    from contrarian.data.sec import ingest_companyfacts
+    
+    if not tickers_file.exists():
+        console.print(f"[yellow]{tickers_file} not found; keeping the stored ticker map.[/yellow]")
+    with Progress(console=console, transient=True) as progress:
+        task = progress.add_task(f"[cyan]{archive.name}", total=None)
+        stats = ingest_companyfacts(archive, tickers_file=tickers_file, workers=workers, force=force,
+                                    on_progress=lambda done, total: progress.update(task, completed=done, total=total))
+    console.print(f"[green]{archive.name}: {stats['parsed']:,} filers updated, {stats['unchanged']:,} unchanged"
+                  f" ({stats['bad']:,} unreadable).[/green]")
+    if stats["tickers"]:
+        console.print(f"[green]Mapped {stats['tickers']:,} tickers to their filers.[/green]")
+
+@sec_app.command("show")
+def sec_show(ticker: str = typer.Argument(..., autocompletion=complete_ticker)):
+    """The stored SEC fundamentals of a ticker."""
+    from contrarian.data.sec import SecFundamentals
+    
+    row = SecFundamentals().lookup([ticker.upper()]).get(ticker.upper())
+    if not row:
+        console.print(f"[yellow]No SEC fundamentals for {ticker.upper()}; run `sec ingest` first.[/yellow]")
+        return
+    table = Table(title=f"{row['entity_name']} (CIK {row['cik']}), period ending {row['period_end']}")
+    table.add_column("Field")
+    table.add_column("Value")
+    for field in ("revenue", "net_income", "operating_cash_flow", "capex", "total_debt", "equity"):
+        table.add_row(field, f"${row[field]:,.0f}" if row[field] is not None else "-")
+    table.add_row("revenue_growth", f"{row['revenue_growth']:.1%}" if row["revenue_growth"] is not None else "-")
+    table.add_row("shares", f"{row['shares']:,.0f}" if row["shares"] is not None else "-")
+    table.add_row("filed", row["filed"] or "-")
+    console.print(table)
+
+# --- Alert Commands ---
+
+@alerts_app.command("add")
+def alerts_add(
+    field: str = typer.Argument(..., help="Field to watch, e.g. signal, contrarian_score, sentiment.short_interest_pct"),
+    op: str = typer.Argument(..., help="Comparison: >, >=, <, <=, ==, !="),
+    value: str = typer.Argument(..., help="Threshold or value to compare with"),
+    ticker: str = typer.Option(None, "--ticker", "-t", help="Only this ticker (default: every ticker)"),
+    cooldown: float = typer.Option(60, "--cooldown", help="Minutes before the same rule can fire again for a ticker"),
+    sink: str = typer.Option("file", "--sink", help="Delivery: file or webhook"),
+):
+    """Add an alert rule."""
+    try:
+        rule = AlertRule(field=field, op=op, value=parse_value(value), ticker=ticker,
+                         cooldown_minutes=cooldown, sink=sink)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    rules = load_rules()
+    rules.append(rule)
+    save_rules(rules)
+    console.print(f"[green]Added alert {rule.id}: {rule.describe()}[/green]")
+
+@alerts_app.command("list")
+def alerts_list():
+    """List alert rules."""
+    rules = load_rules()
+    if not rules:
+        console.print("No alert rules.")
+        return
+    
+    table = Table(title="Alert Rules")
+    table.add_column("ID", style="dim")
+    table.add_column("Rule", style="cyan")
+    table.add_column("Cooldown", style="italic")
+    table.add_column("Sink")
+    for r in rules:
+        table.add_row(r.id, r.describe(), f"{r.cooldown_minutes:g} min", r.sink)
+    console.print(table)
+
+@alerts_app.command("remove")
+def alerts_remove(rule_id: str):
+    """Remove an alert rule."""
+    rules = load_rules()
+    remaining = [r for r in rules if r.id != rule_id]
+    if len(rules) == len(remaining):
+        console.print(f"[yellow]Alert {rule_id} not found.[/yellow]")
     else:
-        console.print("[dim]Use --email to simulate sending this report.[/dim]")
+        save_rules(remaining)
+        console.print(f"[green]Removed alert {rule_id}.[/green]")
 
 # --- Watchlist Commands ---
 
@@ -216,7 +655,7 @@ def save_watchlist(data):
         json.dump(data, f, indent=4)
 
 @watch_app.command("add")
-def watch_add(ticker: str, note: str = ""):
+def watch_add(ticker: str = typer.Argument(..., autocompletion=complete_ticker), note: str = ""):
     """Add a stock to watchlist."""
     data = load_watchlist()
     # Check if exists
@@ -299,6 +738,8 @@ def display_stock_dashboard(stock: Stock, scores: dict):
         sent_table.add_row("Reddit Mentions (Wk)", str(s.reddit_mentions))
         sent_table.add_row("Reddit Sentiment", f"{s.reddit_sentiment_score:.0%} Bullish")
         sent_table.add_row("StockTwits Sentiment", f"{s.stocktwits_bull_ratio:.0%} Bullish")
+        crowding = scores.get("crowding_z")
+        sent_table.add_row("Crowding vs. Own Baseline", f"{crowding:+.1f} std devs" if crowding is not None else "- (building history)")
         
     console.print(sent_table)
 
@@ -306,4 +747,5 @@ def display_stock_dashboard(stock: Stock, scores: dict):
 
 
 if __name__ == "__main__":
-    app()
+    # Named like the command, so --install-completion hooks `contrarian`, not `python -m ...`
+    app(prog_name="contrarian")
@@ -9,17 +9,146 @@ class Config:
     # Project paths
     BASE_DIR = Path(__file__).resolve().parent.parent
     DATA_DIR = BASE_DIR / "data"
+    # Generated data keeps its own store, cache, prices and alert state, so synthetic runs
+    # never touch real tickers' baselines, negative cache or alert edges
+    if os.getenv("CONTRARIAN_PROVIDER") == "synthetic":
+        DATA_DIR = DATA_DIR / "synthetic"
     CACHE_FILE = DATA_DIR / "cache.db"
+    # Local store: scored snapshots and other derived data
+    STORE_FILE = DATA_DIR / "store.db"
+    # Daily OHLCV history, one memory-mapped file per ticker
+    PRICES_DIR = DATA_DIR / "prices"
+    ALERTS_FILE = DATA_DIR / "alerts.json"
+    ALERTS_LOG_FILE = DATA_DIR / "alerts.log.jsonl"
+    # Shard queue for distributed screening. Point this at shared storage to run workers on several hosts.
+    QUEUE_FILE = Path(os.getenv("CONTRARIAN_QUEUE_FILE", DATA_DIR / "queue.db"))
     
     # API Keys (loaded from environment variables)
     REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
     REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
     YAHOO_RAPIDAPI_KEY = os.getenv("YAHOO_RAPIDAPI_KEY")
     FINVIZ_API_KEY = os.getenv("FINVIZ_API_KEY")
+    ALERT_WEBHOOK_URL = os.getenv("ALERT_WEBHOOK_URL")
     
     # Preferences
     DEFAULT_UNIVERSE = "sp500"
     CACHE_TTL_HOURS = 4
+    DASHBOARD_CACHE_TTL_MINUTES = int(os.getenv("DASHBOARD_CACHE_TTL_MINUTES", "15"))
+    
+    # Data providers (contrarian.data.providers): which provider fills each source slot.
+    # CONTRARIAN_PROVIDER=synthetic swaps every slot for generated offline data;
+    # CONTRARIAN_FUNDAMENTALS_PROVIDER=sec fills only price/fundamentals from local SEC filings.
+    PROVIDER_REGISTRY = {
+        "yahoo": "contrarian.data.providers:YahooProvider",
+        "finviz": "contrarian.data.providers:FinvizProvider",
+        "reddit": "contrarian.data.providers:RedditProvider",
+        "stocktwits": "contrarian.data.providers:StockTwitsProvider",
+        "synthetic": "contrarian.data.synthetic:SyntheticProvider",
+        "sec": "contrarian.data.sec:SecProvider",
+    }
+    DATA_PROVIDERS = {
+        source: os.getenv("CONTRARIAN_PROVIDER", source)
+        for source in ("yahoo", "finviz", "reddit", "stocktwits")
+    }
+    DATA_PROVIDERS["yahoo"] = os.getenv("CONTRARIAN_FUNDAMENTALS_PROVIDER", DATA_PROVIDERS["yahoo"])
+    # Synthetic data: seed of every generated value, and tickers in the "synthetic" universe
+    SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED", "7"))
+    SYNTHETIC_UNIVERSE_SIZE = int(os.getenv("SYNTHETIC_UNIVERSE_SIZE", "50000"))
+    
+    # Upstream resilience: symbols a source cannot resolve are skipped for this long, and a
+    # source is skipped for BREAKER_COOLDOWN_SECONDS after this many consecutive failures
+    NEGATIVE_CACHE_TTL_HOURS = 24
+    BREAKER_FAILURE_THRESHOLD = 5
+    BREAKER_COOLDOWN_SECONDS = 120
+    
+    # Shared work scheduler: tasks in flight across the process (API, CLI, refreshes).
+    # The limit starts at SCHEDULER_INITIAL_CONCURRENCY and adapts to upstream health
+    # every SCHEDULER_WINDOW calls: +1 while healthy, x SCHEDULER_BACKOFF on more than
+    # SCHEDULER_MAX_ERROR_RATE errors or latency above SCHEDULER_LATENCY_TOLERANCE x baseline.
+    SCHEDULER_MIN_CONCURRENCY = 2
+    SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "32"))
+    SCHEDULER_INITIAL_CONCURRENCY = 10
+    SCHEDULER_WINDOW = 20
+    SCHEDULER_MAX_ERROR_RATE = 0.1
+    SCHEDULER_LATENCY_TOLERANCE = 2.0
+    SCHEDULER_BACKOFF = 0.75
+    SCHEDULER_BASELINE_DRIFT = 0.05
+    SCHEDULER_INTERACTIVE_RESERVE = 2  # Extra slots only interactive lookups may use
+    
+    # Single-ticker lookups (API /api/stock, CLI analyze) fetch all sources concurrently and
+    # wait at most this long; late sources fall back to the cache (see pipeline.fetch_and_score)
+    DEEP_DIVE_DEADLINE_MS = int(os.getenv("DEEP_DIVE_DEADLINE_MS", "3000"))
+    
+    # Shared authenticated Reddit sessions (one per concurrent search at most)
+    REDDIT_POOL_SIZE = int(os.getenv("REDDIT_POOL_SIZE", "4"))
+    
+    # StockTwits: rolling windows (hours) of labeled messages kept in the local store. The
+    # bull ratio uses the shortest window with at least STOCKTWITS_MIN_LABELED labels.
+    STOCKTWITS_WINDOWS = {"1h": 1, "24h": 24, "7d": 168}
+    STOCKTWITS_MIN_LABELED = 20
+    STOCKTWITS_MAX_PAGES = 3  # Per refresh; each page holds up to 30 messages
+    
+    # Historical Reddit/StockTwits dump ingestion (`contrarian social ingest`): worker
+    # processes, decompressed bytes per parsed block, and (ticker, day) pairs held in
+    # memory before they are added to the store
+    DUMP_WORKERS = int(os.getenv("DUMP_WORKERS", str(os.cpu_count() or 2)))
+    DUMP_CHUNK_BYTES = 8 * 1024 * 1024
+    DUMP_FLUSH_KEYS = 200000
+    
+    # SEC bulk fundamentals (`contrarian sec ingest`): EDGAR's ticker -> CIK map
+    # (company_tickers.json), parsing processes, and the age of a filer's latest reported
+    # period (days) or of its last stored daily bar (trading days) past which the provider
+    # asks Yahoo instead
+    SEC_TICKERS_FILE = Path(os.getenv("SEC_TICKERS_FILE", DATA_DIR / "company_tickers.json"))
+    SEC_WORKERS = int(os.getenv("SEC_WORKERS", str(os.cpu_count() or 2)))
+    SEC_MAX_AGE_DAYS = 400
+    SEC_MAX_PRICE_AGE_DAYS = 3
+    
+    # Price history downloaded for tickers new to the price store
+    PRICE_HISTORY_YEARS = 5
+    
+    # Per-ticker baselines of social metrics (EWMA) for crowding z-scores
+    BASELINE_ALPHA = 0.1                 # Weight of each new reading
+    BASELINE_MIN_SAMPLES = 5             # Readings before z-scores are reported
+    BASELINE_MIN_INTERVAL_MINUTES = 60   # Baseline updates per ticker at most this often
+    BASELINE_MIN_STD = {"reddit_mentions": 1.0, "reddit_sentiment_score": 0.05, "stocktwits_bull_ratio": 0.05}
+    CROWDING_Z_THRESHOLD = 2.5
+    
+    # Scoring profiles: overrides of contrarian.analysis.profiles.ScoringProfile ("default"
+    # is the built-in rule set). Select with `screen --profile` or `/api/screen?profile=`.
+    SCORING_PROFILES = {
+        # Only extreme crowds and clearly strong/weak fundamentals
+        "strict": {
+            "loved_analyst_min": 70, "loved_retail_min": 70,
+            "hated_analyst_max": 30, "hated_retail_max": 30, "high_short_pct": 20,
+            "long_signal_min_fundamental": 70, "short_signal_max_fundamental": 30,
+        },
+        # Short sellers drive the crowded-short side
+        "squeeze": {
+            "high_short_pct": 10, "short_interest_cap": 15,
+            "short_analyst_weight": 0.2, "short_retail_weight": 0.3, "short_short_weight": 0.5,
+        },
+        # Retail sentiment outweighs analysts
+        "retail": {
+            "long_analyst_weight": 0.3, "long_retail_weight": 0.6, "long_short_weight": 0.1,
+            "short_analyst_weight": 0.2, "short_retail_weight": 0.5, "short_short_weight": 0.3,
+        },
+    }
+    
+    # Digest: reuse a stored snapshot younger than this instead of scanning live
+    SNAPSHOT_MAX_AGE_HOURS = 24
+    
+    # Relative (peer) fundamental scoring: smallest industry/sector group used for percentiles
+    RELATIVE_MIN_GROUP_SIZE = 5
+    
+    # Live WebSocket updates: background re-score interval for subscribed tickers (0 = off)
+    LIVE_REFRESH_SECONDS = int(os.getenv("LIVE_REFRESH_SECONDS", "300"))
+    LIVE_CLIENT_QUEUE_SIZE = 256
+    
+    # Distributed screening
+    SHARD_SIZE = 10
+    SHARD_LEASE_SECONDS = 60
+    SHARD_MAX_ATTEMPTS = 3
     
     # Create data directory if it doesn't exist
     DATA_DIR.mkdir(parents=True, exist_ok=True)
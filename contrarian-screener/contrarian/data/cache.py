@@ -1,16 +1,25 @@
 from sqlite_utils import Database
 from contrarian.config import config
+from contrarian.data.store import open_store
 from contrarian.models.stock import Stock
 import json
+import threading
 import time
-from typing import Optional
-from dataclasses import asdict
+from typing import List, Optional, Tuple
 
 class Cache:
-    def __init__(self):
-        self.db = Database(config.CACHE_FILE)
+    """
+    Last known Stock per ticker (CACHE_FILE), valid for CACHE_TTL_HOURS.
+
+    Single-ticker fetches fall back to it for sources that miss their deadline, and
+    fill it in once the late sources answer (see pipeline.fetch_and_score).
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store(config.CACHE_FILE)
         self.table = self.db["stocks"]
-        
+        self._lock = threading.Lock()
+
         # Ensure table exists with composite primary key or index if needed
         if not self.table.exists():
             self.table.create({
@@ -18,32 +27,29 @@ class Cache:
                 "data": str, # JSON serialized Stock object
                 "updated_at": float
             }, pk="ticker")
-    
+
     def get(self, ticker: str) -> Optional[Stock]:
-        row = self.table.get(ticker)
-        if not row:
+        with self._lock:
+            rows = list(self.db.query("SELECT data, updated_at FROM stocks WHERE ticker = ?", [ticker.upper()]))
+        if not rows:
             return None
-        
+
         # Check TTL
-        if time.time() - row["updated_at"] > (config.CACHE_TTL_HOURS * 3600):
+        if time.time() - rows[0]["updated_at"] > (config.CACHE_TTL_HOURS * 3600):
             return None
-            
-        # Deserialize (Simplified for MVP: assumes strict structure)
-        # In a real app, we'd want robust deserialization logic
-        # For now, we'll rely on the caller to refetch if None is returned
-        # Or we can return the raw dict and let the factory reconstruct it
-        # But `Stock` is nested, so let's skip complex reconstruction here for this step
-        # and just return None to force refetch until we build a proper serializer.
-        
-        # Actually, let's just return None for now to ensure we test the live fetch first.
-        # Implementation of full serialization/deserialization is a nice-to-have for Phase 1.
-        return None 
+        return Stock.from_dict(json.loads(rows[0]["data"]))
+
+    def names(self) -> List[Tuple[str, Optional[str]]]:
+        """(ticker, company name) of every cached stock, expired or not."""
+        with self._lock:
+            return [(r["ticker"], r["name"]) for r in self.db.query(
+                "SELECT ticker, json_extract(data, '$.company_name') AS name FROM stocks"
+            )]
 
     def set(self, stock: Stock):
-        # We need a custom serializer because Stock contains nested dataclasses
-        # For Phase 1, we will just store it.
-        # We won't implement full retrieval logic yet, just the storage mechanism.
-        pass
+        row = {"ticker": stock.ticker.upper(), "data": json.dumps(stock.to_dict()), "updated_at": time.time()}
+        with self._lock:
+            self.table.upsert(row, pk="ticker")
 
 # Instantiate a global cache
 cache = Cache()
@@ -0,0 +1,354 @@
+import bz2
+import gzip
+import lzma
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.data.reddit import keyword_hits
+from contrarian.data.store import open_store
+
+try:
+    import zstandard
+except ImportError:  # Optional, for .zst dumps (pip install contrarian-screener[dumps])
+    zstandard = None
+
+try:
+    from orjson import loads
+except ImportError:  # Optional speed-up (pip install contrarian-screener[fast])
+    from json import loads
+
+SOURCES = ("reddit", "stocktwits")
+
+# Per (ticker, day) counters, in this order
+COUNTERS = ("mentions", "bull_hits", "bear_hits", "bulls", "bears")
+
+CASHTAG = re.compile(r"\$([A-Za-z]{1,5}(?:\.[A-Za-z])?)\b")
+# Bare symbols count only in capitals and from two letters on ("A", "it" and "all" stay words)
+BARE_SYMBOL = re.compile(r"\b([A-Z]{2,5}(?:\.[A-Z])?)\b")
+
+Aggregates = Dict[Tuple[str, str], List[int]]
+
+class SocialHistory:
+    """
+    Daily Reddit/StockTwits aggregates per ticker in the local store, built from historical
+    dumps (see `ingest_dump`) for calibrating and backtesting the retail sentiment inputs.
+
+    Each row holds a day's mentions, lexicon hits (the same keywords the live Reddit
+    client counts) and, for StockTwits, the messages labeled Bullish/Bearish, as counted
+    from one dump file. Reads add up the files covering a day, but only files whose
+    ingestion finished: an interrupted ingest stays invisible, and ingesting a file again
+    replaces its earlier counts instead of adding to them.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store()
+        self._lock = threading.Lock()
+        if not self.db["social_dumps"].exists():
+            self.db["social_dumps"].create({
+                "id": int,
+                "path": str,
+                "size": int,
+                "mtime": float,
+                "source": str,
+                "lines": int,
+                "bad_lines": int,
+                "ingested_at": float  # None until the whole file is in
+            }, pk="id")
+            self.db["social_dumps"].create_index(["path"], unique=True)
+        if not self.db["social_daily"].exists():
+            self.db["social_daily"].create({
+                "source": str,
+                "ticker": str,
+                "day": str,  # ISO date, UTC
+                "dump_id": int,
+                **{counter: int for counter in COUNTERS}
+            }, pk=("source", "ticker", "day", "dump_id"))
+            self.db["social_daily"].create_index(["ticker", "day"])
+            self.db["social_daily"].create_index(["dump_id"])
+
+    def begin(self, path: Path) -> int:
+        """
+        Starts (or restarts) ingesting a file: drops whatever an earlier or interrupted
+        ingest of the same path counted and returns the file's dump id.
+        """
+        stat = path.stat()
+        key = str(path.resolve())
+        with self._lock, self.db.conn:
+            self.db.conn.execute(
+                "INSERT INTO social_dumps (path, size, mtime) VALUES (?, ?, ?) ON CONFLICT (path) DO UPDATE SET "
+                "size = excluded.size, mtime = excluded.mtime, ingested_at = NULL",
+                [key, stat.st_size, stat.st_mtime]
+            )
+            dump_id = self.db.conn.execute("SELECT id FROM social_dumps WHERE path = ?", [key]).fetchone()[0]
+            self.db.conn.execute("DELETE FROM social_daily WHERE dump_id = ?", [dump_id])
+        return dump_id
+
+    def add(self, dump_id: int, source: str, aggregates: Aggregates):
+        """Adds per-(ticker, day) counts of a file being ingested, in one transaction."""
+        with self._lock, self.db.conn:
+            self.db.conn.executemany(
+                f"INSERT INTO social_daily (source, ticker, day, dump_id, {', '.join(COUNTERS)}) "
+                f"VALUES (?, ?, ?, ?, {', '.join('?' for _ in COUNTERS)}) "
+                f"ON CONFLICT (source, ticker, day, dump_id) DO UPDATE SET "
+                + ", ".join(f"{c} = {c} + excluded.{c}" for c in COUNTERS),
+                [[source, ticker, day, dump_id, *counts] for (ticker, day), counts in aggregates.items()]
+            )
+
+    def ingested(self, path: Path) -> bool:
+        """True if this exact file (same size and modification time) was fully ingested already."""
+        stat = path.stat()
+        with self._lock:
+            rows = list(self.db.query("SELECT size, mtime, ingested_at FROM social_dumps WHERE path = ?",
+                                      [str(path.resolve())]))
+        return bool(rows) and rows[0]["ingested_at"] is not None \
+            and rows[0]["size"] == stat.st_size and rows[0]["mtime"] == stat.st_mtime
+
+    def finish(self, dump_id: int, source: str, lines: int, bad_lines: int):
+        """Marks a file's ingest complete, which makes its counts visible to `daily`."""
+        with self._lock, self.db.conn:
+            self.db.conn.execute(
+                "UPDATE social_dumps SET source = ?, lines = ?, bad_lines = ?, ingested_at = ? WHERE id = ?",
+                [source, lines, bad_lines, time.time(), dump_id]
+            )
+
+    def daily(self, ticker: str, source: Optional[str] = None, start: Optional[str] = None,
+              end: Optional[str] = None) -> List[Dict]:
+        """
+        Stored days of a ticker (start <= day <= end, ISO dates), oldest first, with the
+        live inputs derived the same way: `sentiment_score` (Reddit's lexicon ratio, 0.5
+        without hits) and `bull_ratio` (labeled StockTwits messages, None without labels).
+        """
+        clauses, params = ["s.ticker = ?"], [ticker.upper()]
+        for clause, value in (("s.source = ?", source), ("s.day >= ?", start), ("s.day <= ?", end)):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        with self._lock:
+            rows = list(self.db.query(
+                f"SELECT s.day, s.source, s.ticker, {', '.join(f'SUM(s.{c}) AS {c}' for c in COUNTERS)} "
+                f"FROM social_daily s JOIN social_dumps d ON d.id = s.dump_id AND d.ingested_at IS NOT NULL "
+                f"WHERE {' AND '.join(clauses)} GROUP BY s.day, s.source, s.ticker ORDER BY s.day, s.source", params
+            ))
+        for row in rows:
+            hits = row["bull_hits"] + row["bear_hits"]
+            labeled = row["bulls"] + row["bears"]
+            row["sentiment_score"] = row["bull_hits"] / hits if hits else 0.5
+            row["bull_ratio"] = row["bulls"] / labeled if labeled else None
+        return rows
+
+# --- Reading ---
+
+def open_dump(path: Path) -> Tuple[BinaryIO, BinaryIO]:
+    """
+    (decompressed stream, underlying file) for a dump; the compression is picked by suffix
+    (.zst, .gz, .bz2, .xz, anything else is read as plain NDJSON). The file's position
+    tells how much of it has been consumed.
+    """
+    raw = open(path, "rb")
+    suffix = path.suffix.lower()
+    if suffix in (".zst", ".zstd"):
+        if zstandard is None:
+            raw.close()
+            raise RuntimeError("Reading .zst dumps needs zstandard (pip install contrarian-screener[dumps])")
+        # Archive dumps are compressed with long-distance windows of up to 2 GB
+        return zstandard.ZstdDecompressor(max_window_size=2 ** 31).stream_reader(raw), raw
+    if suffix == ".gz":
+        return gzip.GzipFile(fileobj=raw), raw
+    if suffix == ".bz2":
+        return bz2.BZ2File(raw), raw
+    if suffix == ".xz":
+        return lzma.LZMAFile(raw), raw
+    return raw, raw
+
+def iter_chunks(stream: BinaryIO, chunk_bytes: int) -> Iterator[bytes]:
+    """Blocks of about `chunk_bytes` decompressed bytes, each ending at a line boundary."""
+    rest = b""
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            break
+        block = rest + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            rest = block  # A line longer than the chunk: keep reading
+            continue
+        rest = block[cut:]
+        yield block[:cut]
+    if rest.strip():
+        yield rest
+
+# --- Parsing (runs in the worker processes) ---
+
+_tickers: FrozenSet[str] = frozenset()
+
+def init_worker(tickers: FrozenSet[str]):
+    global _tickers
+    _tickers = tickers
+
+def mentioned(text: str, tagged: Optional[List[str]] = None) -> Set[str]:
+    """Tracked tickers a text mentions: its tagged symbols if any, else cashtags and bare capitals."""
+    if tagged:
+        return {t.upper() for t in tagged} & _tickers
+    found = {m.upper() for m in CASHTAG.findall(text)}
+    found.update(BARE_SYMBOL.findall(text))
+    return found & _tickers
+
+def parse_record(record: Dict, source: str) -> Optional[Tuple[str, str, str, Optional[List[str]], Optional[str]]]:
+    """
+    (source, day, text, tagged symbols, label) of one dump record, None if it is not a post. Reddit
+    records are submissions (title + selftext) or comments (body) with `created_utc`;
+    StockTwits records are messages with `created_at`, `symbols` and an optional
+    Bullish/Bearish label.
+    """
+    if source == "auto":
+        source = "reddit" if "created_utc" in record else "stocktwits" if "created_at" in record else None
+    if source == "reddit":
+        created = record.get("created_utc")
+        if created is None:
+            return None
+        day = datetime.fromtimestamp(float(created), tz=timezone.utc).date().isoformat()
+        text = " ".join(record.get(k) or "" for k in ("title", "selftext", "body"))
+        return source, day, text, None, None
+    if source == "stocktwits":
+        created = record.get("created_at")
+        if not created:
+            return None
+        tagged = [s.get("symbol") for s in record.get("symbols") or [] if s.get("symbol")]
+        label = ((record.get("entities") or {}).get("sentiment") or {}).get("basic")
+        return source, created[:10], record.get("body") or "", tagged, label
+    return None
+
+def aggregate_chunk(chunk: bytes, source: str) -> Tuple[Dict[str, Aggregates], int, int]:
+    """({source: {(ticker, day): counters}}, lines, bad lines) for one block of NDJSON."""
+    out: Dict[str, Aggregates] = {}
+    lines = bad = 0
+    for line in chunk.splitlines():
+        if not line.strip():
+            continue
+        lines += 1
+        try:
+            parsed = parse_record(loads(line), source)
+        except (ValueError, TypeError, AttributeError, OverflowError):
+            parsed = None
+        if parsed is None:
+            bad += 1
+            continue
+        record_source, day, text, tagged, label = parsed
+        tickers = mentioned(text, tagged)
+        if not tickers:
+            continue
+        bull_hits, bear_hits = keyword_hits(text)
+        bulls, bears = int(label == "Bullish"), int(label == "Bearish")
+        daily = out.setdefault(record_source, {})
+        for ticker in tickers:
+            counts = daily.setdefault((ticker, day), [0] * len(COUNTERS))
+            counts[0] += 1
+            counts[1] += bull_hits
+            counts[2] += bear_hits
+            counts[3] += bulls
+            counts[4] += bears
+    return out, lines, bad
+
+# --- Ingestion ---
+
+def merge(into: Dict[str, Aggregates], part: Dict[str, Aggregates]):
+    for source, daily in part.items():
+        target = into.setdefault(source, {})
+        for key, counts in daily.items():
+            current = target.get(key)
+            if current is None:
+                target[key] = counts
+            else:
+                for i, value in enumerate(counts):
+                    current[i] += value
+
+def ingest_dump(
+    path: Path,
+    tickers: Set[str],
+    source: str = "auto",
+    workers: Optional[int] = None,
+    chunk_bytes: Optional[int] = None,
+    history: Optional[SocialHistory] = None,
+    force: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Streams one NDJSON dump (optionally compressed) into daily per-ticker aggregates for
+    the given tickers.
+
+    Decompression runs here; parsing, mention extraction and lexicon scoring run on
+    `workers` processes (DUMP_WORKERS by default, 1 = in this process), one block of
+    about `chunk_bytes` at a time. At most two blocks per worker are in flight and
+    totals are flushed to the store every DUMP_FLUSH_KEYS (ticker, day) pairs, so memory
+    stays bounded whatever the file size. `on_progress(bytes_read, file_size)` follows
+    the compressed input.
+
+    Returns {"lines", "bad_lines", "mentions", "skipped"}; a file already ingested (same
+    path, size and mtime) is skipped unless `force`. Ingesting a path again, forced, after
+    a change or after an interrupted run, replaces its earlier counts.
+    """
+    if source not in SOURCES + ("auto",):
+        raise ValueError(f"Unknown dump source: {source}")
+    path = Path(path)
+    history = history or SocialHistory()
+    if not force and history.ingested(path):
+        return {"lines": 0, "bad_lines": 0, "mentions": 0, "skipped": 1}
+
+    workers = workers or config.DUMP_WORKERS
+    chunk_bytes = chunk_bytes or config.DUMP_CHUNK_BYTES
+    size = path.stat().st_size
+    dump_id = history.begin(path)
+    totals: Dict[str, Aggregates] = {}
+    stats = {"lines": 0, "bad_lines": 0, "mentions": 0, "skipped": 0}
+    sources_seen: Set[str] = set()
+
+    def collect(result: Tuple[Dict[str, Aggregates], int, int]):
+        part, lines, bad = result
+        stats["lines"] += lines
+        stats["bad_lines"] += bad
+        merge(totals, part)
+        if sum(len(daily) for daily in totals.values()) >= config.DUMP_FLUSH_KEYS:
+            flush()
+
+    def flush():
+        for name, daily in totals.items():
+            stats["mentions"] += sum(counts[0] for counts in daily.values())
+            history.add(dump_id, name, daily)
+            sources_seen.add(name)
+        totals.clear()
+
+    stream, raw = open_dump(path)
+    try:
+        if workers <= 1:
+            init_worker(frozenset(tickers))
+            for chunk in iter_chunks(stream, chunk_bytes):
+                collect(aggregate_chunk(chunk, source))
+                if on_progress:
+                    on_progress(raw.tell(), size)
+        else:
+            with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(frozenset(tickers),)) as pool:
+                pending: Set[Future] = set()
+                for chunk in iter_chunks(stream, chunk_bytes):
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                    pending.add(pool.submit(aggregate_chunk, chunk, source))
+                    if on_progress:
+                        on_progress(raw.tell(), size)
+                for future in pending:
+                    collect(future.result())
+        flush()
+    finally:
+        stream.close()
+        raw.close()
+
+    recorded = source if source != "auto" else ",".join(sorted(sources_seen)) or "auto"
+    history.finish(dump_id, recorded, stats["lines"], stats["bad_lines"])
+    return stats
@@ -1,6 +1,7 @@
 import httpx
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
+from contrarian.data.resilience import SymbolNotFound
 
 class FinvizClient:
     BASE_URL = "https://finviz.com/quote.ashx"
@@ -16,33 +17,38 @@ class FinvizClient:
         Returns a dictionary of Key: Value strings.
         """
         try:
-            with httpx.Client(headers=self.headers, follow_redirects=True) as client:
-                response = client.get(self.BASE_URL, params={"t": ticker})
-                response.raise_for_status()
-                
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Finviz data is usually in a table with class 'snapshot-table2'
-            table = soup.find("table", class_="snapshot-table2")
-            if not table:
-                return {}
-            
-            data = {}
-            rows = table.find_all("tr")
-            for row in rows:
-                cols = row.find_all("td")
-                # Structure is Key | Value | Key | Value ...
-                for i in range(0, len(cols), 2):
-                    key = cols[i].text.strip()
-                    value = cols[i+1].text.strip()
-                    data[key] = value
-            
-            return data
-            
+            return self.fetch_data(ticker)
         except Exception as e:
             print(f"Error scraping Finviz for {ticker}: {e}")
             return {}
 
+    def fetch_data(self, ticker: str) -> Dict[str, str]:
+        """Like `get_data`, but raises (SymbolNotFound for tickers Finviz does not list)."""
+        with httpx.Client(headers=self.headers, follow_redirects=True) as client:
+            response = client.get(self.BASE_URL, params={"t": ticker})
+            if response.status_code == 404:
+                raise SymbolNotFound(f"Finviz does not list {ticker}")
+            response.raise_for_status()
+            
+        soup = BeautifulSoup(response.text, "html.parser")
+        
+        # Finviz data is usually in a table with class 'snapshot-table2'
+        table = soup.find("table", class_="snapshot-table2")
+        if not table:
+            return {}
+        
+        data = {}
+        rows = table.find_all("tr")
+        for row in rows:
+            cols = row.find_all("td")
+            # Structure is Key | Value | Key | Value ...
+            for i in range(0, len(cols), 2):
+                key = cols[i].text.strip()
+                value = cols[i+1].text.strip()
+                data[key] = value
+        
+        return data
+
     def parse_float(self, value_str: str) -> Optional[float]:
         if not value_str or value_str == "-":
             return None
@@ -56,3 +62,7 @@ class FinvizClient:
         data = self.get_data(ticker)
         # Key is usually 'Short Float'
         return self.parse_float(data.get("Short Float"))
+
+    def fetch_short_interest(self, ticker: str) -> Optional[float]:
+        """Like `get_short_interest`, but raises on failures (see `fetch_data`)."""
+        return self.parse_float(self.fetch_data(ticker).get("Short Float"))
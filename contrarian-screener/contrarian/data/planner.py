@@ -0,0 +1,106 @@
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Dict, FrozenSet, Iterable, Optional, Set
+from contrarian.models.stock import Financials, Sentiment
+
+ALL_SOURCES = ("yahoo", "finviz", "reddit", "stocktwits")
+
+# Which source can supply each output field. Yahoo builds the Stock itself, so it is
+# always fetched; Finviz is only a second opinion on short interest.
+FIELD_SOURCES: Dict[str, Set[str]] = {
+    "ticker": set(),
+    "price": {"yahoo"},
+    "company_name": {"yahoo"},
+    "sector": {"yahoo"},
+    "industry": {"yahoo"},
+    "fifty_two_week_high": {"yahoo"},
+    "fifty_two_week_low": {"yahoo"},
+}
+FIELD_SOURCES.update({f"financials.{f.name}": {"yahoo"} for f in dataclass_fields(Financials)})
+FIELD_SOURCES.update({f"sentiment.{f.name}": {"yahoo"} for f in dataclass_fields(Sentiment)})
+FIELD_SOURCES.update({
+    "sentiment.short_interest_pct": {"yahoo", "finviz"},
+    "sentiment.reddit_mentions": {"reddit"},
+    "sentiment.reddit_sentiment_score": {"reddit"},
+    "sentiment.stocktwits_bull_ratio": {"stocktwits"},
+    "sentiment.reddit_mentions_z": {"reddit"},
+    "sentiment.reddit_sentiment_z": {"reddit"},
+    "sentiment.stocktwits_bull_z": {"stocktwits"},
+})
+
+# Scores read every sentiment input
+SCORE_SOURCES = set(ALL_SOURCES)
+
+# Request filters -> the field they inspect ("scores" for anything score-based)
+FILTER_FIELDS = {
+    "min_score": "scores",
+    "min_short_interest": "sentiment.short_interest_pct",
+}
+
+@dataclass(frozen=True)
+class SourcePlan:
+    sources: FrozenSet[str]
+    needs_scores: bool
+
+    def uses(self, source: str) -> bool:
+        return source in self.sources
+
+FULL_PLAN = SourcePlan(frozenset(ALL_SOURCES), True)
+
+def expand_fields(fields: Iterable[str]) -> Set[str]:
+    """Expands group names ('financials', 'sentiment') into their dotted leaf fields."""
+    expanded = set()
+    for field in fields:
+        field = field.strip()
+        if not field:
+            continue
+        if field in ("financials", "sentiment"):
+            expanded.update(k for k in FIELD_SOURCES if k.startswith(field + "."))
+        elif field == "scores" or field.startswith("scores."):
+            expanded.add("scores")
+        elif field in FIELD_SOURCES:
+            expanded.add(field)
+        else:
+            raise ValueError(f"Unknown field: {field}")
+    return expanded
+
+def plan_sources(fields: Optional[Iterable[str]] = None, filters: Iterable[str] = ()) -> SourcePlan:
+    """
+    Minimal set of sources for the requested output fields plus the fields the active
+    filters read. No field list means the full payload (and therefore every source).
+    """
+    if fields is None:
+        return FULL_PLAN
+
+    wanted = expand_fields(fields)
+    wanted.update(FILTER_FIELDS[f] for f in filters)
+
+    sources = {"yahoo"}
+    needs_scores = "scores" in wanted
+    if needs_scores:
+        sources.update(SCORE_SOURCES)
+    for field in wanted - {"scores"}:
+        sources.update(FIELD_SOURCES[field])
+    return SourcePlan(frozenset(sources), needs_scores)
+
+def plan_from_sources(sources: Optional[Iterable[str]]) -> SourcePlan:
+    """Plan for an explicit source list (CLI --sources). Yahoo is always included."""
+    if sources is None:
+        return FULL_PLAN
+    chosen = {s.strip().lower() for s in sources if s.strip()}
+    unknown = chosen - set(ALL_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(sorted(unknown))}")
+    return SourcePlan(frozenset(chosen | {"yahoo"}), True)
+
+def project(payload: Dict, fields: Iterable[str]) -> Dict:
+    """Keeps only the requested fields of a serialized stock payload (ticker always stays)."""
+    wanted = expand_fields(fields)
+    out = {"ticker": payload["ticker"]}
+    for field in wanted:
+        if "." in field:
+            group, name = field.split(".", 1)
+            if payload.get(group) is not None:
+                out.setdefault(group, {})[name] = payload[group].get(name)
+        else:
+            out[field] = payload.get(field)
+    return out
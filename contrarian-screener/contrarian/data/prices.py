@@ -0,0 +1,158 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from contrarian.config import config
+from contrarian.data.resilience import source_symbol
+
+# One fixed-size record per trading day; a ticker's history is a flat file of these,
+# sorted by date, so it can be memory-mapped and appended to without rewriting.
+PRICE_DTYPE = np.dtype([
+    ("date", "M8[D]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("adj_close", "f8"),
+    ("volume", "f8"),
+])
+
+TRADING_DAYS_PER_YEAR = 252
+
+class PriceStore:
+    """
+    Daily OHLCV history per ticker under PRICES_DIR, as memory-mapped binary files.
+
+    Reads only touch the pages they need (a 52-week window is the file's tail), so
+    whole universes can be scanned without loading their histories into RAM. `update`
+    bulk-downloads from Yahoo and appends only the days after each ticker's last row.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or config.PRICES_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper()}.bin"
+
+    # --- Reading ---
+
+    def read(self, ticker: str, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Rows with start <= date <= end (ISO dates, both optional), as a read-only memmap view."""
+        path = self.path(ticker)
+        if not path.exists() or path.stat().st_size == 0:
+            return np.empty(0, dtype=PRICE_DTYPE)
+        rows = np.memmap(path, dtype=PRICE_DTYPE, mode="r")
+        dates = rows["date"]
+        lo = np.searchsorted(dates, np.datetime64(start, "D"), side="left") if start else 0
+        hi = np.searchsorted(dates, np.datetime64(end, "D"), side="right") if end else len(rows)
+        return rows[lo:hi]
+
+    def tail(self, ticker: str, days: int) -> np.ndarray:
+        """The last `days` trading days."""
+        rows = self.read(ticker)
+        return rows[-days:] if days else rows[:0]
+
+    def last_date(self, ticker: str) -> Optional[np.datetime64]:
+        rows = self.tail(ticker, 1)
+        return rows["date"][0] if len(rows) else None
+
+    # --- Writing ---
+
+    def append(self, ticker: str, rows: np.ndarray) -> int:
+        """Appends the rows dated after the stored history. Returns how many were written."""
+        rows = np.sort(rows.astype(PRICE_DTYPE), order="date")
+        last = self.last_date(ticker)
+        if last is not None:
+            rows = rows[rows["date"] > last]
+        if len(rows):
+            with open(self.path(ticker), "ab") as f:
+                f.write(rows.tobytes())
+        return len(rows)
+
+    def update(self, tickers: Iterable[str], years: Optional[int] = None, chunk_size: int = 50) -> Dict[str, int]:
+        """
+        Brings each ticker up to the last completed trading day. New tickers get `years`
+        of history (PRICE_HISTORY_YEARS by default); tickers sharing a last date are
+        downloaded together in chunks. Returns the number of rows appended per ticker.
+        """
+        years = years or config.PRICE_HISTORY_YEARS
+        today = np.datetime64("today", "D")
+        groups: Dict[np.datetime64, List[str]] = {}
+        for t in tickers:
+            last = self.last_date(t)
+            start = last + 1 if last is not None else today - years * 365
+            if np.busday_count(start, today) > 0:  # Some weekday is missing
+                groups.setdefault(start, []).append(t)
+
+        appended = {}
+        for start, group in groups.items():
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i:i + chunk_size]
+                symbols = {t: source_symbol(t, "yahoo") for t in chunk}
+                # `end` is exclusive: today's bar is still moving and must not be frozen in
+                frame = yf.download(
+                    list(symbols.values()), start=str(start), end=str(today),
+                    group_by="ticker", auto_adjust=False, progress=False, threads=True
+                )
+                for t, symbol in symbols.items():
+                    appended[t] = self.append(t, frame_to_rows(frame, symbol))
+        return appended
+
+    # --- Windowed reads ---
+
+    def window_stats(self, ticker: str, days: int = TRADING_DAYS_PER_YEAR) -> Optional[Dict]:
+        """High/low, distance from high, max drawdown and return over the last `days` trading days."""
+        rows = self.tail(ticker, days)
+        if not len(rows):
+            return None
+        close = np.asarray(rows["close"])
+        adj = np.asarray(rows["adj_close"])
+        high = float(rows["high"].max())
+        low = float(rows["low"].min())
+        peaks = np.maximum.accumulate(adj)
+        return {
+            "ticker": ticker.upper(),
+            "as_of": str(rows["date"][-1]),
+            "days": len(rows),
+            "close": float(close[-1]),
+            "high": high,
+            "low": low,
+            "percent_from_high": float((close[-1] - high) / high * 100) if high else None,
+            "max_drawdown": float((adj / peaks - 1).min() * 100),
+            "return": float((adj[-1] / adj[0] - 1) * 100) if adj[0] and len(rows) > 1 else None,
+        }
+
+    def universe_stats(self, tickers: Iterable[str], days: int = TRADING_DAYS_PER_YEAR) -> pd.DataFrame:
+        """`window_stats` for many tickers, one at a time (tickers without history are skipped)."""
+        stats = (self.window_stats(t, days) for t in tickers)
+        return pd.DataFrame([s for s in stats if s])
+
+    def forward_return(self, ticker: str, as_of: str, horizon_days: int) -> Optional[float]:
+        """
+        Percent change of the adjusted close from the first trading day on/after `as_of`
+        to `horizon_days` trading days later (None if the history does not reach that far).
+        """
+        rows = self.read(ticker, start=as_of)
+        if len(rows) <= horizon_days:
+            return None
+        base = rows["adj_close"][0]
+        return float((rows["adj_close"][horizon_days] / base - 1) * 100) if base else None
+
+def frame_to_rows(frame: pd.DataFrame, symbol: str) -> np.ndarray:
+    """One ticker's rows from a `yf.download` frame (grouped by ticker)."""
+    if isinstance(frame.columns, pd.MultiIndex):
+        if symbol not in frame.columns.get_level_values(0):
+            return np.empty(0, dtype=PRICE_DTYPE)
+        frame = frame[symbol]
+    frame = frame.dropna(subset=["Close"])
+    rows = np.empty(len(frame), dtype=PRICE_DTYPE)
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)  # Exchange-local dates, not UTC instants
+    rows["date"] = index.values.astype("M8[D]")
+    for field, column in (("open", "Open"), ("high", "High"), ("low", "Low"),
+                          ("close", "Close"), ("adj_close", "Adj Close"), ("volume", "Volume")):
+        rows[field] = frame[column].to_numpy(dtype="f8")
+    return rows
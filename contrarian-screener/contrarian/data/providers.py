@@ -0,0 +1,89 @@
+import importlib
+from abc import ABC, abstractmethod
+import threading
+from typing import Any, Dict, List, Protocol
+from contrarian.config import config
+from contrarian.data.finviz import FinvizClient
+from contrarian.data.reddit import RedditClient
+from contrarian.data.resilience import guarded
+from contrarian.data.stocktwits import StockTwitsClient
+from contrarian.data.yahoo import YahooFinanceClient
+
+class DataProvider(Protocol):
+    """
+    Supplies one source slot of the pipeline ("yahoo", "finviz", "reddit", "stocktwits",
+    named after the default provider, as in contrarian.data.planner) for many tickers at once.
+
+    `get_many` returns {ticker: value} for the tickers it has data for (missing tickers
+    are simply left out); values have the slot's shape:
+      yahoo      -> Stock (price, fundamentals, analyst counts, maybe short interest)
+      finviz     -> short interest in percent (float)
+      reddit     -> {"mentions", "sentiment_score", "sample_size"}
+      stocktwits -> {"bull_ratio", "message_vol", "labeled_count"}
+    `batch_size` is how many tickers one call should carry; the pipeline chunks by it.
+    """
+    source: str
+    batch_size: int
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Any]:
+        ...
+
+class PerTickerProvider(ABC):
+    """
+    A provider over a single-ticker client call. Each ticker goes through `guarded`
+    (symbol spelling, negative cache, circuit breaker); batches are one ticker so the
+    scheduler keeps the calls concurrent.
+    """
+    batch_size = 1
+
+    def __init__(self, source: str):
+        self.source = source
+
+    @abstractmethod
+    def fetch(self, symbol: str) -> Any:
+        """The source's value for one symbol (already in the source's spelling)."""
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Any]:
+        values = {}
+        for ticker in tickers:
+            value = guarded(self.source, ticker, self.fetch)
+            if value is not None:
+                values[ticker] = value
+        return values
+
+class YahooProvider(PerTickerProvider):
+    def fetch(self, symbol: str):
+        return YahooFinanceClient().fetch_stock(symbol)
+
+class FinvizProvider(PerTickerProvider):
+    def fetch(self, symbol: str):
+        return FinvizClient().fetch_short_interest(symbol)
+
+class RedditProvider(PerTickerProvider):
+    def fetch(self, symbol: str):
+        return RedditClient().fetch_sentiment(symbol)
+
+class StockTwitsProvider(PerTickerProvider):
+    def fetch(self, symbol: str):
+        return StockTwitsClient().fetch_sentiment(symbol)
+
+def load_provider(name: str, source: str) -> DataProvider:
+    """Instantiates a PROVIDER_REGISTRY entry ("module:Class") for a source slot."""
+    if name not in config.PROVIDER_REGISTRY:
+        raise ValueError(f"Unknown data provider: {name}")
+    module, _, cls = config.PROVIDER_REGISTRY[name].partition(":")
+    return getattr(importlib.import_module(module), cls)(source)
+
+_providers: Dict[str, DataProvider] = {}
+_providers_lock = threading.Lock()
+
+def get_provider(source: str) -> DataProvider:
+    """The configured provider for a source slot (DATA_PROVIDERS), created once."""
+    with _providers_lock:
+        if source not in _providers:
+            _providers[source] = load_provider(config.DATA_PROVIDERS[source], source)
+        return _providers[source]
+
+def batch_size(sources) -> int:
+    """Chunk size that suits every provider of the given slots."""
+    return min((get_provider(s).batch_size for s in sources), default=1)
@@ -1,36 +1,112 @@
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+import asyncio
+import queue
+import threading
+from contextlib import contextmanager
 import praw
+import requests
 from praw.models import Submission
 from collections import Counter
 from datetime import datetime, timedelta
 from contrarian.config import config
 
+# Sentiment lexicon: keyword hits in a post's lowercased text (substring counts, so
+# "calls" and "selling" count too). Shared with the historical dump ingester.
+BULLISH_KEYWORDS = ["call", "moon", "buy", "long", "bull", "gain", "rocket"]
+BEARISH_KEYWORDS = ["put", "drill", "sell", "short", "bear", "loss", "tank"]
+
+def keyword_hits(text: str) -> Tuple[int, int]:
+    """(bullish, bearish) keyword hits in `text`."""
+    text = text.lower()
+    return sum(text.count(w) for w in BULLISH_KEYWORDS), sum(text.count(w) for w in BEARISH_KEYWORDS)
+
+class RedditPool:
+    """
+    Process-wide pool of authenticated `praw.Reddit` sessions.
+
+    praw instances are not thread-safe, so each screening thread borrows one for the
+    duration of a search. Sessions are created lazily up to `size`, keep their OAuth
+    token between searches and share one HTTP connection pool.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: "queue.LifoQueue[praw.Reddit]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._http = requests.Session()
+        self._http.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=size))
+
+    def _create(self) -> praw.Reddit:
+        return praw.Reddit(
+            client_id=config.REDDIT_CLIENT_ID,
+            client_secret=config.REDDIT_CLIENT_SECRET,
+            user_agent="ContrarianScreener/1.0",
+            requestor_kwargs={"session": self._http}
+        )
+
+    @contextmanager
+    def session(self) -> Iterator[praw.Reddit]:
+        try:
+            reddit = self._idle.get_nowait()
+        except queue.Empty:
+            reddit = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    try:
+                        reddit = self._create()
+                    except Exception:
+                        self._created -= 1  # Free the slot, or failures would exhaust the pool
+                        raise
+            if reddit is None:
+                reddit = self._idle.get()  # Pool exhausted: wait for a session to come back
+        try:
+            yield reddit
+        finally:
+            self._idle.put(reddit)
+
+_pool: Optional[RedditPool] = None
+_pool_checked = False
+_pool_lock = threading.Lock()
+
+def get_pool() -> Optional[RedditPool]:
+    """The shared pool, or None (after a one-time warning) without Reddit credentials."""
+    global _pool, _pool_checked
+    with _pool_lock:
+        if not _pool_checked:
+            _pool_checked = True
+            if config.REDDIT_CLIENT_ID and config.REDDIT_CLIENT_SECRET:
+                _pool = RedditPool(config.REDDIT_POOL_SIZE)
+            else:
+                print("Warning: Reddit credentials not found. Reddit analysis disabled.")
+        return _pool
+
 class RedditClient:
+    """Cheap to construct: every client searches through the shared session pool."""
+
     def __init__(self):
-        if config.REDDIT_CLIENT_ID and config.REDDIT_CLIENT_SECRET:
-            self.reddit = praw.Reddit(
-                client_id=config.REDDIT_CLIENT_ID,
-                client_secret=config.REDDIT_CLIENT_SECRET,
-                user_agent="ContrarianScreener/1.0"
-            )
-            self.enabled = True
-        else:
-            print("Warning: Reddit credentials not found. Reddit analysis disabled.")
-            self.enabled = False
+        self.pool = get_pool()
+        self.enabled = self.pool is not None
 
     def get_sentiment(self, ticker: str, limit: int = 100) -> Dict[str, any]:
         """
         Analyzes recent posts in r/wallstreetbets and r/stocks for a given ticker.
         Returns mention count and simplified sentiment (based on keywords).
         """
+        try:
+            return self.fetch_sentiment(ticker, limit)
+        except Exception as e:
+            print(f"Error fetching Reddit data: {e}")
+            return {"mentions": 0, "sentiment_score": 0.5, "sample_size": 0}
+
+    def fetch_sentiment(self, ticker: str, limit: int = 100) -> Dict[str, any]:
+        """Like `get_sentiment`, but lets search errors propagate."""
         if not self.enabled:
             return {"mentions": 0, "sentiment_score": 0.5, "sample_size": 0}
 
         subreddits = ["wallstreetbets", "stocks", "investing"]
         mentions = 0
-        bullish_keywords = ["call", "moon", "buy", "long", "bull", "gain", "rocket"]
-        bearish_keywords = ["put", "drill", "sell", "short", "bear", "loss", "tank"]
-        
         bull_score = 0
         bear_score = 0
         
@@ -38,32 +114,29 @@ class RedditClient:
         # For common tickers like $AAPL, search "AAPL" or "$AAPL"
         query = f"{ticker} OR ${ticker}"
         
-        try:
+        with self.pool.session() as reddit:
             for sub_name in subreddits:
-                subreddit = self.reddit.subreddit(sub_name)
+                subreddit = reddit.subreddit(sub_name)
                 # Search last week
                 for submission in subreddit.search(query, sort="new", time_filter="week", limit=limit):
                     mentions += 1
-                    text = (submission.title + " " + submission.selftext).lower()
-                    
-                    bull_count = sum(text.count(w) for w in bullish_keywords)
-                    bear_count = sum(text.count(w) for w in bearish_keywords)
+                    bull_count, bear_count = keyword_hits(submission.title + " " + submission.selftext)
                     
                     bull_score += bull_count
                     bear_score += bear_count
+        
+        total_score = bull_score + bear_score
+        sentiment_ratio = 0.5 # Neutral default
+        
+        if total_score > 0:
+            sentiment_ratio = bull_score / total_score
             
-            total_score = bull_score + bear_score
-            sentiment_ratio = 0.5 # Neutral default
-            
-            if total_score > 0:
-                sentiment_ratio = bull_score / total_score
-                
-            return {
-                "mentions": mentions,
-                "sentiment_score": sentiment_ratio, # 0.0 (Bearish) to 1.0 (Bullish)
-                "sample_size": mentions
-            }
+        return {
+            "mentions": mentions,
+            "sentiment_score": sentiment_ratio, # 0.0 (Bearish) to 1.0 (Bullish)
+            "sample_size": mentions
+        }
 
-        except Exception as e:
-            print(f"Error fetching Reddit data: {e}")
-            return {"mentions": 0, "sentiment_score": 0.5, "sample_size": 0}
+    async def get_sentiment_async(self, ticker: str, limit: int = 100) -> Dict[str, any]:
+        """`get_sentiment` for async callers: runs the blocking praw search in a worker thread."""
+        return await asyncio.to_thread(self.get_sentiment, ticker, limit)
@@ -0,0 +1,179 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.data.scheduler import get_scheduler
+from contrarian.data.store import open_store
+
+T = TypeVar("T")
+
+class SymbolNotFound(Exception):
+    """The upstream does not know this symbol (as opposed to failing to answer)."""
+
+# --- Symbol normalization ---
+
+# Class-share separator each upstream expects: BRK.B on StockTwits is BRK-B on Yahoo/Finviz
+SYMBOL_SEPARATORS = {
+    "yahoo": "-",
+    "finviz": "-",
+    "stocktwits": ".",
+    "sec": "-",
+}
+CLASS_SHARE = re.compile(r"^([A-Z]+)[.\-/]([A-Z])$")
+
+def source_symbol(ticker: str, source: str) -> str:
+    """`ticker` as spelled by `source` (the universe spelling is kept everywhere else)."""
+    ticker = ticker.upper()
+    separator = SYMBOL_SEPARATORS.get(source)
+    match = CLASS_SHARE.match(ticker)
+    if separator and match:
+        return f"{match.group(1)}{separator}{match.group(2)}"
+    return ticker
+
+# --- Circuit breakers ---
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream after `failure_threshold` consecutive failures.
+
+    While open, calls are skipped (callers fall back to the other sources) until
+    `cooldown_seconds` have passed; then a single trial call is let through (half-open).
+    Success closes the breaker again, failure re-opens it for another cool-off.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown_seconds: float = 120):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.cooldown_seconds:
+            return "open"
+        return "half-open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.trial_running:
+                    print(f"Warning: {self.name} is failing, skipping it for {self.cooldown_seconds:.0f}s.")
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(source: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if source not in _breakers:
+            _breakers[source] = CircuitBreaker(
+                source,
+                failure_threshold=config.BREAKER_FAILURE_THRESHOLD,
+                cooldown_seconds=config.BREAKER_COOLDOWN_SECONDS
+            )
+        return _breakers[source]
+
+# --- Negative cache ---
+
+class NegativeCache:
+    """
+    (ticker, source) pairs the upstream could not resolve, remembered for
+    NEGATIVE_CACHE_TTL_HOURS in the local store so later screens (and later runs)
+    do not repeat requests that are bound to fail.
+    """
+
+    def __init__(self, db: Optional[Database] = None, ttl_hours: Optional[float] = None):
+        self.db = db or open_store()
+        self.ttl_seconds = (ttl_hours if ttl_hours is not None else config.NEGATIVE_CACHE_TTL_HOURS) * 3600
+        self._lock = threading.Lock()
+        if not self.db["unresolved_symbols"].exists():
+            self.db["unresolved_symbols"].create({
+                "ticker": str,
+                "source": str,
+                "reason": str,
+                "expires_at": float
+            }, pk=("ticker", "source"))
+        now = time.time()
+        self._entries: Dict[Tuple[str, str], float] = {
+            (row["ticker"], row["source"]): row["expires_at"]
+            for row in self.db["unresolved_symbols"].rows
+            if row["expires_at"] > now
+        }
+
+    def contains(self, ticker: str, source: str) -> bool:
+        expires_at = self._entries.get((ticker.upper(), source))
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, ticker: str, source: str, reason: str = ""):
+        row = {"ticker": ticker.upper(), "source": source, "reason": reason,
+               "expires_at": time.time() + self.ttl_seconds}
+        with self._lock:
+            self._entries[(row["ticker"], source)] = row["expires_at"]
+            self.db["unresolved_symbols"].upsert(row, pk=("ticker", "source"))
+
+_negative_cache: Optional[NegativeCache] = None
+_negative_cache_lock = threading.Lock()
+
+def get_negative_cache() -> NegativeCache:
+    global _negative_cache
+    with _negative_cache_lock:
+        if _negative_cache is None:
+            _negative_cache = NegativeCache()
+        return _negative_cache
+
+def guarded(source: str, ticker: str, call: Callable[[str], T], default: T = None) -> T:
+    """
+    Calls `call(symbol)` for one source, with the source's spelling of `ticker`.
+    Returns `default` without calling when the symbol is negatively cached for the source
+    or its breaker is open; failures count towards the breaker and also return `default`.
+    Latency and outcome of every real call feed the scheduler's concurrency limit.
+    """
+    negative = get_negative_cache()
+    if negative.contains(ticker, source):
+        return default
+    breaker = get_breaker(source)
+    if not breaker.allow():
+        return default
+    scheduler = get_scheduler()
+    start = time.monotonic()
+    try:
+        result = call(source_symbol(ticker, source))
+    except SymbolNotFound as e:
+        # The upstream answered, it just has nothing for this symbol
+        scheduler.observe(source, time.monotonic() - start, ok=True)
+        breaker.record_success()
+        negative.add(ticker, source, str(e))
+        return default
+    except Exception as e:
+        scheduler.observe(source, time.monotonic() - start, ok=False)
+        breaker.record_failure()
+        print(f"Error fetching {source} data for {ticker}: {e}")
+        return default
+    scheduler.observe(source, time.monotonic() - start, ok=True)
+    breaker.record_success()
+    return result
@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from contrarian.config import config
+
+Task = Tuple[Future, Callable, tuple]
+
+class Job:
+    """
+    A group of bulk tasks (one screen). Jobs share the bulk capacity round-robin, so a
+    second screen starts making progress right away instead of queueing behind the
+    whole first universe. `max_in_flight` optionally caps the job's own concurrency.
+    Leaving the `with` block cancels whatever has not started yet.
+    """
+
+    def __init__(self, scheduler: "WorkScheduler", max_in_flight: Optional[int] = None):
+        self.scheduler = scheduler
+        self.max_in_flight = max_in_flight
+        self.pending: Deque[Task] = deque()
+        self.running = 0
+
+    def submit(self, fn: Callable, *args) -> Future:
+        return self.scheduler._enqueue(self, fn, args)
+
+    def runnable(self) -> bool:
+        return bool(self.pending) and (not self.max_in_flight or self.running < self.max_in_flight)
+
+    def close(self):
+        self.scheduler._close(self)
+
+    def __enter__(self) -> "Job":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ConcurrencyLimit:
+    """
+    AIMD limit on in-flight tasks, driven by upstream calls (see `observe`).
+
+    Every SCHEDULER_WINDOW calls, the window's error rate and mean latency relative to
+    each source's baseline (its best window, drifting slowly towards the present) decide:
+    errors above SCHEDULER_MAX_ERROR_RATE or latency above SCHEDULER_LATENCY_TOLERANCE
+    times the baseline cut the limit by SCHEDULER_BACKOFF; otherwise it grows by one.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.value = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.baselines: Dict[str, float] = {}
+        self._window: Dict[str, List[float]] = {}
+        self._count = 0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, source: str, latency: float, ok: bool) -> Optional[int]:
+        """Records one upstream call; returns the new limit when the window closes."""
+        with self._lock:
+            self._count += 1
+            if ok:
+                self._window.setdefault(source, []).append(latency)
+            else:
+                self._errors += 1
+            if self._count < config.SCHEDULER_WINDOW:
+                return None
+
+            ratios = []
+            for name, latencies in self._window.items():
+                mean = sum(latencies) / len(latencies)
+                baseline = self.baselines.get(name, mean)
+                ratios.append(mean / baseline if baseline > 0 else 1.0)
+                # New bests reset the baseline; otherwise it drifts up, so a permanently
+                # slower upstream does not pin the limit at the minimum
+                self.baselines[name] = min(mean, baseline + config.SCHEDULER_BASELINE_DRIFT * (mean - baseline))
+            congested = (
+                self._errors / self._count > config.SCHEDULER_MAX_ERROR_RATE
+                or (ratios and sum(ratios) / len(ratios) > config.SCHEDULER_LATENCY_TOLERANCE)
+            )
+            if congested:
+                self.value = max(self.minimum, int(self.value * config.SCHEDULER_BACKOFF))
+            else:
+                self.value = min(self.maximum, self.value + 1)
+            self._window, self._count, self._errors = {}, 0, 0
+            return self.value
+
+class WorkScheduler:
+    """
+    Process-wide executor for upstream-bound work (fetching and scoring tickers).
+
+    Two priority classes: interactive tasks (`submit`/`run`, a user waiting on one
+    ticker) are taken first, bulk tasks (`job`, screens, snapshots, refreshes) from the
+    active jobs in turn. Bulk work runs at most `limit.value` tasks at once; interactive
+    tasks may go SCHEDULER_INTERACTIVE_RESERVE above that, so a lookup never waits for
+    a screen's tasks to finish. The limit adapts to how the upstreams respond (see
+    ConcurrencyLimit), so the API, the CLI and background refreshes share one budget
+    instead of each sizing its own pool.
+    """
+
+    def __init__(self, minimum: Optional[int] = None, maximum: Optional[int] = None, initial: Optional[int] = None):
+        minimum = minimum or config.SCHEDULER_MIN_CONCURRENCY
+        maximum = maximum or config.SCHEDULER_MAX_CONCURRENCY
+        initial = initial or config.SCHEDULER_INITIAL_CONCURRENCY
+        self.limit = ConcurrencyLimit(min(max(initial, minimum), maximum), minimum, maximum)
+        self.interactive: Deque[Task] = deque()
+        self.jobs: Deque[Job] = deque()  # Active bulk jobs, in round-robin order
+        self.running = 0
+        self._threads: List[threading.Thread] = []
+        self._cond = threading.Condition()
+
+    # --- Submitting ---
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Queues an interactive task."""
+        return self._enqueue(None, fn, args)
+
+    def run(self, fn: Callable, *args):
+        """Runs `fn(*args)` as an interactive task and waits for its result."""
+        return self.submit(fn, *args).result()
+
+    def job(self, max_in_flight: Optional[int] = None) -> Job:
+        """A new bulk job; submit its tasks with `job.submit`."""
+        return Job(self, max_in_flight)
+
+    def _enqueue(self, job: Optional[Job], fn: Callable, args: tuple) -> Future:
+        future = Future()
+        with self._cond:
+            if job is None:
+                self.interactive.append((future, fn, args))
+            else:
+                if not job.pending and job not in self.jobs:
+                    self.jobs.append(job)
+                job.pending.append((future, fn, args))
+            self._ensure_workers()
+            self._cond.notify()
+        return future
+
+    def _close(self, job: Job):
+        with self._cond:
+            while job.pending:
+                job.pending.popleft()[0].cancel()
+            if job in self.jobs:
+                self.jobs.remove(job)
+
+    # --- Adaptive concurrency ---
+
+    def observe(self, source: str, latency: float, ok: bool):
+        """Feeds one upstream call into the concurrency limit."""
+        if self.limit.observe(source, latency, ok) is not None:
+            with self._cond:
+                self._cond.notify_all()  # The limit may have grown
+
+    # --- Workers ---
+
+    def _ensure_workers(self):
+        # One thread per slot of the maximum; idle threads just wait on the condition
+        slots = self.limit.maximum + config.SCHEDULER_INTERACTIVE_RESERVE
+        if len(self._threads) < slots:
+            for i in range(len(self._threads), slots):
+                thread = threading.Thread(target=self._work, name=f"scheduler-{i}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def _next(self) -> Optional[Tuple[Optional[Job], Task]]:
+        if self.interactive and self.running < self.limit.value + config.SCHEDULER_INTERACTIVE_RESERVE:
+            return None, self.interactive.popleft()
+        if self.running >= self.limit.value:
+            return None
+        for _ in range(len(self.jobs)):
+            job = self.jobs[0]
+            self.jobs.rotate(-1)
+            if job.runnable():
+                task = job.pending.popleft()
+                if not job.pending:
+                    self.jobs.remove(job)
+                return job, task
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                picked = self._next()
+                while picked is None:
+                    self._cond.wait()
+                    picked = self._next()
+                job, (future, fn, args) = picked
+                self.running += 1
+                if job:
+                    job.running += 1
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._cond:
+                    self.running -= 1
+                    if job:
+                        job.running -= 1
+                        if job.pending and job not in self.jobs:
+                            self.jobs.append(job)  # Was held back by its own cap
+                    self._cond.notify_all()
+
+_scheduler: Optional[WorkScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> WorkScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WorkScheduler()
+        return _scheduler
@@ -0,0 +1,445 @@
+import re
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.data.prices import PriceStore, TRADING_DAYS_PER_YEAR
+from contrarian.data.providers import YahooProvider
+from contrarian.data.resilience import source_symbol
+from contrarian.data.store import open_store
+from contrarian.models.stock import Stock, Financials, Sentiment
+
+try:
+    from orjson import loads
+except ImportError:  # Optional speed-up (pip install contrarian-screener[fast])
+    from json import loads
+
+# companyfacts.zip holds one CIK##########.json per filer
+MEMBER_NAME = re.compile(r"CIK(\d{10})\.json$")
+
+# US-GAAP concepts per field, in order of preference. Filers switch tags over the years
+# (SalesRevenueNet until 2018, then RevenueFromContractWithCustomer...), so the concept
+# with the most recent period wins, not the first one present.
+REVENUE = ("Revenues", "RevenueFromContractWithCustomerExcludingAssessedTax",
+           "RevenueFromContractWithCustomerIncludingAssessedTax", "SalesRevenueNet")
+NET_INCOME = ("NetIncomeLoss", "ProfitLoss")
+OPERATING_CASH_FLOW = ("NetCashProvidedByUsedInOperatingActivities",
+                       "NetCashProvidedByUsedInOperatingActivitiesContinuingOperations")
+CAPEX = ("PaymentsToAcquirePropertyPlantAndEquipment", "PaymentsToAcquireProductiveAssets")
+EQUITY = ("StockholdersEquity", "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest")
+LONG_TERM_DEBT = ("LongTermDebt", "LongTermDebtAndCapitalLeaseObligations")
+SHORT_TERM_DEBT = ("ShortTermBorrowings", "CommercialPaper")
+
+# Stored per filer, besides cik/entity_name/period_end/filed/crc
+FIELDS = ("revenue", "revenue_growth", "net_income", "operating_cash_flow", "capex",
+          "total_debt", "equity", "shares")
+
+ANNUAL_DAYS = (350, 380)
+DATE_SLACK_DAYS = 7     # Fiscal periods end on "the last Saturday of..." and drift by days
+STALE_DAYS = 400        # Concepts not reported within this long of the latest period are dropped
+UPSERT_ROWS = 1000
+
+Periods = Dict[Tuple[date, date], float]
+
+class SecFundamentals:
+    """
+    Fundamentals per SEC filer in the local store, built from EDGAR's bulk companyfacts
+    archive (see `ingest_companyfacts`), plus the ticker -> CIK map to look them up.
+
+    One row per CIK holds the raw inputs of the Financials fields as of the latest
+    reported period: trailing-twelve-month revenue, net income, operating cash flow and
+    capex, year-over-year revenue growth, and the latest debt, equity and shares
+    outstanding. Ratios need a price, so they are computed when a Stock is built.
+    Each row keeps the CRC-32 of the archive member it came from; a newer archive only
+    re-parses the filers whose member changed.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store()
+        self._lock = threading.Lock()
+        if not self.db["sec_fundamentals"].exists():
+            self.db["sec_fundamentals"].create({
+                "cik": int,
+                "entity_name": str,
+                "period_end": str,  # ISO date of the latest reported period
+                "filed": str,
+                **{field: float for field in FIELDS},
+                "crc": int
+            }, pk="cik")
+        if not self.db["sec_tickers"].exists():
+            self.db["sec_tickers"].create({
+                "ticker": str,  # SEC spelling (BRK-B)
+                "cik": int,
+                "title": str
+            }, pk="ticker")
+            self.db["sec_tickers"].create_index(["cik"])
+
+    def upsert(self, rows: List[Dict]):
+        with self._lock:
+            self.db["sec_fundamentals"].upsert_all(rows, pk="cik")
+
+    def crcs(self) -> Dict[int, int]:
+        """{cik: CRC-32 of the member each stored row was parsed from}."""
+        with self._lock:
+            return {r["cik"]: r["crc"] for r in self.db.query("SELECT cik, crc FROM sec_fundamentals")}
+
+    def set_tickers(self, tickers: Dict[str, Tuple[int, str]]):
+        """Replaces the ticker map ({ticker: (cik, title)}) in one transaction."""
+        with self._lock, self.db.conn:
+            self.db.conn.execute("DELETE FROM sec_tickers")
+            self.db.conn.executemany(
+                "INSERT OR REPLACE INTO sec_tickers (ticker, cik, title) VALUES (?, ?, ?)",
+                [(ticker, cik, title) for ticker, (cik, title) in tickers.items()]
+            )
+
+    def lookup(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        """Stored fundamentals per ticker (universe spelling), for the tickers the SEC map knows."""
+        symbols = {source_symbol(t, "sec"): t for t in tickers}
+        found = {}
+        names = list(symbols)
+        for i in range(0, len(names), 500):
+            chunk = names[i:i + 500]
+            with self._lock:
+                rows = list(self.db.query(
+                    "SELECT t.ticker AS symbol, f.* FROM sec_tickers t JOIN sec_fundamentals f ON f.cik = t.cik "
+                    f"WHERE t.ticker IN ({', '.join('?' for _ in chunk)})", chunk
+                ))
+            for row in rows:
+                found[symbols[row.pop("symbol")]] = row
+        return found
+
+    def count(self) -> Dict[str, int]:
+        with self._lock:
+            return {"filers": self.db["sec_fundamentals"].count, "tickers": self.db["sec_tickers"].count}
+
+def load_ticker_map(path: Path) -> Dict[str, Tuple[int, str]]:
+    """
+    {ticker: (cik, title)} from SEC's company_tickers.json ({"0": {"cik_str", "ticker",
+    "title"}, ...}) or company_tickers_exchange.json ({"fields": [...], "data": [...]}).
+    """
+    data = loads(Path(path).read_bytes())
+    if "fields" in data:
+        fields = data["fields"]
+        entries = [dict(zip(fields, row)) for row in data["data"]]
+        entries = [{"cik_str": e["cik"], "ticker": e["ticker"], "title": e["name"]} for e in entries]
+    else:
+        entries = data.values()
+    return {e["ticker"].upper(): (int(e["cik_str"]), e.get("title")) for e in entries if e.get("ticker")}
+
+# --- Company facts (runs in the worker processes) ---
+
+def day(text: str) -> date:
+    return date.fromisoformat(text)
+
+def near(a: date, b: date) -> bool:
+    return abs((a - b).days) <= DATE_SLACK_DAYS
+
+def concept_entries(facts: Dict, concepts: Tuple[str, ...], unit: str) -> List[Dict]:
+    """Entries of the concept (among `concepts`) whose data reaches the most recent date."""
+    best, best_end = [], ""
+    for concept in concepts:
+        entries = ((facts.get(concept) or {}).get("units") or {}).get(unit) or []
+        end = max((e["end"] for e in entries if "end" in e), default="")
+        if end > best_end:
+            best, best_end = entries, end
+    return best
+
+def durations(facts: Dict, concepts: Tuple[str, ...], unit: str = "USD") -> Periods:
+    """{(start, end): value} of a flow concept; restated periods keep their latest filing."""
+    latest: Dict[Tuple[date, date], Tuple[str, float]] = {}
+    for e in concept_entries(facts, concepts, unit):
+        if "start" not in e or "val" not in e:
+            continue
+        key = (day(e["start"]), day(e["end"]))
+        filed = e.get("filed", "")
+        if key not in latest or filed >= latest[key][0]:
+            latest[key] = (filed, float(e["val"]))
+    return {key: value for key, (_, value) in latest.items() if (key[1] - key[0]).days <= ANNUAL_DAYS[1]}
+
+def find(periods: Periods, start: date, end: date) -> Optional[float]:
+    for (s, e), value in periods.items():
+        if near(s, start) and near(e, end):
+            return value
+    return None
+
+def trailing(periods: Periods) -> Optional[Tuple[float, date]]:
+    """
+    (trailing-twelve-month value, period end): the latest fiscal year, rolled forward by
+    the year-to-date period after it when the prior year's comparable period is reported
+    (TTM = FY + YTD - prior YTD). None without any annual figure.
+    """
+    annual = [(e, s) for s, e in periods if ANNUAL_DAYS[0] <= (e - s).days]
+    if not annual:
+        return None
+    fy_end, fy_start = max(annual)
+    value = periods[(fy_start, fy_end)]
+    end = max(e for _, e in periods)
+    if end > fy_end:
+        # Longest period ending last that starts right after the fiscal year
+        for s, e in sorted((k for k in periods if k[1] == end), key=lambda k: k[0]):
+            if not near(s, fy_end + timedelta(days=1)):
+                continue
+            prior = find(periods, s - timedelta(days=365), e - timedelta(days=365))
+            if prior is not None:
+                return value + periods[(s, e)] - prior, end
+    return value, fy_end
+
+def growth(periods: Periods) -> Optional[float]:
+    """Year-over-year change of the shortest latest period that has a prior-year comparable."""
+    if not periods:
+        return None
+    end = max(e for _, e in periods)
+    for s, e in sorted((k for k in periods if k[1] == end), key=lambda k: k[0], reverse=True):
+        prior = find(periods, s - timedelta(days=365), e - timedelta(days=365))
+        if prior:
+            return periods[(s, e)] / prior - 1 if prior > 0 else None
+    return None
+
+def instant(facts: Dict, concepts: Tuple[str, ...], unit: str = "USD") -> Optional[Tuple[float, date]]:
+    """(value, date) of a balance-sheet concept at its latest date, from the latest filing."""
+    entries = [e for e in concept_entries(facts, concepts, unit) if "val" in e and "start" not in e]
+    if not entries:
+        return None
+    latest = max(entries, key=lambda e: (e["end"], e.get("filed", "")))
+    return float(latest["val"]), day(latest["end"])
+
+def shares_outstanding(facts: Dict) -> Optional[Tuple[float, date]]:
+    """
+    Cover-page shares outstanding of the latest filing, summed over share classes
+    (Alphabet reports A, B and C as separate entries).
+    """
+    entries = [e for e in (facts.get("EntityCommonStockSharesOutstanding") or {}).get("units", {}).get("shares", [])
+               if "val" in e]
+    if not entries:
+        return None
+    end = max(e["end"] for e in entries)
+    latest = [e for e in entries if e["end"] == end]
+    filed = max(e.get("filed", "") for e in latest)
+    return float(sum(e["val"] for e in latest if e.get("filed", "") == filed)), day(end)
+
+def company_fundamentals(doc: Dict) -> Dict[str, Any]:
+    """The stored fields of one companyfacts document (None where a filer does not report them)."""
+    gaap = (doc.get("facts") or {}).get("us-gaap") or {}
+    dei = (doc.get("facts") or {}).get("dei") or {}
+    row: Dict[str, Any] = {"cik": int(doc["cik"]), "entity_name": doc.get("entityName"),
+                           **{field: None for field in FIELDS}}
+    flows = {
+        "revenue": durations(gaap, REVENUE),
+        "net_income": durations(gaap, NET_INCOME),
+        "operating_cash_flow": durations(gaap, OPERATING_CASH_FLOW),
+        "capex": durations(gaap, CAPEX),
+    }
+    values: Dict[str, Tuple[float, date]] = {}
+    for field, periods in flows.items():
+        ttm = trailing(periods)
+        if ttm:
+            values[field] = ttm
+    for field, concepts in (("equity", EQUITY), ("short_term_debt", SHORT_TERM_DEBT)):
+        latest = instant(gaap, concepts)
+        if latest:
+            values[field] = latest
+    # Long-term debt in total, or split into its current and noncurrent parts (whichever is newer)
+    debts = [instant(gaap, LONG_TERM_DEBT)]
+    parts = [p for p in (instant(gaap, (c,)) for c in ("LongTermDebtNoncurrent", "LongTermDebtCurrent")) if p]
+    if parts:
+        debts.append((sum(v for v, _ in parts), max(d for _, d in parts)))
+    debts = [debt for debt in debts if debt]
+    if debts:
+        values["long_term_debt"] = max(debts, key=lambda debt: debt[1])
+    shares = shares_outstanding(dei)
+    if shares:
+        values["shares"] = shares
+    if not values:
+        return row
+
+    # Tags a filer stopped using would otherwise report years-old figures as current
+    period_end = max([d for field, (_, d) in values.items() if field != "shares"] or [values["shares"][1]])
+    values = {f: (v, d) for f, (v, d) in values.items() if (period_end - d).days <= STALE_DAYS}
+    row["period_end"] = period_end.isoformat()
+    for field in ("revenue", "net_income", "operating_cash_flow", "capex", "equity", "shares"):
+        if field in values:
+            row[field] = values[field][0]
+    if "revenue" in values:
+        row["revenue_growth"] = growth(flows["revenue"])
+    if "long_term_debt" in values or "short_term_debt" in values:
+        row["total_debt"] = sum(values[f][0] for f in ("long_term_debt", "short_term_debt") if f in values)
+    row["filed"] = max((e["filed"] for concept in gaap.values() for entries in (concept.get("units") or {}).values()
+                        for e in entries if e.get("filed")), default=None)
+    return row
+
+_archive: Optional[zipfile.ZipFile] = None
+
+def init_worker(path: str):
+    global _archive
+    _archive = zipfile.ZipFile(path)
+
+def parse_members(members: List[Tuple[str, int]]) -> Tuple[List[Dict], int]:
+    """(rows, unreadable members) for a list of (member name, CRC-32) of the open archive."""
+    rows, bad = [], 0
+    for name, crc in members:
+        try:
+            row = company_fundamentals(loads(_archive.read(name)))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            bad += 1
+            continue
+        row["crc"] = crc
+        rows.append(row)
+    return rows, bad
+
+# --- Ingestion ---
+
+def ingest_companyfacts(
+    path: Path,
+    tickers_file: Optional[Path] = None,
+    workers: Optional[int] = None,
+    fundamentals: Optional[SecFundamentals] = None,
+    force: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, int]:
+    """
+    Loads EDGAR's bulk companyfacts.zip into the local store, with the ticker -> CIK map
+    from `tickers_file` (SEC_TICKERS_FILE by default; skipped if it does not exist).
+
+    The archive is read member by member straight from the zip, never extracted, and
+    only members whose CRC-32 differs from the stored one are parsed (all of them with
+    `force`), so loading each new nightly archive costs the filers that filed since.
+    Parsing runs on `workers` processes (SEC_WORKERS by default, 1 = in this process),
+    in batches of members; rows are written every UPSERT_ROWS filers.
+    `on_progress(done, total)` counts parsed members.
+
+    Returns {"members", "parsed", "unchanged", "bad", "tickers"}.
+    """
+    path = Path(path)
+    fundamentals = fundamentals or SecFundamentals()
+    workers = workers or config.SEC_WORKERS
+    tickers_file = Path(tickers_file or config.SEC_TICKERS_FILE)
+    stats = {"members": 0, "parsed": 0, "unchanged": 0, "bad": 0, "tickers": 0}
+    if tickers_file.exists():
+        ticker_map = load_ticker_map(tickers_file)
+        fundamentals.set_tickers(ticker_map)
+        stats["tickers"] = len(ticker_map)
+
+    stored = {} if force else fundamentals.crcs()
+    todo: List[Tuple[str, int]] = []
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            match = MEMBER_NAME.search(info.filename)
+            if not match:
+                continue
+            stats["members"] += 1
+            if stored.get(int(match.group(1))) == info.CRC:
+                stats["unchanged"] += 1
+            else:
+                todo.append((info.filename, info.CRC))
+
+    pending_rows: List[Dict] = []
+
+    def collect(result: Tuple[List[Dict], int]):
+        rows, bad = result
+        stats["parsed"] += len(rows)
+        stats["bad"] += bad
+        pending_rows.extend(rows)
+        if len(pending_rows) >= UPSERT_ROWS:
+            fundamentals.upsert(pending_rows)
+            pending_rows.clear()
+        if on_progress:
+            on_progress(stats["parsed"] + stats["bad"], len(todo))
+
+    # Large filers run to tens of MB each; small batches keep the pool evenly loaded
+    batches = [todo[i:i + 20] for i in range(0, len(todo), 20)]
+    if workers <= 1:
+        init_worker(str(path))
+        try:
+            for batch in batches:
+                collect(parse_members(batch))
+        finally:
+            _archive.close()
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(str(path),)) as pool:
+            pending: Set[Future] = set()
+            for batch in batches:
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+                pending.add(pool.submit(parse_members, batch))
+            for future in pending:
+                collect(future.result())
+    if pending_rows:
+        fundamentals.upsert(pending_rows)
+    return stats
+
+# --- Provider ---
+
+def build_stock(ticker: str, row: Dict, bars: np.ndarray) -> Optional[Stock]:
+    """
+    A Stock from stored SEC fundamentals and local daily bars (None without bars). Ratios
+    follow Yahoo's conventions: trailing P/E only for profits, debt/equity in percent.
+    """
+    if not len(bars):
+        return None
+    price = float(bars["close"][-1])
+    shares, equity, net_income = row["shares"], row["equity"], row["net_income"]
+    revenue, ocf = row["revenue"], row["operating_cash_flow"]
+    market_cap = price * shares if shares else None
+    return Stock(
+        ticker=ticker.upper(),
+        price=price,
+        company_name=row["entity_name"],
+        financials=Financials(
+            market_cap=int(market_cap) if market_cap else None,
+            pe_ratio=market_cap / net_income if market_cap and net_income and net_income > 0 else None,
+            pb_ratio=market_cap / equity if market_cap and equity and equity > 0 else None,
+            revenue_growth=row["revenue_growth"],
+            profit_margin=net_income / revenue if net_income is not None and revenue else None,
+            debt_to_equity=row["total_debt"] / equity * 100 if row["total_debt"] is not None and equity and equity > 0 else None,
+            # Filers without a capex line (banks, insurers) report operating cash flow only
+            free_cash_flow=int(ocf - (row["capex"] or 0)) if ocf is not None else None,
+        ),
+        sentiment=Sentiment(),
+        fifty_two_week_high=float(bars["high"].max()),
+        fifty_two_week_low=float(bars["low"].min()),
+    )
+
+class SecProvider:
+    """
+    The "yahoo" slot (see contrarian.data.providers) from local data only: fundamentals
+    ingested from SEC filings (`contrarian sec ingest`) and the last close and 52-week
+    range from the price store (`contrarian prices update`, one bulk download). A screen
+    makes no per-ticker requests for the tickers covered by both.
+
+    Filings carry no sector, industry or analyst ratings, so these stay empty (neutral
+    consensus). Tickers without SEC facts, with a last reported period older than
+    SEC_MAX_AGE_DAYS, or whose stored prices are missing or more than
+    SEC_MAX_PRICE_AGE_DAYS trading days old are fetched from Yahoo as before.
+    """
+    batch_size = 500
+
+    def __init__(self, source: str):
+        if source != "yahoo":
+            raise ValueError(f"SEC filings cannot fill the {source} slot")
+        self.source = source
+        self.fundamentals = SecFundamentals()
+        self.prices = PriceStore()
+        self.fallback = YahooProvider(source)
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Any]:
+        oldest = (date.today() - timedelta(days=config.SEC_MAX_AGE_DAYS)).isoformat()
+        today = np.datetime64("today", "D")
+        stocks = {}
+        for ticker, row in self.fundamentals.lookup(tickers).items():
+            if not row["period_end"] or row["period_end"] < oldest:
+                continue
+            bars = self.prices.tail(ticker, TRADING_DAYS_PER_YEAR)
+            # Stale bars would give stale prices, market caps and valuation ratios
+            if len(bars) and np.busday_count(bars["date"][-1], today) <= config.SEC_MAX_PRICE_AGE_DAYS:
+                stocks[ticker] = build_stock(ticker, row, bars)
+        missing = [t for t in tickers if t not in stocks]
+        if missing:
+            stocks.update(self.fallback.get_many(missing))
+        return stocks
@@ -0,0 +1,332 @@
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from sqlite_utils import Database
+from contrarian.data.store import open_store
+from contrarian.models.stock import Stock
+
+# Signals worth telling someone about
+ACTIONABLE_SIGNALS = ("Potential Long (Crowded Short)", "Potential Short (Crowded Long)")
+
+# Queryable snapshot_rows columns, extracted from the stored payload. Older stores get
+# them added (and backfilled from the JSON) on open.
+INDEXED_COLUMNS = {
+    "industry": ("$.stock.industry", str),
+    "market_cap": ("$.stock.financials.market_cap", float),
+    "pe_ratio": ("$.stock.financials.pe_ratio", float),
+    "short_interest": ("$.stock.sentiment.short_interest_pct", float),
+}
+
+SORT_FIELDS = (
+    "contrarian_score", "fundamental_score", "sentiment_score", "price", "market_cap",
+    "pe_ratio", "short_interest", "ticker", "sector", "industry", "signal"
+)
+
+class ResultQuery:
+    """
+    Filters and sort order for paging through a snapshot (see SnapshotStore.query).
+    `sort` is a comma list of SORT_FIELDS, `-` prefix for descending; ticker breaks ties.
+    `signal` matches by prefix, so "Potential Long" finds "Potential Long (Crowded Short)".
+    """
+
+    def __init__(
+        self,
+        sectors: Optional[List[str]] = None,
+        signal: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        min_short_interest: Optional[float] = None,
+        max_short_interest: Optional[float] = None,
+        min_pe: Optional[float] = None,
+        max_pe: Optional[float] = None,
+        sort: str = "-contrarian_score"
+    ):
+        self.sectors = sectors
+        self.signal = signal
+        self.ranges = [
+            ("contrarian_score", min_score, max_score),
+            ("short_interest", min_short_interest, max_short_interest),
+            ("pe_ratio", min_pe, max_pe),
+        ]
+        self.sort = sort
+        self.order = self.parse_sort(sort)
+
+    @staticmethod
+    def parse_sort(sort: str) -> List[Tuple[str, bool]]:
+        """"-short_interest,ticker" -> [("short_interest", True), ("ticker", False)]"""
+        order = []
+        for part in (p.strip() for p in sort.split(",") if p.strip()):
+            desc = part.startswith("-")
+            column = part.lstrip("-+")
+            if column not in SORT_FIELDS:
+                raise ValueError(f"Unknown sort field: {column}")
+            order.append((column, desc))
+        if not any(column == "ticker" for column, _ in order):
+            order.append(("ticker", False))
+        return order
+
+    def where(self) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if self.sectors:
+            clauses.append(f"sector IN ({', '.join('?' for _ in self.sectors)})")
+            params.extend(self.sectors)
+        if self.signal:
+            clauses.append("signal LIKE ? || '%'")
+            params.append(self.signal)
+        for column, lo, hi in self.ranges:
+            if lo is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(lo)
+            if hi is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(hi)
+        return clauses, params
+
+    def order_by(self) -> str:
+        # NULLs (e.g. no short interest reported) sort last in either direction
+        return ", ".join(
+            f"{column} IS NULL, {column} {'DESC' if desc else 'ASC'}" for column, desc in self.order
+        )
+
+    def after(self, values: List[Any]) -> Tuple[str, List[Any]]:
+        """
+        Keyset condition for rows strictly after `values` (the last row's sort keys) in
+        `order_by()` order: (k1 past v1) OR (k1 = v1 AND k2 past v2) OR ...
+        """
+        branches, params = [], []
+        equal, equal_params = [], []
+        for (column, desc), value in zip(self.order, values):
+            if value is not None:
+                # Past a value: further in the sort direction, or into the NULL tail
+                branches.append(" AND ".join(equal + [f"({column} {'<' if desc else '>'} ? OR {column} IS NULL)"]))
+                params.extend(equal_params + [value])
+                equal.append(f"{column} = ?")
+                equal_params.append(value)
+            else:
+                # Nothing is past NULL on this key; only ties continue to the next key
+                equal.append(f"{column} IS NULL")
+        return "(" + " OR ".join(branches or ["0"]) + ")", params
+
+def encode_cursor(snapshot_id: int, sort: str, values: List[Any]) -> str:
+    raw = json.dumps({"s": snapshot_id, "o": sort, "k": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    # Well-formed JSON can still be anything; the keys must be a list of SQL scalars
+    if not isinstance(state, dict) or not isinstance(state.get("k"), list) \
+            or not all(v is None or isinstance(v, (str, int, float)) for v in state["k"]):
+        raise ValueError("Invalid cursor")
+    return state
+
+class SnapshotStore:
+    """
+    Scored universe snapshots in the local store.
+
+    Every complete scan of a universe is saved as one snapshot; the score columns are kept
+    next to the JSON payload so comparisons between snapshots run as indexed SQL joins
+    instead of loading and re-scoring thousands of rows.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store()
+
+        if not self.db["snapshots"].exists():
+            self.db["snapshots"].create({
+                "id": int,
+                "universe": str,
+                "created_at": float,
+                "row_count": int
+            }, pk="id")
+            self.db["snapshots"].create_index(["universe", "created_at"])
+        if not self.db["snapshot_rows"].exists():
+            self.db["snapshot_rows"].create({
+                "snapshot_id": int,
+                "ticker": str,
+                "contrarian_score": float,
+                "fundamental_score": float,
+                "sentiment_score": float,
+                "signal": str,
+                "price": float,
+                "sector": str,
+                **{column: kind for column, (_, kind) in INDEXED_COLUMNS.items()},
+                "data": str  # JSON: {"ticker", "stock", "scores"}
+            }, pk=("snapshot_id", "ticker"))
+        else:
+            self._add_indexed_columns()
+        for columns in (
+            ["snapshot_id", "contrarian_score"],
+            ["snapshot_id", "sector", "contrarian_score"],
+            ["snapshot_id", "signal", "contrarian_score"],
+            ["snapshot_id", "short_interest"],
+            ["snapshot_id", "pe_ratio"],
+        ):
+            self.db["snapshot_rows"].create_index(columns, if_not_exists=True)
+        if not self.db["digests"].exists():
+            self.db["digests"].create({
+                "universe": str,
+                "snapshot_id": int,
+                "created_at": float
+            }, pk="universe")
+
+    def _add_indexed_columns(self):
+        existing = self.db["snapshot_rows"].columns_dict
+        for column, (path, kind) in INDEXED_COLUMNS.items():
+            if column not in existing:
+                self.db["snapshot_rows"].add_column(column, kind)
+                self.db.execute(f"UPDATE snapshot_rows SET {column} = json_extract(data, ?)", [path])
+        self.db.conn.commit()
+
+    # --- Writing ---
+
+    def save(self, universe: str, results: List[Dict]) -> int:
+        """Stores a complete scan of `universe` and returns the new snapshot id."""
+        snapshot_id = self.db["snapshots"].insert({
+            "universe": universe,
+            "created_at": time.time(),
+            "row_count": len(results)
+        }).last_pk
+        self.db["snapshot_rows"].insert_all(
+            (self._row(snapshot_id, r) for r in results), batch_size=500
+        )
+        return snapshot_id
+
+    @staticmethod
+    def _row(snapshot_id: int, data: Dict) -> Dict:
+        stock = data["stock"]
+        scores = data["scores"]
+        return {
+            "snapshot_id": snapshot_id,
+            "ticker": stock.ticker,
+            "contrarian_score": scores["contrarian_score"],
+            "fundamental_score": scores["fundamental_score"],
+            "sentiment_score": scores["sentiment_score"],
+            "signal": scores["signal"],
+            "price": stock.price,
+            "sector": stock.sector,
+            "industry": stock.industry,
+            "market_cap": stock.financials.market_cap if stock.financials else None,
+            "pe_ratio": stock.financials.pe_ratio if stock.financials else None,
+            "short_interest": stock.sentiment.short_interest_pct if stock.sentiment else None,
+            "data": json.dumps({"ticker": data["ticker"], "stock": stock.to_dict(), "scores": scores})
+        }
+
+    # --- Reading ---
+
+    def latest(self, universe: str) -> Optional[Dict]:
+        rows = list(self.db.query(
+            "SELECT * FROM snapshots WHERE universe = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            [universe]
+        ))
+        return rows[0] if rows else None
+
+    def load_results(self, snapshot_id: int) -> List[Dict]:
+        """Snapshot rows in `fetch_and_score` shape, highest score first."""
+        return [self._result(snapshot_id, row) for row in self.db.query(
+            "SELECT data FROM snapshot_rows WHERE snapshot_id = ? ORDER BY contrarian_score DESC",
+            [snapshot_id]
+        )]
+
+    def load_tickers(self, snapshot_id: int, tickers: List[str]) -> List[Dict]:
+        """The rows of `tickers` in that order (tickers not in the snapshot are left out)."""
+        if not tickers:
+            return []
+        rows = {row["ticker"]: row for row in self.db.query(
+            f"SELECT ticker, data FROM snapshot_rows WHERE snapshot_id = ? "
+            f"AND ticker IN ({', '.join('?' for _ in tickers)})",
+            [snapshot_id] + list(tickers)
+        )}
+        return [self._result(snapshot_id, rows[t]) for t in tickers if t in rows]
+
+    @staticmethod
+    def _result(snapshot_id: int, row: Dict) -> Dict:
+        data = json.loads(row["data"])
+        data["stock"] = Stock.from_dict(data["stock"])
+        # Stored rows never change, so the snapshot identifies the payload version
+        data["version"] = f"snapshot:{snapshot_id}"
+        return data
+
+    def query(self, snapshot_id: int, query: ResultQuery, limit: int = 50,
+              cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of a snapshot, filtered and sorted in SQL, with keyset pagination: the
+        opaque cursor holds the last row's sort keys, so every page is an index range scan
+        no matter how deep. Returns (results, next_cursor); next_cursor is None at the end.
+        """
+        clauses, params = query.where()
+        if cursor:
+            state = decode_cursor(cursor)
+            if state.get("s") != snapshot_id or state.get("o") != query.sort:
+                raise ValueError("Cursor belongs to a different snapshot or sort order")
+            if len(state["k"]) != len(query.order):
+                raise ValueError("Invalid cursor")
+            condition, after_params = query.after(state["k"])
+            clauses.append(condition)
+            params.extend(after_params)
+
+        columns = [column for column, _ in query.order]
+        rows = list(self.db.query(
+            f"SELECT {', '.join(columns)}, data FROM snapshot_rows "
+            f"WHERE {' AND '.join(['snapshot_id = ?'] + clauses)} "
+            f"ORDER BY {query.order_by()} LIMIT ?",
+            [snapshot_id] + params + [limit + 1]
+        ))
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(snapshot_id, query.sort, [rows[-1][c] for c in columns])
+        return [self._result(snapshot_id, row) for row in rows], next_cursor
+
+    # --- Digests ---
+
+    def last_digested(self, universe: str) -> Optional[int]:
+        rows = list(self.db.query("SELECT snapshot_id FROM digests WHERE universe = ?", [universe]))
+        return rows[0]["snapshot_id"] if rows else None
+
+    def mark_digested(self, universe: str, snapshot_id: int):
+        self.db["digests"].upsert({
+            "universe": universe,
+            "snapshot_id": snapshot_id,
+            "created_at": time.time()
+        }, pk="universe")
+
+    def diff(self, old_id: Optional[int], new_id: int, top_moves: int = 10) -> Dict[str, List[Dict]]:
+        """
+        What changed between two snapshots:
+        - new_signals: actionable now, not actionable (or not present) before
+        - flipped: actionable before and a different signal now
+        - movers: largest absolute score changes among tickers present in both
+        """
+        placeholders = ", ".join("?" for _ in ACTIONABLE_SIGNALS)
+        joined = (
+            "SELECT n.ticker, n.signal, n.contrarian_score, n.price, n.sector, "
+            "o.signal AS old_signal, o.contrarian_score AS old_score "
+            "FROM snapshot_rows n LEFT JOIN snapshot_rows o "
+            "ON o.snapshot_id = ? AND o.ticker = n.ticker "
+            "WHERE n.snapshot_id = ?"
+        )
+        params = [old_id if old_id is not None else -1, new_id]
+
+        new_signals = list(self.db.query(
+            f"{joined} AND n.signal IN ({placeholders}) "
+            f"AND (o.signal IS NULL OR o.signal NOT IN ({placeholders})) "
+            "ORDER BY n.contrarian_score DESC",
+            params + list(ACTIONABLE_SIGNALS) * 2
+        ))
+        flipped = list(self.db.query(
+            f"{joined} AND o.signal IN ({placeholders}) AND n.signal != o.signal "
+            "ORDER BY n.contrarian_score DESC",
+            params + list(ACTIONABLE_SIGNALS)
+        ))
+        movers = list(self.db.query(
+            f"{joined} AND o.ticker IS NOT NULL AND n.contrarian_score != o.contrarian_score "
+            "ORDER BY ABS(n.contrarian_score - o.contrarian_score) DESC LIMIT ?",
+            params + [top_moves]
+        ))
+        return {"new_signals": new_signals, "flipped": flipped, "movers": movers}
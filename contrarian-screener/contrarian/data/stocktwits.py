@@ -1,51 +1,197 @@
 import httpx
-from typing import Dict, Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from sqlite_utils import Database
+from contrarian.config import config
+from contrarian.data.resilience import SymbolNotFound
+from contrarian.data.store import open_store
+
+BUCKET_SECONDS = 3600
+
+class StockTwitsHistory:
+    """
+    Per-ticker StockTwits state in the local store: the newest message id seen (the
+    cursor for the next `since=` request) and labeled bull/bear counts in hourly buckets,
+    rolled up into the STOCKTWITS_WINDOWS on read. Buckets older than the longest window
+    are dropped as new ones are written.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        self.db = db or open_store()
+        self._lock = threading.Lock()
+        if not self.db["stocktwits_cursors"].exists():
+            self.db["stocktwits_cursors"].create({
+                "ticker": str,
+                "last_id": int,
+                "updated_at": float
+            }, pk="ticker")
+        if not self.db["stocktwits_buckets"].exists():
+            self.db["stocktwits_buckets"].create({
+                "ticker": str,
+                "bucket": int,  # Epoch seconds, start of the hour
+                "messages": int,
+                "bulls": int,
+                "bears": int
+            }, pk=("ticker", "bucket"))
+
+    def cursor(self, ticker: str) -> Optional[int]:
+        # Reads share the connection with `record`'s transaction, so they take the lock too
+        with self._lock:
+            rows = list(self.db.query("SELECT last_id FROM stocktwits_cursors WHERE ticker = ?", [ticker]))
+        return rows[0]["last_id"] if rows else None
+
+    def record(self, ticker: str, messages: List[Dict]):
+        """
+        Adds newly fetched messages to their hourly buckets and advances the cursor.
+        Messages at or below the stored cursor are skipped: concurrent refreshes of a
+        ticker fetch from the same cursor, and only the first to record counts them.
+        """
+        horizon = time.time() - max(config.STOCKTWITS_WINDOWS.values()) * 3600
+        with self._lock, self.db.conn:
+            rows = self.db.execute("SELECT last_id FROM stocktwits_cursors WHERE ticker = ?", [ticker]).fetchall()
+            since = rows[0][0] if rows else None
+            messages = list({m["id"]: m for m in messages if since is None or m["id"] > since}.values())
+            self._add(ticker, messages, horizon)
+
+    def _add(self, ticker: str, messages: List[Dict], horizon: float):
+        """Writes `messages` into the buckets (caller holds the lock and the transaction)."""
+        buckets: Dict[int, Dict[str, int]] = {}
+        for msg in messages:
+            bucket = int(parse_time(msg["created_at"]) // BUCKET_SECONDS * BUCKET_SECONDS)
+            counts = buckets.setdefault(bucket, {"messages": 0, "bulls": 0, "bears": 0})
+            counts["messages"] += 1
+            basic = ((msg.get("entities") or {}).get("sentiment") or {}).get("basic")
+            if basic == "Bullish":
+                counts["bulls"] += 1
+            elif basic == "Bearish":
+                counts["bears"] += 1
+
+        for bucket, counts in buckets.items():
+            self.db.execute(
+                "INSERT INTO stocktwits_buckets (ticker, bucket, messages, bulls, bears) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (ticker, bucket) DO UPDATE SET "
+                "messages = messages + excluded.messages, bulls = bulls + excluded.bulls, "
+                "bears = bears + excluded.bears",
+                [ticker, bucket, counts["messages"], counts["bulls"], counts["bears"]]
+            )
+        self.db.execute("DELETE FROM stocktwits_buckets WHERE ticker = ? AND bucket < ?", [ticker, horizon])
+        if messages:
+            self.db.execute(
+                "INSERT INTO stocktwits_cursors (ticker, last_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (ticker) DO UPDATE SET last_id = MAX(last_id, excluded.last_id), "
+                "updated_at = excluded.updated_at",
+                [ticker, max(m["id"] for m in messages), time.time()]
+            )
+
+    def windows(self, ticker: str) -> Dict[str, Dict[str, int]]:
+        """
+        {"1h": {"messages", "bulls", "bears"}, "24h": ..., "7d": ...} ending now: each window
+        is the current bucket and the whole buckets before it, hours * 3600 / BUCKET_SECONDS
+        buckets in all, so it never reaches further back than its length.
+        """
+        current = int(time.time() // BUCKET_SECONDS * BUCKET_SECONDS)
+        sums = ", ".join(
+            f"SUM(CASE WHEN bucket > {current - hours * 3600} THEN {col} ELSE 0 END)"
+            for hours in config.STOCKTWITS_WINDOWS.values() for col in ("messages", "bulls", "bears")
+        )
+        with self._lock:
+            row = self.db.execute(f"SELECT {sums} FROM stocktwits_buckets WHERE ticker = ?", [ticker]).fetchone()
+        values = iter(row)
+        return {
+            name: {col: next(values) or 0 for col in ("messages", "bulls", "bears")}
+            for name in config.STOCKTWITS_WINDOWS
+        }
+
+def parse_time(created_at: str) -> float:
+    return datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+
+_history: Optional[StockTwitsHistory] = None
+_history_lock = threading.Lock()
+
+def get_history() -> StockTwitsHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = StockTwitsHistory()
+        return _history
 
 class StockTwitsClient:
     BASE_URL = "https://api.stocktwits.com/api/2/streams/symbol/{}.json"
-    
+
+    def __init__(self, history: Optional[StockTwitsHistory] = None):
+        self.history = history or get_history()
+
     def get_sentiment(self, ticker: str) -> Dict[str, any]:
         """
         Fetches basic sentiment data from StockTwits public API.
-        Note: The public stream API mainly gives messages. 
+        Note: The public stream API mainly gives messages.
         Detailed sentiment (Bull/Bear ratio) is often inferred or requires premium access/scraping.
-        For this MVP, we will infer sentiment from the 'sentiment' field in recent messages if available.
+        We infer sentiment from the 'sentiment' field of messages, accumulated over time
+        in the local store (see `fetch_sentiment`).
         """
-        url = self.BASE_URL.format(ticker)
         try:
-            with httpx.Client() as client:
-                response = client.get(url)
-                if response.status_code == 404:
-                    return {"bull_ratio": 0.5, "message_vol": 0}
-                response.raise_for_status()
-                data = response.json()
-                
-            messages = data.get("messages", [])
-            bulls = 0
-            bears = 0
-            
-            for msg in messages:
-                entities = msg.get("entities", {})
-                sentiment = entities.get("sentiment", {})
-                if sentiment:
-                    basic = sentiment.get("basic")
-                    if basic == "Bullish":
-                        bulls += 1
-                    elif basic == "Bearish":
-                        bears += 1
-            
-            total = bulls + bears
-            ratio = 0.5 # Neutral
-            if total > 0:
-                ratio = bulls / total
-                
-            return {
-                "bull_ratio": ratio, # 0.0 to 1.0
-                "message_vol": len(messages),
-                "labeled_count": total
-            }
-            
+            return self.fetch_sentiment(ticker)
         except Exception as e:
             # Silent fail for now as rate limits are strict
-            # print(f"Error fetching StockTwits: {e}") 
+            # print(f"Error fetching StockTwits: {e}")
             return {"bull_ratio": 0.5, "message_vol": 0}
+
+    def fetch_sentiment(self, ticker: str) -> Dict[str, any]:
+        """
+        Like `get_sentiment`, but raises (SymbolNotFound for unknown symbols).
+
+        Only messages newer than the stored cursor are requested; they are added to the
+        rolling windows and the ratio comes from the shortest window (1h, 24h, 7d) with
+        at least STOCKTWITS_MIN_LABELED labeled messages, falling back to the longest.
+        """
+        self.history.record(ticker, self.fetch_new_messages(ticker))
+        windows = self.history.windows(ticker)
+
+        chosen = None
+        for counts in windows.values():
+            chosen = counts
+            if counts["bulls"] + counts["bears"] >= config.STOCKTWITS_MIN_LABELED:
+                break
+        total = chosen["bulls"] + chosen["bears"]
+        ratio = 0.5 # Neutral
+        if total > 0:
+            ratio = chosen["bulls"] / total
+
+        return {
+            "bull_ratio": ratio, # 0.0 to 1.0
+            "message_vol": windows.get("24h", chosen)["messages"],
+            "labeled_count": total,
+            "windows": windows
+        }
+
+    def fetch_new_messages(self, ticker: str) -> List[Dict]:
+        """
+        Messages newer than the ticker's cursor (or from the last window on first sight),
+        newest page first, paging back with `max=` up to STOCKTWITS_MAX_PAGES requests.
+        """
+        since = self.history.cursor(ticker)
+        horizon = time.time() - max(config.STOCKTWITS_WINDOWS.values()) * 3600
+        url = self.BASE_URL.format(ticker)
+        messages: List[Dict] = []
+        params: Dict[str, int] = {"since": since} if since else {}
+
+        with httpx.Client() as client:
+            for _ in range(config.STOCKTWITS_MAX_PAGES):
+                response = client.get(url, params=params)
+                if response.status_code == 404:
+                    raise SymbolNotFound(f"StockTwits has no stream for {ticker}")
+                response.raise_for_status()
+                data = response.json()
+
+                page = [m for m in data.get("messages", [])
+                        if (since is None or m["id"] > since) and parse_time(m["created_at"]) >= horizon]
+                messages.extend(page)
+                more = (data.get("cursor") or {}).get("more")
+                if not page or not more or len(page) < len(data.get("messages", [])):
+                    break  # Caught up with the cursor / the window, or no older pages
+                params = {"max": min(m["id"] for m in page) - 1}
+                if since:
+                    params["since"] = since
+        return messages
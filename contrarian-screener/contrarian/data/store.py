@@ -0,0 +1,15 @@
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from sqlite_utils import Database
+from contrarian.config import config
+
+def open_store(path: Optional[Path] = None) -> Database:
+    """
+    Opens the local store (STORE_FILE by default). The connection may be used from the
+    screening thread pools, so callers serialize their own writes.
+    """
+    conn = sqlite3.connect(str(path or config.STORE_FILE), timeout=30, check_same_thread=False)
+    db = Database(conn)
+    db.enable_wal()
+    return db
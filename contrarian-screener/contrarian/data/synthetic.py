@@ -0,0 +1,162 @@
+import hashlib
+from typing import Any, Dict, List, Optional
+import numpy as np
+from contrarian.config import config
+from contrarian.models.stock import Stock, Financials, Sentiment
+
+SECTORS = [
+    "Technology", "Healthcare", "Financial Services", "Consumer Cyclical", "Industrials",
+    "Communication Services", "Consumer Defensive", "Energy", "Real Estate", "Basic Materials", "Utilities",
+]
+SECTOR_WEIGHTS = np.array([18, 14, 14, 11, 11, 6, 6, 5, 6, 5, 4], dtype=float)
+INDUSTRIES_PER_SECTOR = 8
+
+MAX_TICKERS = 26 ** 4
+_MASK = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def synthetic_tickers(count: int) -> List[str]:
+    """
+    `count` distinct four-letter symbols, always the same ones in the same order (an
+    affine permutation of AAAA..ZZZZ, so neighbours do not look alike).
+    """
+    if count > MAX_TICKERS:
+        raise ValueError(f"At most {MAX_TICKERS} synthetic tickers")
+    codes = (np.arange(count, dtype=np.int64) * 7919 + 104729) % MAX_TICKERS
+    letters = np.stack([(codes // 26 ** k) % 26 for k in (3, 2, 1, 0)], axis=1) + ord("A")
+    return [bytes(row).decode() for row in letters.astype(np.uint8)]
+
+def ticker_keys(tickers: List[str], seed: int) -> np.ndarray:
+    """A 64-bit key per ticker; every generated value is a pure function of it."""
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{seed}:{t}".encode(), digest_size=8).digest(), "little")
+        for t in tickers
+    ], dtype=np.uint64)
+
+def uniforms(keys: np.ndarray, stream: int) -> np.ndarray:
+    """Uniform [0, 1) draws, one per key, independent per `stream` (splitmix64)."""
+    with np.errstate(over="ignore"):
+        z = (keys + np.uint64(stream) * np.uint64(0x9E3779B97F4A7C15)) & _MASK
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+def normals(keys: np.ndarray, stream: int) -> np.ndarray:
+    """Standard normal draws (Box-Muller over two uniform streams)."""
+    u1 = np.maximum(uniforms(keys, 2 * stream), 1e-12)
+    u2 = uniforms(keys, 2 * stream + 1)
+    return np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+
+class SyntheticProvider:
+    """
+    Deterministic, offline data for any ticker, in every source slot (see
+    contrarian.data.providers), for exercising screening, scoring, storage and the API
+    at full scale without touching the network.
+
+    Each value is derived from a hash of (SYNTHETIC_SEED, ticker) alone, so a ticker gets
+    the same data in every batch, process and run. Distributions are shaped after real
+    listings: log-normal prices and market caps, sector-dependent valuations and
+    leverage, heavy-tailed short interest and social activity concentrated in large
+    caps and heavily shorted names. Generation is vectorized per batch.
+    """
+    batch_size = 1000
+
+    def __init__(self, source: str, seed: Optional[int] = None):
+        self.source = source
+        self.seed = config.SYNTHETIC_SEED if seed is None else seed
+
+    def get_many(self, tickers: List[str]) -> Dict[str, Any]:
+        if not tickers:
+            return {}
+        fields = self.generate([t.upper() for t in tickers])
+        if self.source == "yahoo":
+            return dict(zip(tickers, self.stocks(tickers, fields)))
+        if self.source == "finviz":
+            return dict(zip(tickers, fields["short_interest"].tolist()))
+        if self.source == "reddit":
+            return {t: {"mentions": int(m), "sentiment_score": float(s), "sample_size": int(m)}
+                    for t, m, s in zip(tickers, fields["reddit_mentions"], fields["reddit_sentiment"])}
+        if self.source == "stocktwits":
+            return {t: {"bull_ratio": float(b), "message_vol": int(v), "labeled_count": int(n)}
+                    for t, b, v, n in zip(tickers, fields["bull_ratio"], fields["message_vol"], fields["labeled"])}
+        raise ValueError(f"No synthetic data for source {self.source}")
+
+    def generate(self, tickers: List[str]) -> Dict[str, np.ndarray]:
+        """Every synthetic field for a batch, as arrays aligned with `tickers`."""
+        k = ticker_keys(tickers, self.seed)
+        sector = np.searchsorted(np.cumsum(SECTOR_WEIGHTS) / SECTOR_WEIGHTS.sum(), uniforms(k, 1), side="right")
+        sector = np.minimum(sector, len(SECTORS) - 1)
+        industry = (uniforms(k, 2) * INDUSTRIES_PER_SECTOR).astype(int)
+        # Sector traits: growth sectors trade richer, utilities/real estate carry more debt
+        rich = np.isin(sector, [0, 1, 5]).astype(float)
+        levered = np.isin(sector, [8, 10, 2]).astype(float)
+
+        market_cap = np.exp(np.log(2e9) + 1.8 * normals(k, 3))
+        size = (np.log(market_cap) - np.log(2e9)) / 1.8  # ~ standard normal
+        price = np.exp(np.log(40) + 0.9 * normals(k, 4))
+        drawdown = np.abs(normals(k, 5)) * 0.25
+        high = price * np.exp(drawdown)
+        low = price * np.exp(-np.abs(normals(k, 6)) * 0.2)
+
+        profit_margin = 0.08 + 0.05 * rich + 0.12 * normals(k, 7)
+        pe = np.exp(np.log(16) + 0.4 * rich + 0.5 * normals(k, 8))
+        pe = np.where(profit_margin > 0, pe, np.nan)  # Losses: no trailing P/E
+        pb = np.exp(np.log(2.5) + 0.6 * rich + 0.7 * normals(k, 9))
+        revenue_growth = 0.06 + 0.06 * rich + 0.15 * normals(k, 10)
+        debt_to_equity = np.exp(np.log(60) + 0.8 * levered + 0.8 * normals(k, 11))
+        free_cash_flow = market_cap * (0.03 + 0.05 * normals(k, 12))
+
+        # Analyst consensus as Yahoo reports it (one recommendation key)
+        rec = uniforms(k, 13) + 0.1 * np.tanh(size)
+        analyst = np.select([rec > 0.55, rec > 0.2, rec > 0.08], [0, 1, 2], 3)  # buy / hold / sell / none
+
+        short_interest = np.minimum(np.exp(np.log(3) + 0.9 * normals(k, 14) - 0.2 * size), 60)
+        yahoo_has_short = uniforms(k, 15) < 0.6
+        crowd = np.exp(0.8 * size + 0.04 * short_interest + normals(k, 16))  # Attention
+        reddit_mentions = np.minimum(np.floor(crowd * (uniforms(k, 17) < 0.7)), 300)
+        reddit_sentiment = np.clip(0.5 + 0.18 * normals(k, 18), 0, 1)
+        bull_ratio = np.clip(0.55 + 0.15 * normals(k, 19), 0, 1)
+        message_vol = np.floor(crowd * 5)
+        labeled = np.floor(message_vol * 0.4)
+
+        return {
+            "sector": sector, "industry": industry, "market_cap": market_cap, "price": price,
+            "high": high, "low": low, "profit_margin": profit_margin, "pe": pe, "pb": pb,
+            "revenue_growth": revenue_growth, "debt_to_equity": debt_to_equity,
+            "free_cash_flow": free_cash_flow, "analyst": analyst,
+            "short_interest": short_interest, "yahoo_has_short": yahoo_has_short,
+            "reddit_mentions": reddit_mentions, "reddit_sentiment": reddit_sentiment,
+            "bull_ratio": bull_ratio, "message_vol": message_vol, "labeled": labeled,
+        }
+
+    def stocks(self, tickers: List[str], f: Dict[str, np.ndarray]) -> List[Stock]:
+        stocks = []
+        for i, ticker in enumerate(tickers):
+            analyst = int(f["analyst"][i])
+            sector = SECTORS[f["sector"][i]]
+            pe = float(f["pe"][i])
+            stocks.append(Stock(
+                ticker=ticker.upper(),
+                price=round(float(f["price"][i]), 2),
+                company_name=f"{ticker.upper()} Synthetic Corp",
+                sector=sector,
+                industry=f"{sector} {int(f['industry'][i]) + 1}",
+                financials=Financials(
+                    market_cap=int(f["market_cap"][i]),
+                    pe_ratio=None if np.isnan(pe) else pe,
+                    pb_ratio=float(f["pb"][i]),
+                    revenue_growth=float(f["revenue_growth"][i]),
+                    profit_margin=float(f["profit_margin"][i]),
+                    debt_to_equity=float(f["debt_to_equity"][i]),
+                    free_cash_flow=int(f["free_cash_flow"][i]),
+                ),
+                sentiment=Sentiment(
+                    analyst_buy_count=10 if analyst == 0 else 0,
+                    analyst_hold_count=10 if analyst == 1 else 0,
+                    analyst_sell_count=10 if analyst == 2 else 0,
+                    short_interest_pct=float(f["short_interest"][i]) if f["yahoo_has_short"][i] else None,
+                ),
+                fifty_two_week_high=round(float(f["high"][i]), 2),
+                fifty_two_week_low=round(float(f["low"][i]), 2),
+            ))
+        return stocks
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+from contrarian.config import config
+from contrarian.models.stock import Stock
+from contrarian.distributed.work_queue import ShardQueue
+
+def deserialize_result(row: Dict) -> Dict:
+    return {
+        "ticker": row["ticker"],
+        "stock": Stock.from_dict(row["stock"]),
+        "scores": row["scores"]
+    }
+
+def spawn_local_workers(count: int, max_workers: int = 10) -> List[subprocess.Popen]:
+    """Starts worker processes on this machine that exit once the queue is drained."""
+    cmd = [
+        sys.executable, "-m", "contrarian.cli", "cluster", "work",
+        "--exit-when-idle", "--threads", str(max_workers)
+    ]
+    # Workers write nothing useful to stdout; keep it clean for the coordinator's own output
+    return [subprocess.Popen(cmd, cwd=config.BASE_DIR, stdout=subprocess.DEVNULL) for _ in range(count)]
+
+def wait_for_job(
+    queue: ShardQueue,
+    job_id: str,
+    poll_interval: float = 1.0,
+    on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    while True:
+        counts = queue.status(job_id)
+        if on_progress:
+            on_progress(counts)
+        if counts["pending"] == 0 and counts["claimed"] == 0:
+            return counts
+        time.sleep(poll_interval)
+
+def collect_results(queue: ShardQueue, job_id: str) -> List[Dict]:
+    """Merges the scored rows of every completed shard into `batch_screen`-shaped results."""
+    return [deserialize_result(row) for row in queue.results(job_id)]
+
+def distributed_screen(
+    tickers: List[str],
+    universe: str = "",
+    shard_size: Optional[int] = None,
+    local_workers: int = 0,
+    max_workers: int = 10,
+    on_submit: Optional[Callable[[str], None]] = None,
+    on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> List[Dict]:
+    """
+    Coordinator entry point: shards the tickers onto the queue, optionally starts
+    local worker processes, waits for every shard to finish and merges the results.
+    Remote workers only need `contrarian cluster work` pointed at the same queue file.
+    """
+    queue = ShardQueue()
+    job_id = queue.submit(tickers, shard_size=shard_size, universe=universe)
+    if on_submit:
+        on_submit(job_id)
+    procs = spawn_local_workers(local_workers, max_workers=max_workers)
+    try:
+        wait_for_job(queue, job_id, on_progress=on_progress)
+    finally:
+        for p in procs:
+            p.wait()
+    return collect_results(queue, job_id)
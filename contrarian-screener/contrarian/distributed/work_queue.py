@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlite_utils import Database
+from contrarian.config import config
+
+class ShardQueue:
+    """
+    Durable shard queue backed by SQLite.
+
+    A job is a universe split into shards (lists of tickers). Workers claim a shard
+    under a lease, keep the lease alive with heartbeats and report the scored rows back.
+    A shard whose lease expires (worker died) is handed to the next worker; a shard that
+    keeps failing is marked 'failed' after SHARD_MAX_ATTEMPTS. Tickers a completed shard
+    has no row for are retried on their own, with the attempts the shard had left.
+
+    SQLite stands in for a real broker: any process that can open the same file
+    (other processes, or other hosts via shared storage) can act as a worker.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        # Autocommit connection so claims can use an explicit BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(path or config.QUEUE_FILE), timeout=30, isolation_level=None, check_same_thread=False)
+        self.db = Database(self.conn)
+        self.db.enable_wal()
+
+        if not self.db["jobs"].exists():
+            self.db["jobs"].create({
+                "id": str,
+                "universe": str,
+                "created_at": float,
+                "total_shards": int
+            }, pk="id")
+        if not self.db["shards"].exists():
+            self.db["shards"].create({
+                "id": int,
+                "job_id": str,
+                "seq": int,
+                "tickers": str,  # JSON list
+                "status": str,   # pending | claimed | done | failed
+                "attempts": int,
+                "worker_id": str,
+                "lease_expires": float,
+                "result": str,   # JSON list of scored rows
+                "error": str,
+                "updated_at": float
+            }, pk="id")
+            self.db["shards"].create_index(["status", "lease_expires"])
+            self.db["shards"].create_index(["job_id"])
+
+    def _transaction(self):
+        return _ImmediateTransaction(self.conn)
+
+    # --- Coordinator side ---
+
+    def submit(self, tickers: List[str], shard_size: int = None, universe: str = "") -> str:
+        shard_size = shard_size or config.SHARD_SIZE
+        job_id = uuid.uuid4().hex[:12]
+        shards = [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+        now = time.time()
+
+        with self._transaction():
+            self.conn.execute(
+                "INSERT INTO jobs (id, universe, created_at, total_shards) VALUES (?, ?, ?, ?)",
+                [job_id, universe, now, len(shards)]
+            )
+            self.conn.executemany(
+                "INSERT INTO shards (job_id, seq, tickers, status, attempts, lease_expires, updated_at) "
+                "VALUES (?, ?, ?, 'pending', 0, 0, ?)",
+                [(job_id, seq, json.dumps(shard), now) for seq, shard in enumerate(shards)]
+            )
+        return job_id
+
+    def status(self, job_id: str) -> Dict[str, int]:
+        counts = {"pending": 0, "claimed": 0, "done": 0, "failed": 0}
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) FROM shards WHERE job_id = ? GROUP BY status", [job_id]
+        ).fetchall()
+        for status, count in rows:
+            counts[status] = count
+        return counts
+
+    def is_finished(self, job_id: str) -> bool:
+        counts = self.status(job_id)
+        return counts["pending"] == 0 and counts["claimed"] == 0
+
+    def results(self, job_id: str) -> List[Dict]:
+        """Merged raw rows of all completed shards, in shard order."""
+        merged = []
+        rows = self.conn.execute(
+            "SELECT result FROM shards WHERE job_id = ? AND status = 'done' ORDER BY seq, id", [job_id]
+        ).fetchall()
+        for (result,) in rows:
+            merged.extend(json.loads(result))
+        return merged
+
+    def failed_shards(self, job_id: str) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT seq, tickers, error FROM shards WHERE job_id = ? AND status = 'failed' ORDER BY seq, id", [job_id]
+        ).fetchall()
+        return [{"seq": seq, "tickers": json.loads(tickers), "error": error} for seq, tickers, error in rows]
+
+    # --- Worker side ---
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Atomically leases the next runnable shard, or returns None if there is none."""
+        now = time.time()
+        lease = now + config.SHARD_LEASE_SECONDS
+        with self._transaction():
+            # Expired leases that already used up their attempts are given up on
+            self.conn.execute(
+                "UPDATE shards SET status = 'failed', error = COALESCE(error, 'lease expired'), updated_at = ? "
+                "WHERE status = 'claimed' AND lease_expires < ? AND attempts >= ?",
+                [now, now, config.SHARD_MAX_ATTEMPTS]
+            )
+            row = self.conn.execute(
+                "SELECT id, job_id, tickers, attempts FROM shards "
+                "WHERE status = 'pending' OR (status = 'claimed' AND lease_expires < ?) "
+                "ORDER BY job_id, seq LIMIT 1",
+                [now]
+            ).fetchone()
+            if row is None:
+                return None
+            shard_id, job_id, tickers, attempts = row
+            self.conn.execute(
+                "UPDATE shards SET status = 'claimed', worker_id = ?, attempts = attempts + 1, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                [worker_id, lease, now, shard_id]
+            )
+        return {"id": shard_id, "job_id": job_id, "tickers": json.loads(tickers), "attempt": attempts + 1}
+
+    def heartbeat(self, shard_id: int, worker_id: str) -> bool:
+        """Extends the lease. Returns False if the shard was reassigned in the meantime."""
+        now = time.time()
+        cursor = self.conn.execute(
+            "UPDATE shards SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'claimed'",
+            [now + config.SHARD_LEASE_SECONDS, now, shard_id, worker_id]
+        )
+        return cursor.rowcount == 1
+
+    def has_unfinished(self) -> bool:
+        """Whether any shard, of any job, is still pending or leased."""
+        return self.conn.execute(
+            "SELECT 1 FROM shards WHERE status IN ('pending', 'claimed') LIMIT 1"
+        ).fetchone() is not None
+
+    def complete(self, shard_id: int, worker_id: str, rows: List[Dict], missing: Optional[List[str]] = None):
+        """
+        Stores the shard's rows. `missing` tickers (no row) go back on the queue as a
+        shard of their own, with the attempts left, or are recorded as a failed shard.
+        """
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE shards SET status = 'done', result = ?, error = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'claimed'",
+                [json.dumps(rows), now, shard_id, worker_id]
+            )
+            if cursor.rowcount != 1 or not missing:
+                return
+            job_id, seq, attempts = self.conn.execute(
+                "SELECT job_id, seq, attempts FROM shards WHERE id = ?", [shard_id]
+            ).fetchone()
+            self.conn.execute(
+                "INSERT INTO shards (job_id, seq, tickers, status, attempts, lease_expires, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                [job_id, seq, json.dumps(missing), "pending" if attempts < config.SHARD_MAX_ATTEMPTS else "failed",
+                 attempts, f"No result for {', '.join(missing)}", now]
+            )
+
+    def fail(self, shard_id: int, worker_id: str, error: str):
+        """Puts the shard back for retry, or marks it failed once attempts are exhausted."""
+        self.conn.execute(
+            "UPDATE shards SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_expires = 0, updated_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = 'claimed'",
+            [config.SHARD_MAX_ATTEMPTS, error, time.time(), shard_id, worker_id]
+        )
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT so that two workers can never claim the same shard."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
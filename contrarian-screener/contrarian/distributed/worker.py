@@ -0,0 +1,84 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+from pathlib import Path
+from contrarian.config import config
+from contrarian.analysis.pipeline import batch_screen
+from contrarian.distributed.work_queue import ShardQueue
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+def serialize_result(data: Dict) -> Dict:
+    return {
+        "ticker": data["ticker"],
+        "stock": data["stock"].to_dict(),
+        "scores": data["scores"]
+    }
+
+class _Heartbeat(threading.Thread):
+    """Keeps a shard lease alive while the worker is busy scoring it."""
+
+    def __init__(self, queue_path: Optional[Path], shard_id: int, worker_id: str):
+        super().__init__(daemon=True)
+        self.queue_path = queue_path
+        self.shard_id = shard_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+
+    def run(self):
+        # Own connection: sqlite connections should not be shared across threads
+        queue = ShardQueue(self.queue_path)
+        interval = max(1.0, config.SHARD_LEASE_SECONDS / 3)
+        while not self.stopped.wait(interval):
+            if not queue.heartbeat(self.shard_id, self.worker_id):
+                break
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+def run_worker(
+    worker_id: Optional[str] = None,
+    max_workers: int = 10,
+    exit_when_idle: bool = False,
+    poll_interval: float = 2.0,
+    queue_path: Optional[Path] = None,
+) -> int:
+    """
+    Claims shards until no shard is pending or leased anymore (exit_when_idle) or forever.
+    Each shard is scored with the in-process thread pool (`batch_screen`).
+    Returns the number of shards this worker completed.
+    """
+    worker_id = worker_id or default_worker_id()
+    queue = ShardQueue(queue_path)
+    completed = 0
+
+    while True:
+        shard = queue.claim(worker_id)
+        if shard is None:
+            # Shards leased by other workers may still come back (expired lease, retried tickers)
+            if exit_when_idle and not queue.has_unfinished():
+                return completed
+            time.sleep(poll_interval)
+            continue
+
+        heartbeat = _Heartbeat(queue_path, shard["id"], worker_id)
+        heartbeat.start()
+        try:
+            results = batch_screen(shard["tickers"], max_workers=max_workers)
+            rows = [serialize_result(r) for r in results]
+        except Exception as e:
+            heartbeat.stop()
+            queue.fail(shard["id"], worker_id, f"{type(e).__name__}: {e}")
+            continue
+
+        # `batch_screen` drops tickers whose fetches failed; only those are retried
+        found = {r["ticker"] for r in rows}
+        missing = [t for t in shard["tickers"] if t not in found]
+        heartbeat.stop()
+        queue.complete(shard["id"], worker_id, rows, missing)
+        completed += 1
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import Optional, Dict
 
 @dataclass
@@ -24,6 +24,11 @@ class Sentiment:
     reddit_sentiment_score: float = 0.5  # 0.0 (Bear) - 1.0 (Bull)
     stocktwits_bull_ratio: float = 0.5   # 0.0 (Bear) - 1.0 (Bull)
     
+    # Readings vs. the ticker's own baseline, in standard deviations (None until enough history)
+    reddit_mentions_z: Optional[float] = None
+    reddit_sentiment_z: Optional[float] = None
+    stocktwits_bull_z: Optional[float] = None
+    
     @property
     def analyst_consensus_score(self) -> float:
         """Returns a score from 0 (All Sell) to 100 (All Buy)."""
@@ -60,3 +65,17 @@ class Stock:
         if self.price and self.fifty_two_week_high:
             return ((self.price - self.fifty_two_week_high) / self.fifty_two_week_high) * 100
         return None
+
+    def to_dict(self) -> Dict:
+        """Plain-dict form (nested dataclasses included) for JSON storage."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Stock":
+        """Rebuilds a Stock (and its nested Financials/Sentiment) from `to_dict` output."""
+        data = dict(data)
+        if data.get("financials") is not None:
+            data["financials"] = Financials(**data["financials"])
+        if data.get("sentiment") is not None:
+            data["sentiment"] = Sentiment(**data["sentiment"])
+        return cls(**data)
@@ -0,0 +1,129 @@
+from dataclasses import fields as dataclass_fields
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Union, get_args, get_type_hints
+from contrarian.models.stock import Stock, Financials, Sentiment
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional (pip install contrarian-screener[arrow])
+    pa = None
+    pq = None
+
+BATCH_SIZE = 1024
+
+STOCK_COLUMNS = ("company_name", "sector", "industry", "price", "fifty_two_week_high", "fifty_two_week_low")
+SCORE_COLUMNS = {
+    "contrarian_score": float,
+    "fundamental_score": float,
+    "sentiment_score": float,
+    "signal": str,
+    "is_hated": bool,
+    "is_loved": bool,
+    "crowding_z": float,
+}
+
+def require_arrow():
+    if pa is None:
+        raise RuntimeError("Arrow/Parquet export needs pyarrow (pip install 'contrarian-screener[arrow]')")
+
+def _arrow_type(python_type):
+    # Optional[X] -> X
+    args = [a for a in get_args(python_type) if a is not type(None)]
+    python_type = args[0] if args else python_type
+    return {int: pa.int64(), float: pa.float64(), str: pa.string(), bool: pa.bool_()}[python_type]
+
+def _dataclass_columns(cls, prefix: str) -> List[tuple]:
+    hints = get_type_hints(cls)
+    return [(f"{prefix}.{f.name}", _arrow_type(hints[f.name])) for f in dataclass_fields(cls)]
+
+def result_schema() -> "pa.Schema":
+    """
+    Flat typed columns for screen/analysis results: identity and price fields,
+    `financials.*` and `sentiment.*` (dotted like the API's `fields=`), and the scores.
+    """
+    require_arrow()
+    stock_hints = get_type_hints(Stock)
+    columns = [("ticker", pa.string()), ("profile", pa.string())]
+    columns += [(c, _arrow_type(stock_hints[c])) for c in STOCK_COLUMNS]
+    columns.append(("percent_from_high", pa.float64()))
+    columns += _dataclass_columns(Financials, "financials")
+    columns += _dataclass_columns(Sentiment, "sentiment")
+    columns += [(c, _arrow_type(t)) for c, t in SCORE_COLUMNS.items()]
+    return pa.schema(columns)
+
+def flatten(data: Dict) -> Dict:
+    stock = data["stock"]
+    row = {"ticker": data["ticker"], "profile": data.get("profile")}
+    row.update({c: getattr(stock, c) for c in STOCK_COLUMNS})
+    row["percent_from_high"] = stock.percent_from_high
+    if stock.financials:
+        row.update({f"financials.{k}": v for k, v in vars(stock.financials).items()})
+    if stock.sentiment:
+        row.update({f"sentiment.{k}": v for k, v in vars(stock.sentiment).items()})
+    row.update({c: (data.get("scores") or {}).get(c) for c in SCORE_COLUMNS})
+    return row
+
+def iter_batches(results: Iterable[Dict], schema: "pa.Schema", batch_size: int = BATCH_SIZE) -> Iterator["pa.RecordBatch"]:
+    """Record batches of at most `batch_size` rows; only one batch is held at a time."""
+    names = schema.names
+    rows = []
+    for data in results:
+        rows.append(flatten(data))
+        if len(rows) >= batch_size:
+            yield _to_batch(rows, names, schema)
+            rows = []
+    if rows:
+        yield _to_batch(rows, names, schema)
+
+def _to_batch(rows: List[Dict], names: List[str], schema: "pa.Schema") -> "pa.RecordBatch":
+    columns = [[row.get(name) for row in rows] for name in names]
+    return pa.RecordBatch.from_arrays(
+        [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema
+    )
+
+def write_arrow(results: Iterable[Dict], sink: Union[str, BinaryIO], batch_size: int = BATCH_SIZE):
+    """Writes results as an Arrow IPC stream (readable with pyarrow.ipc.open_stream)."""
+    schema = result_schema()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in iter_batches(results, schema, batch_size):
+            writer.write_batch(batch)
+
+def write_parquet(results: Iterable[Dict], sink: Union[str, BinaryIO], batch_size: int = BATCH_SIZE):
+    """Writes results as Parquet, one row group per batch."""
+    schema = result_schema()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in iter_batches(results, schema, batch_size):
+            writer.write_batch(batch)
+
+class _Chunks:
+    """Write-only file object that hands the bytes written so far to a generator."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+def stream_arrow(results: Iterable[Dict], batch_size: int = BATCH_SIZE) -> Iterator[bytes]:
+    """Arrow IPC stream as byte chunks (schema first, then one chunk per batch), for HTTP streaming."""
+    schema = result_schema()
+    sink = _Chunks()
+    writer = pa.ipc.new_stream(sink, schema)
+    yield sink.drain()
+    for batch in iter_batches(results, schema, batch_size):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
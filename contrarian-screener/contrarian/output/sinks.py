@@ -0,0 +1,40 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import httpx
+from contrarian.config import config
+
+class FileSink:
+    """Appends alerts as JSON lines to a local file."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or config.ALERTS_LOG_FILE)
+        self._lock = threading.Lock()
+
+    def send(self, alert: Dict):
+        line = json.dumps(alert, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+class WebhookSink:
+    """
+    POSTs alerts as JSON to ALERT_WEBHOOK_URL.
+    Without a URL configured it only prints the payload (local stub).
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        self.url = url or config.ALERT_WEBHOOK_URL
+
+    def send(self, alert: Dict):
+        if not self.url:
+            print(f"[webhook stub] {json.dumps(alert, default=str)}")
+            return
+        try:
+            httpx.post(self.url, json=alert, timeout=5.0)
+        except Exception as e:
+            print(f"Error delivering alert to webhook: {e}")
+
+def default_sinks() -> Dict[str, object]:
+    return {"file": FileSink(), "webhook": WebhookSink()}
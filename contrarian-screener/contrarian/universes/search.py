@@ -0,0 +1,164 @@
+import difflib
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from contrarian.analysis.events import add_listener
+from contrarian.data.cache import cache
+from contrarian.universes.tickers import Universe
+
+# Dropped from company names before matching, so "apple" finds "Apple Inc."
+NAME_SUFFIXES = {"inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited",
+                 "plc", "sa", "nv", "ag", "se", "holdings", "holding", "group", "the"}
+
+class Match(NamedTuple):
+    ticker: str
+    name: Optional[str]
+    matched: str  # "ticker", "name", "word" or "fuzzy"
+
+def normalize(text: str) -> str:
+    """Lowercase words without punctuation or corporate suffixes: "Apple Inc." -> "apple"."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    kept = [w for w in words if w not in NAME_SUFFIXES]
+    return " ".join(kept or words)
+
+def prefix_range(keys: List[Tuple[str, str]], prefix: str) -> Tuple[int, int]:
+    """Positions [lo, hi) of the sorted (key, ticker) pairs whose key starts with `prefix`."""
+    return bisect_left(keys, (prefix,)), bisect_left(keys, (prefix + "\uffff",))
+
+class SearchIndex:
+    """
+    Prefix index over known tickers and company names, for resolving what someone typed
+    before anything is fetched.
+
+    Three sorted arrays answer a keystroke with a few bisects: tickers, normalized full
+    names and every word-start suffix of a name ("micro devices" in "advanced micro
+    devices"). Only the first `limit` entries of each prefix range are read, so the cost
+    does not grow with the number of matches. When no prefix matches, `search` falls back
+    to difflib's closest tickers and names (typos like "APPL", "microsft").
+
+    Tickers learned later (`add`) are merged into the arrays on the next lookup, so a
+    bulk screen feeding the index costs one re-sort instead of one insert per ticker.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, Optional[str]] = {}
+        self._pending: Dict[str, Optional[str]] = {}
+        self._tickers: List[Tuple[str, str]] = []  # (ticker, ticker)
+        self._full: List[Tuple[str, str]] = []   # (normalized name, ticker)
+        self._words: List[Tuple[str, str]] = []  # (name from a later word on, ticker)
+        self._by_name: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, ticker: str, name: Optional[str] = None):
+        """Learns a ticker (and its company name); a known name is not cleared by None."""
+        ticker = ticker.upper()
+        with self._lock:
+            current = self._pending.get(ticker, self._names.get(ticker))
+            if ticker not in self._names or (name and name != current):
+                self._pending[ticker] = name or current
+
+    def _merge(self):
+        """Folds pending additions into the sorted arrays (caller holds the lock)."""
+        if not self._pending:
+            return
+        self._names.update(self._pending)
+        self._pending = {}
+        self._tickers = [(t, t) for t in sorted(self._names)]
+        full, words, by_name = [], [], {}
+        for ticker, name in self._names.items():
+            if not name:
+                continue
+            key = normalize(name)
+            full.append((key, ticker))
+            by_name.setdefault(key, ticker)
+            parts = key.split(" ")
+            words.extend((" ".join(parts[i:]), ticker) for i in range(1, len(parts)))
+        self._full, self._words, self._by_name = sorted(full), sorted(words), by_name
+
+    def search(self, query: str, limit: int = 10) -> List[Match]:
+        """
+        Best matches for a partial ticker or company name: exact ticker, ticker prefix,
+        name prefix, word prefix, then (only if none of these matched) fuzzy.
+        """
+        ticker_query = query.strip().upper()
+        name_query = normalize(query)
+        if not ticker_query:
+            return []
+        with self._lock:
+            self._merge()
+            matches: Dict[str, Match] = {}
+
+            def take(keys, prefix, kind):
+                if not prefix:
+                    return
+                lo, hi = prefix_range(keys, prefix)
+                for _, ticker in keys[lo:min(hi, lo + limit)]:
+                    if ticker not in matches:
+                        matches[ticker] = Match(ticker, self._names.get(ticker), kind)
+
+            take(self._tickers, ticker_query, "ticker")
+            take(self._full, name_query, "name")
+            take(self._words, name_query, "word")
+            if not matches:
+                # Typos rarely hit the first character; comparing only entries that share it
+                # keeps difflib's quadratic matching to a slice of the index
+                for ticker in difflib.get_close_matches(ticker_query, self._keys(self._tickers, ticker_query[0]),
+                                                        n=limit, cutoff=0.6):
+                    matches[ticker] = Match(ticker, self._names.get(ticker), "fuzzy")
+                if name_query:
+                    for key in difflib.get_close_matches(name_query, self._keys(self._full, name_query[0]),
+                                                         n=limit, cutoff=0.75):
+                        ticker = self._by_name[key]
+                        matches.setdefault(ticker, Match(ticker, self._names.get(ticker), "fuzzy"))
+            return list(matches.values())[:limit]
+
+    @staticmethod
+    def _keys(keys: List[Tuple[str, str]], prefix: str) -> List[str]:
+        lo, hi = prefix_range(keys, prefix)
+        return list(dict.fromkeys(key for key, _ in keys[lo:hi]))
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        The ticker `query` unambiguously names: a known ticker, or a company name typed in
+        full ("apple", "Microsoft Corp"). None otherwise, including for symbols the index
+        has never seen, which may still be perfectly valid.
+        """
+        ticker = query.strip().upper()
+        with self._lock:
+            self._merge()
+            if ticker in self._names:
+                return ticker
+            return self._by_name.get(normalize(query))
+
+    def on_scored(self, data: Dict):
+        """Score listener (see contrarian.analysis.events): learns every scored ticker's name."""
+        self.add(data["stock"].ticker, data["stock"].company_name)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._names.keys() | self._pending.keys())
+
+def load_known(index: SearchIndex):
+    """Every ticker of the registered universes, with the company names in the cache."""
+    for universe in Universe.names():
+        for ticker in Universe.get_tickers(universe):
+            index.add(ticker)
+    for ticker, name in cache.names():
+        index.add(ticker, name)
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+def get_search_index() -> SearchIndex:
+    """
+    The process-wide index, loaded on first use and kept current with every scored
+    ticker afterwards.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+            load_known(_index)
+            add_listener(_index.on_scored)
+        return _index
@@ -1,6 +1,12 @@
 from typing import List
+from contrarian.config import config
 
 class Universe:
+    @staticmethod
+    def names() -> List[str]:
+        """The named universes (the generated "synthetic" one is left out)."""
+        return ["sp500", "nasdaq100", "test"]
+
     @staticmethod
     def get_tickers(universe_name: str) -> List[str]:
         universe_name = universe_name.lower()
@@ -10,6 +16,10 @@ class Universe:
             return Universe.nasdaq100()
         elif universe_name == "test":
             return ["AAPL", "TSLA", "GME", "AMC", "MSFT", "NVDA", "GOOGL", "AMD", "PLTR", "COIN"]
+        elif universe_name == "synthetic":
+            # Generated tickers for the synthetic provider (CONTRARIAN_PROVIDER=synthetic)
+            from contrarian.data.synthetic import synthetic_tickers
+            return synthetic_tickers(config.SYNTHETIC_UNIVERSE_SIZE)
         else:
             return []
 
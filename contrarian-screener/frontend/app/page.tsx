@@ -6,12 +6,14 @@ import { StockCard } from "@/components/stock-card";
 import { Skeleton } from "@/components/ui/skeleton";
 import { RefreshCw } from "lucide-react";
 import { Button } from "@/components/ui/button";
+import { useLiveScores } from "@/hooks/use-live-scores";
 
 export default function Dashboard() {
   const { data: opportunities, isLoading, refetch, isRefetching } = useQuery({
     queryKey: ["opportunities"],
     queryFn: () => api.getTopOpportunities("test", 10), // Using 'test' universe for speed
   });
+  const live = useLiveScores(["opportunities"], { universes: ["test"] });
 
   return (
     <div className="space-y-8">
@@ -19,6 +21,9 @@ export default function Dashboard() {
         <div>
           <h1 className="text-3xl font-bold tracking-tight text-white">Market Pulse</h1>
           <p className="text-slate-400">Top contrarian opportunities identified today.</p>
+          {!live && !isLoading && (
+            <p className="text-xs text-amber-500">Live updates disconnected, reconnecting…</p>
+          )}
         </div>
         <Button 
           variant="outline" 
@@ -0,0 +1,96 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { useQueryClient } from "@tanstack/react-query";
+import { StockData } from "@/lib/api";
+
+const WS_URL =
+  (process.env.NEXT_PUBLIC_API_URL ?? "http://localhost:8000").replace(/^http/, "ws") + "/ws";
+
+type LiveMessage = {
+  type: "snapshot" | "diff";
+  ticker: string;
+  data: Record<string, unknown>;
+};
+
+type Subscription = {
+  universes?: string[];
+  tickers?: string[];
+  watchlist?: boolean;
+};
+
+// Deep-merge a compact diff into the cached payload
+function merge<T>(target: T, patch: Record<string, unknown>): T {
+  const out: Record<string, unknown> = { ...(target as Record<string, unknown>) };
+  for (const [key, value] of Object.entries(patch)) {
+    const current = out[key];
+    out[key] =
+      value && typeof value === "object" && !Array.isArray(value) && current && typeof current === "object"
+        ? merge(current, value as Record<string, unknown>)
+        : value;
+  }
+  return out as T;
+}
+
+// Reconnect delays after a dropped connection: doubling from 1s up to 30s
+const RECONNECT_MIN_MS = 1000;
+const RECONNECT_MAX_MS = 30000;
+
+/**
+ * Keeps the StockData[] cached under `queryKey` current with pushed score updates
+ * instead of re-polling the API. A dropped connection is retried with backoff; each
+ * reconnect re-sends the subscription, which brings fresh snapshots of every row.
+ * Returns whether updates are currently live.
+ */
+export function useLiveScores(queryKey: unknown[], subscription: Subscription): boolean {
+  const queryClient = useQueryClient();
+  const subKey = JSON.stringify(subscription);
+  const [live, setLive] = useState(false);
+
+  useEffect(() => {
+    let ws: WebSocket | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let delay = RECONNECT_MIN_MS;
+    let disposed = false;
+
+    const connect = () => {
+      const socket = new WebSocket(WS_URL);
+      ws = socket;
+      socket.onopen = () => {
+        delay = RECONNECT_MIN_MS;
+        setLive(true);
+        socket.send(JSON.stringify({ action: "subscribe", ...JSON.parse(subKey) }));
+      };
+      socket.onmessage = (event) => {
+        const msg: LiveMessage = JSON.parse(event.data);
+        queryClient.setQueryData<StockData[]>(queryKey, (rows) =>
+          rows?.map((row) =>
+            row.ticker.toUpperCase() === msg.ticker
+              ? msg.type === "snapshot"
+                ? (msg.data as unknown as StockData)
+                : merge(row, msg.data)
+              : row
+          )
+        );
+      };
+      // An error is always followed by close, which schedules the retry
+      socket.onerror = () => socket.close();
+      socket.onclose = () => {
+        if (disposed) return;
+        setLive(false);
+        retry = setTimeout(connect, delay);
+        delay = Math.min(delay * 2, RECONNECT_MAX_MS);
+      };
+    };
+
+    connect();
+    return () => {
+      disposed = true;
+      clearTimeout(retry);
+      ws?.close();
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [queryClient, subKey, JSON.stringify(queryKey)]);
+
+  return live;
+}
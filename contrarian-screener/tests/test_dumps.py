@@ -0,0 +1,104 @@
+import gzip
+import io
+import shutil
+from pathlib import Path
+import pytest
+from contrarian.data import dumps
+from contrarian.data.dumps import SocialHistory, aggregate_chunk, ingest_dump, init_worker, iter_chunks
+from contrarian.data.store import open_store
+
+FIXTURES = Path(__file__).parent / "fixtures"
+TICKERS = {"GME", "AMC"}
+DAY1, DAY2 = "2024-01-02", "2024-01-03"
+
+# Counters (mentions, bull_hits, bear_hits, bulls, bears) the fixtures add up to
+REDDIT = {
+    ("GME", DAY1): [1, 2, 0, 0, 0],  # "moon" + "calls"
+    ("AMC", DAY1): [1, 0, 2, 0, 0],  # "selling" + "tank"
+    ("GME", DAY2): [1, 0, 0, 0, 0],
+    ("AMC", DAY2): [1, 0, 0, 0, 0],
+}
+STOCKTWITS = {
+    ("GME", DAY1): [2, 1, 0, 1, 1],
+    ("AMC", DAY1): [1, 0, 0, 0, 0],
+}
+
+@pytest.fixture
+def history(tmp_path):
+    return SocialHistory(open_store(tmp_path / "store.db"))
+
+@pytest.fixture
+def reddit_dump(tmp_path):
+    return Path(shutil.copy(FIXTURES / "reddit_sample.ndjson.gz", tmp_path))
+
+@pytest.fixture
+def stocktwits_dump(tmp_path):
+    pytest.importorskip("zstandard")
+    return Path(shutil.copy(FIXTURES / "stocktwits_sample.ndjson.zst", tmp_path))
+
+def counters(rows, ticker, day, source):
+    row = next(r for r in rows if r["ticker"] == ticker and r["day"] == day and r["source"] == source)
+    return [row[c] for c in dumps.COUNTERS]
+
+def test_aggregate_chunk():
+    init_worker(frozenset(TICKERS))
+    with gzip.open(FIXTURES / "reddit_sample.ndjson.gz") as f:
+        out, lines, bad = aggregate_chunk(f.read(), "auto")
+    assert out == {"reddit": REDDIT}
+    assert (lines, bad) == (6, 2)  # "not json" and a record without a timestamp
+
+def test_iter_chunks_keeps_lines_whole():
+    data = b"short\n" + b"x" * 100 + b"\nlast line without newline"
+    chunks = list(iter_chunks(io.BytesIO(data), 16))
+    assert b"".join(chunks) == data
+    assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+    assert b"x" * 100 + b"\n" in chunks  # Longer than a chunk, still one piece
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_dump(history, reddit_dump, stocktwits_dump, workers):
+    stats = ingest_dump(reddit_dump, TICKERS, workers=workers, chunk_bytes=64, history=history)
+    assert stats == {"lines": 6, "bad_lines": 2, "mentions": 4, "skipped": 0}
+    stats = ingest_dump(stocktwits_dump, TICKERS, workers=workers, chunk_bytes=64, history=history)
+    assert stats == {"lines": 3, "bad_lines": 0, "mentions": 3, "skipped": 0}
+
+    rows = history.daily("GME")
+    assert counters(rows, "GME", DAY1, "reddit") == REDDIT[("GME", DAY1)]
+    assert counters(rows, "GME", DAY2, "reddit") == REDDIT[("GME", DAY2)]
+    assert counters(rows, "GME", DAY1, "stocktwits") == STOCKTWITS[("GME", DAY1)]
+    assert counters(history.daily("AMC"), "AMC", DAY1, "reddit") == REDDIT[("AMC", DAY1)]
+
+def test_reingest_is_skipped(history, reddit_dump):
+    ingest_dump(reddit_dump, TICKERS, workers=1, history=history)
+    assert ingest_dump(reddit_dump, TICKERS, workers=1, history=history)["skipped"] == 1
+    assert counters(history.daily("GME"), "GME", DAY1, "reddit") == REDDIT[("GME", DAY1)]
+
+def test_forced_reingest_replaces_counts(history, reddit_dump):
+    ingest_dump(reddit_dump, TICKERS, workers=1, history=history)
+    stats = ingest_dump(reddit_dump, TICKERS, workers=1, history=history, force=True)
+    assert stats["skipped"] == 0
+    assert counters(history.daily("GME"), "GME", DAY1, "reddit") == REDDIT[("GME", DAY1)]
+
+def test_interrupted_ingest_is_invisible_and_redone(history, reddit_dump, monkeypatch):
+    def crash(*args):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(history, "finish", crash)
+    with pytest.raises(KeyboardInterrupt):
+        ingest_dump(reddit_dump, TICKERS, workers=1, history=history)
+    assert history.daily("GME") == []  # Counts flushed before the crash are not visible
+
+    monkeypatch.undo()
+    assert ingest_dump(reddit_dump, TICKERS, workers=1, history=history)["skipped"] == 0
+    assert counters(history.daily("GME"), "GME", DAY1, "reddit") == REDDIT[("GME", DAY1)]
+
+def test_daily_derived_inputs_and_filters(history, reddit_dump, stocktwits_dump):
+    ingest_dump(reddit_dump, TICKERS, workers=1, history=history)
+    ingest_dump(stocktwits_dump, TICKERS, workers=1, history=history)
+
+    rows = history.daily("gme", start=DAY1, end=DAY1)
+    assert [(r["day"], r["source"]) for r in rows] == [(DAY1, "reddit"), (DAY1, "stocktwits")]
+    reddit, stocktwits = rows
+    assert reddit["sentiment_score"] == 1.0 and reddit["bull_ratio"] is None
+    assert stocktwits["bull_ratio"] == 0.5
+
+    rows = history.daily("GME", source="reddit", start=DAY2)
+    assert [(r["day"], r["sentiment_score"]) for r in rows] == [(DAY2, 0.5)]